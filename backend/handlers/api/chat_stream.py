@@ -0,0 +1,270 @@
+"""
+Chat Stream Handler
+HTTP 응답 스트리밍(Server-Sent Events) 채팅 엔드포인트
+
+WebSocket 경로는 청크마다 post_to_connection API를 호출하지만,
+이 핸들러는 Lambda 함수 URL(InvokeMode=RESPONSE_STREAM)의 응답 스트림에
+청크를 바로 기록합니다. 저장/사용량 처리는 WebSocket 경로와 동일하게
+WebSocketService.process_message / stream_response / track_usage를 사용합니다.
+
+Note: Python 관리형 런타임은 응답 스트리밍을 직접 지원하지 않으므로
+- stream_handler: 스트리밍 브리지(Lambda Web Adapter, 커스텀 런타임 등)가 전달한
+  쓰기 가능한 스트림에 SSE 프레임을 즉시 기록
+- handler: 버퍼링 모드 - 스트리밍이 아님. 생성이 끝난 뒤 동일한 SSE 본문을 한 번에 반환 (호환용)
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from src.services import WebSocketService, CapacityExceededError
+from src.config.business import DEFAULT_ENGINE_TYPE
+from handlers.websocket.message import (
+    determine_user_role,
+    determine_user_plan,
+    build_guardrail_frame,
+    record_stream_metrics
+)
+from utils.logger import get_structured_logger
+from utils.metrics import track_aws_calls
+from utils.response import APIResponse
+from utils.serialization import encode_frame
+
+logger = get_structured_logger(__name__)
+
+SSE_HEADERS = {
+    **APIResponse.CORS_HEADERS,
+    'Content-Type': 'text/event-stream; charset=utf-8',
+    'Cache-Control': 'no-cache',
+    'X-Accel-Buffering': 'no'
+}
+
+
+@track_aws_calls('chat_stream')
+def handler(event, context):
+    """
+    Lambda 핸들러 - 버퍼링 모드 SSE 응답 (스트리밍 아님)
+
+    관리형 Python 런타임의 일반 핸들러는 응답을 한 번만 반환할 수 있으므로
+    응답 생성이 모두 끝난 뒤 전체 SSE 본문(queued/ai_chunk 프레임 포함)을 반환합니다.
+    클라이언트는 첫 청크까지의 지연이 전체 생성 시간과 같습니다.
+    실시간 전달이 필요하면 응답 스트리밍 브리지 뒤에서 stream_handler를 사용합니다.
+    """
+    if _http_method(event) == 'OPTIONS':
+        return APIResponse.cors_preflight()
+
+    try:
+        body = parse_body(event)
+    except ValueError as e:
+        return APIResponse.error(str(e), 400)
+
+    frames = ''.join(format_sse(frame) for frame in generate_chat_events(body))
+
+    return {
+        'statusCode': 200,
+        'headers': SSE_HEADERS,
+        'body': frames
+    }
+
+
+@track_aws_calls('chat_stream')
+def stream_handler(event, response_stream, websocket_service: Optional[WebSocketService] = None) -> None:
+    """
+    응답 스트리밍 핸들러 - SSE 프레임을 생성 즉시 스트림에 기록
+
+    대기열(queued) 프레임은 용량 대기 중에 바로 기록합니다 (첫 청크를 기다리지 않음).
+
+    Args:
+        event: 함수 URL 이벤트
+        response_stream: write()/flush()를 지원하는 바이너리 스트림
+        websocket_service: 서비스 (테스트/하네스용 주입)
+    """
+    try:
+        body = parse_body(event)
+    except ValueError as e:
+        _write(response_stream, format_sse({'type': 'error', 'message': str(e)}))
+        return
+
+    def write_frame(frame: Dict[str, Any]) -> None:
+        _write(response_stream, format_sse(frame))
+
+    for frame in generate_chat_events(body, websocket_service, on_frame=write_frame):
+        write_frame(frame)
+
+
+def parse_body(event: Dict[str, Any]) -> Dict[str, Any]:
+    """함수 URL 이벤트 본문 파싱"""
+    raw = event.get('body')
+    if not raw:
+        raise ValueError('No message body provided')
+
+    if event.get('isBase64Encoded'):
+        raw = base64.b64decode(raw).decode('utf-8')
+
+    body = json.loads(raw) if isinstance(raw, str) else raw
+    if not body.get('message'):
+        raise ValueError('message is required')
+
+    return body
+
+
+def generate_chat_events(
+    body: Dict[str, Any],
+    websocket_service: Optional[WebSocketService] = None,
+    on_frame: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    채팅 요청 처리 - WebSocket 경로와 같은 프레임(dict)을 순서대로 생성
+
+    Args:
+        body: 요청 본문 (sendMessage와 동일한 필드)
+        websocket_service: 서비스 (없으면 생성)
+        on_frame: 생성기 밖(용량 대기 중)에서 발생한 queued 프레임을 즉시 전달하는 콜백
+                  (없으면 모아 두었다가 다음 프레임 전에 생성)
+
+    Yields:
+        ai_start, ai_chunk..., (guardrail_intervened), chat_end 또는 error/capacity_exceeded/queued 프레임
+    """
+    user_message = body.get('message', '')
+    engine_type = body.get('engineType', DEFAULT_ENGINE_TYPE)
+    user_id = body.get('userId', body.get('email', 'anonymous'))
+    user_role = determine_user_role(user_id, body)
+    user_plan = determine_user_plan(user_id)
+
+    try:
+        websocket_service = websocket_service or WebSocketService()
+
+        # 1. 메시지 처리 시작 (사용자 메시지 저장 + 히스토리 병합)
+        process_result = websocket_service.process_message(
+            user_message=user_message,
+            engine_type=engine_type,
+            conversation_id=body.get('conversationId'),
+            user_id=user_id,
+            conversation_history=body.get('conversationHistory', []),
+            user_role=user_role
+        )
+        conversation_id = process_result['conversation_id']
+
+        yield {
+            'type': 'ai_start',
+            'conversationId': conversation_id,
+            'timestamp': _now()
+        }
+
+        # 2. 스트리밍 응답 (AI 응답 저장은 stream_response 내부에서 처리)
+        # 대기열 프레임은 생성기 밖에서 발생 - on_frame이 있으면 즉시 전달, 없으면 다음 프레임 전에 전송
+        queued_frames = []
+
+        def on_queued(position: int) -> None:
+            frame = {'type': 'queued', 'position': position, 'timestamp': _now()}
+            if on_frame:
+                on_frame(frame)
+            else:
+                queued_frames.append(frame)
+
+        chunk_index = 0
+        total_response = ""
+        stream_info = {}
+
+        for chunk in websocket_service.stream_response(
+            user_message=user_message,
+            engine_type=engine_type,
+            conversation_id=conversation_id,
+            user_id=user_id,
+            conversation_history=process_result['merged_history'],
+            user_role=user_role,
+            user_plan=user_plan,
+            conversation_summary=process_result.get('summary'),
+            stream_info=stream_info,
+            on_queued=on_queued
+        ):
+            while queued_frames:
+                yield queued_frames.pop(0)
+
+            total_response += chunk
+            yield {
+                'type': 'ai_chunk',
+                'chunk': chunk,
+                'chunk_index': chunk_index,
+                'timestamp': _now()
+            }
+            chunk_index += 1
+
+        # 3. 사용량 추적
+        websocket_service.track_usage(
+            user_id=user_id,
+            engine_type=engine_type,
+            input_text=user_message,
+            output_text=total_response,
+            user_plan=user_plan
+        )
+
+        # 가드레일 개입 시 중단 프레임 (클라이언트는 표시 중인 응답을 차단 메시지로 대체)
+        guardrail_frame = build_guardrail_frame(stream_info, conversation_id)
+        if guardrail_frame:
+            yield guardrail_frame
+        record_stream_metrics(stream_info, 'chat_stream')
+
+        yield {
+            'type': 'chat_end',
+            'engine': engine_type,
+            'conversationId': conversation_id,
+            'total_chunks': chunk_index,
+            'response_length': len(total_response),
+            'stopReason': stream_info.get('stop_reason'),
+            'maxTokens': stream_info.get('max_tokens'),
+            'message': '응답 생성이 완료되었습니다.',
+            'timestamp': _now()
+        }
+
+        logger.info(
+            "Stream completed", conversationId=conversation_id, chunks=chunk_index, chars=len(total_response),
+            stopReason=stream_info.get('stop_reason')
+        )
+
+        # 4. 긴 대화 요약 (chat_end 전송 후 - 실패해도 무시)
+        websocket_service.summarize_history(conversation_id)
+
+    except CapacityExceededError as e:
+        logger.warning("Request shed by capacity scheduler: %s", e)
+        yield {
+            'type': 'capacity_exceeded',
+            'message': str(e),
+            'retryAfter': e.retry_after
+        }
+
+    except Exception as e:
+        logger.error("Error processing stream: %s", e, exc_info=True)
+        yield {
+            'type': 'error',
+            'message': f'처리 중 오류가 발생했습니다: {str(e)}'
+        }
+
+
+def format_sse(frame: Dict[str, Any]) -> str:
+    """
+    SSE 프레임 포맷팅
+
+    event: <type>
+    id: <chunk_index>   (ai_chunk만)
+    data: <json>
+    """
+    lines = [f"event: {frame.get('type', 'message')}"]
+    if frame.get('type') == 'ai_chunk':
+        lines.append(f"id: {frame['chunk_index']}")
+    lines.append(f"data: {encode_frame(frame)}")
+    return '\n'.join(lines) + '\n\n'
+
+
+def _write(response_stream, text: str) -> None:
+    response_stream.write(text.encode('utf-8'))
+    if hasattr(response_stream, 'flush'):
+        response_stream.flush()
+
+
+def _http_method(event: Dict[str, Any]) -> Optional[str]:
+    return event.get('requestContext', {}).get('http', {}).get('method') or event.get('httpMethod')
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat() + 'Z'
@@ -9,20 +9,24 @@ from decimal import Decimal
 
 from src.services.conversation_service import ConversationService
 from src.config.business import DEFAULT_ENGINE_TYPE, DB_QUERY_LIMITS
-from utils.response import APIResponse
-from utils.logger import setup_logger
+from src.config.aws import HTTP_CACHE_CONFIG
+from utils.response import APIResponse, make_etag, etag_matches, get_header, compressed
+from utils.logger import get_structured_logger, event_summary
+from utils.metrics import track_aws_calls
 
 # 로깅 설정
-logger = setup_logger(__name__)
+logger = get_structured_logger(__name__)
 
 
 
 
+@track_aws_calls('conversation')
+@compressed
 def handler(event, context):
     """
     Lambda 핸들러 - 대화 관리 API
     """
-    logger.info(f"Event: {json.dumps(event)}")
+    logger.info("Conversation API event", **event_summary(event))
     
     # API Gateway v2 형식 처리
     if 'version' in event and event['version'] == '2.0':
@@ -53,31 +57,101 @@ def handler(event, context):
             if not user_id:
                 return APIResponse.error('userId is required', 400)
             
-            # get_user_conversations 메서드 사용 (엔진별 필터링 지원)
-            conversations = conversation_service.get_user_conversations(
-                user_id,
-                engine_type=engine_type,  # 엔진 타입 전달 (효율적인 GSI 사용)
-                limit=DB_QUERY_LIMITS['max_conversations_query']
-            )
-
-            # updatedAt 기준으로 내림차순 정렬 (최신이 위로)
-            conversations.sort(key=lambda x: x.updated_at or x.created_at or '', reverse=True)
+            try:
+                page_size = int(query_params.get('limit') or DB_QUERY_LIMITS['default_conversations_page_size'])
+            except ValueError:
+                return APIResponse.error('limit must be an integer', 400)
+            page_size = max(1, min(page_size, DB_QUERY_LIMITS['max_conversations_page_size']))
 
-            # to_dict 메서드로 변환
-            conversations_dict = [conv.to_dict() for conv in conversations]
+            # updatedAt 인덱스로 최근 활동순 요약만 조회 (메시지 제외)
+            # since 지정 시 워터마크 이후 변경/삭제분만 조회 (델타 동기화)
+            try:
+                page = conversation_service.list_conversations(
+                    user_id,
+                    engine_type=engine_type,
+                    page_size=page_size,
+                    cursor=query_params.get('cursor'),
+                    since=query_params.get('since')
+                )
+            except ValueError as e:
+                return APIResponse.error(str(e), 400)
 
             return APIResponse.success({
-                'conversations': conversations_dict,
-                'count': len(conversations_dict)
+                'conversations': page['conversations'],
+                'count': len(page['conversations']),
+                'deleted': page['deleted'],
+                'nextCursor': page['nextCursor'],
+                'watermark': page['watermark'],
+                'reset': page['reset']
             })
         
         # GET /conversations/{conversationId} - 상세 조회
         elif http_method == 'GET' and 'conversationId' in path_params:
-            conversation = conversation_service.get_conversation(
-                path_params['conversationId']
-            )
+            query_params = event.get('queryStringParameters', {}) or {}
+            conversation_id = path_params['conversationId']
+
+            # ETag = 대화 updatedAt + 조회 파라미터 (파라미터마다 응답이 다르므로 구분)
+            variant = '&'.join(f"{key}={query_params[key]}" for key in sorted(query_params))
+
+            def conversation_etag(updated_at):
+                return make_etag('conversation', conversation_id, updated_at, variant)
+
+            def cached_success(data):
+                return APIResponse.success(data, headers={
+                    'ETag': conversation_etag(data.get('updatedAt')),
+                    'Cache-Control': HTTP_CACHE_CONFIG['conversation_cache_control']
+                })
+
+            # If-None-Match가 있으면 메시지를 읽기 전에 버전만 확인
+            if get_header(event, 'If-None-Match'):
+                updated_at = conversation_service.get_conversation_version(conversation_id)
+                if updated_at and etag_matches(event, conversation_etag(updated_at)):
+                    return APIResponse.not_modified(
+                        conversation_etag(updated_at),
+                        HTTP_CACHE_CONFIG['conversation_cache_control']
+                    )
+
+            # since/afterSeq 지정 시 변경분만 반환 (델타 동기화)
+            if query_params.get('since') or query_params.get('afterSeq'):
+                try:
+                    after_seq = query_params.get('afterSeq')
+                    delta = conversation_service.get_conversation_delta(
+                        conversation_id,
+                        since=query_params.get('since'),
+                        after_seq=int(after_seq) if after_seq else None
+                    )
+                except ValueError as e:
+                    return APIResponse.error(str(e), 400)
+
+                if delta:
+                    return cached_success(delta)
+                return APIResponse.error('Conversation not found', 404)
+
+            # limit/before 지정 시 최신 메시지 N개만 반환 (이전 메시지는 olderCursor로 조회)
+            if query_params.get('limit') or query_params.get('before'):
+                try:
+                    limit = int(query_params.get('limit') or DB_QUERY_LIMITS['default_messages_page_size'])
+                    before = query_params.get('before')
+                    before = int(before) if before else None
+                except ValueError:
+                    return APIResponse.error('limit and before must be integers', 400)
+
+                page = conversation_service.get_conversation_page(
+                    conversation_id,
+                    limit=max(1, min(limit, DB_QUERY_LIMITS['max_messages_page_size'])),
+                    before=before
+                )
+                if page:
+                    return cached_success(page)
+                return APIResponse.error('Conversation not found', 404)
+
+            conversation = conversation_service.get_conversation(conversation_id, full_content=True)
             if conversation:
-                return APIResponse.success(conversation.to_dict())
+                return cached_success({
+                    **conversation.to_dict(),
+                    'watermark': conversation.updated_at,
+                    'lastSeq': conversation_service.message_seq_base(conversation) + len(conversation.messages) - 1
+                })
             else:
                 return APIResponse.error('Conversation not found', 404)
         
@@ -101,7 +175,7 @@ def handler(event, context):
                 existing = conversation_service.get_conversation(conversation_id)
                 if existing:
                     # 기존 대화가 있으면 무시 (이미 저장됨)
-                    logger.info(f"Conversation {conversation_id} already exists, skipping save")
+                    logger.info("Conversation already exists, skipping save", conversationId=conversation_id)
                     return APIResponse.success({
                         'conversationId': conversation_id,
                         'userId': user_id,
@@ -126,25 +200,21 @@ def handler(event, context):
             body = json.loads(event.get('body', '{}'))
             conversation_id = path_params['conversationId']
             
-            logger.info(f"PATCH request for conversation: {conversation_id}")
-            logger.info(f"Request body: {body}")
-            
             if 'title' in body:
                 new_title = body['title']
-                logger.info(f"Attempting to update title to: {new_title}")
-                
                 success = conversation_service.update_title(conversation_id, new_title)
-                
-                logger.info(f"Update result: {success}")
+                logger.info(
+                    "Conversation title updated", conversationId=conversation_id,
+                    titleChars=len(new_title or ''), success=success
+                )
                 
                 if success:
-                    logger.info(f"Successfully updated conversation {conversation_id}")
                     return APIResponse.success({'message': 'Conversation updated'})
                 else:
-                    logger.error(f"Failed to update conversation {conversation_id}")
+                    logger.error("Failed to update conversation", conversationId=conversation_id)
                     return APIResponse.error('Failed to update conversation', 500)
             else:
-                logger.warning("No title field in request body")
+                logger.warning("No title field in request body", bodyKeys=sorted(body))
                 return APIResponse.error('No title field to update', 400)
         
         # DELETE /conversations/{conversationId} - 대화 삭제
@@ -161,5 +231,5 @@ def handler(event, context):
             return APIResponse.error('Method not allowed', 405)
             
     except Exception as e:
-        logger.error(f"Error in conversation handler: {e}", exc_info=True)
+        logger.error("Error in conversation handler: %s", e, exc_info=True)
         return APIResponse.error(str(e), 500)
\ No newline at end of file
@@ -6,12 +6,16 @@ import json
 from typing import Dict, Any
 
 from src.services import EnginePromptService
-from utils.logger import setup_logger
-from utils.response import APIResponse
+from src.config.aws import HTTP_CACHE_CONFIG
+from utils.logger import get_structured_logger, event_summary
+from utils.metrics import track_aws_calls
+from utils.response import APIResponse, make_etag, compressed
 
-logger = setup_logger(__name__)
+logger = get_structured_logger(__name__)
 
 
+@track_aws_calls('prompt')
+@compressed
 def handler(event, context):
     """
     Lambda 핸들러 - 프롬프트 관리 API
@@ -21,7 +25,7 @@ def handler(event, context):
     2. 서비스 계층 호출
     3. 응답 반환
     """
-    logger.info(f"Prompt API Event: {json.dumps(event)}")
+    logger.info("Prompt API event", **event_summary(event))
 
     # API Gateway v2 형식 처리
     if 'version' in event and event['version'] == '2.0':
@@ -44,9 +48,6 @@ def handler(event, context):
         body = {}
         if event.get('body'):
             body = json.loads(event['body']) if isinstance(event['body'], str) else event['body']
-            logger.info(f"Request body: {body}")
-
-        logger.info(f"Method: {http_method}, Path: {path}, PathParams: {path_params}")
 
         # 서비스 초기화
         prompt_service = EnginePromptService()
@@ -55,15 +56,15 @@ def handler(event, context):
         if '/prompts' in path:
             if '/files' in path:
                 # 파일 관련 작업
-                return handle_files(prompt_service, http_method, path_params, body)
+                return handle_files(prompt_service, http_method, path_params, body, event)
             else:
                 # 프롬프트 관련 작업
-                return handle_prompts(prompt_service, http_method, path_params, body)
+                return handle_prompts(prompt_service, http_method, path_params, body, event)
 
         return APIResponse.error('Not Found', 404)
 
     except Exception as e:
-        logger.error(f"Error in handler: {str(e)}", exc_info=True)
+        logger.error("Error in handler: %s", e, exc_info=True)
         return APIResponse.error(str(e))
 
 
@@ -71,7 +72,8 @@ def handle_prompts(
     service: EnginePromptService,
     method: str,
     path_params: Dict,
-    body: Dict
+    body: Dict,
+    event: Dict = None
 ) -> Dict:
     """
     프롬프트 (설명, 지침) CRUD 처리
@@ -81,21 +83,26 @@ def handle_prompts(
         method: HTTP 메서드
         path_params: 경로 파라미터
         body: 요청 본문
+        event: Lambda 이벤트 (조건부 GET 헤더 확인용)
 
     Returns:
         API Response
     """
     # promptId와 engineType 둘 다 지원 (API Gateway 호환성)
     engine_type = path_params.get('promptId') or path_params.get('engineType')
-    logger.info(f"handle_prompts - method: {method}, engine_type: {engine_type}")
+    logger.info("handle_prompts", method=method, engineType=engine_type)
 
     try:
         if method == 'GET':
             # 프롬프트 조회
             if engine_type:
-                # 특정 엔진의 프롬프트 조회
-                result = service.get_prompt_with_files(engine_type)
-                return APIResponse.success(result)
+                # 특정 엔진의 프롬프트 조회 (번들 버전 ETag - 일치하면 파일 내용을 읽지 않음)
+                return APIResponse.conditional(
+                    event or {},
+                    make_etag('prompt', engine_type, service.get_bundle_version(engine_type)),
+                    lambda: service.get_prompt_with_files(engine_type),
+                    HTTP_CACHE_CONFIG['prompts_cache_control']
+                )
             else:
                 # 모든 프롬프트 조회
                 prompts = service.get_all_prompts()
@@ -123,7 +130,7 @@ def handle_prompts(
             if not engine_type:
                 return APIResponse.error('engineType is required', 400)
 
-            logger.info(f"Updating prompt {engine_type} with body: {body}")
+            logger.info("Updating prompt", engineType=engine_type, bodyKeys=sorted(body))
 
             success = service.update_prompt(
                 engine_type=engine_type,
@@ -151,7 +158,7 @@ def handle_prompts(
         return APIResponse.error('Method not allowed', 405)
 
     except Exception as e:
-        logger.error(f"Error in handle_prompts: {str(e)}", exc_info=True)
+        logger.error("Error in handle_prompts: %s", e, exc_info=True)
         return APIResponse.error(str(e))
 
 
@@ -159,7 +166,8 @@ def handle_files(
     service: EnginePromptService,
     method: str,
     path_params: Dict,
-    body: Dict
+    body: Dict,
+    event: Dict = None
 ) -> Dict:
     """
     파일 CRUD 처리
@@ -169,6 +177,7 @@ def handle_files(
         method: HTTP 메서드
         path_params: 경로 파라미터
         body: 요청 본문
+        event: Lambda 이벤트 (조건부 GET 헤더 확인용)
 
     Returns:
         API Response
@@ -177,7 +186,7 @@ def handle_files(
     engine_type = path_params.get('promptId') or path_params.get('engineType')
     file_id = path_params.get('fileId')
 
-    logger.info(f"handle_files - method: {method}, engine_type: {engine_type}, file_id: {file_id}")
+    logger.info("handle_files", method=method, engineType=engine_type, fileId=file_id)
 
     try:
         if method == 'GET':
@@ -185,8 +194,12 @@ def handle_files(
             if not engine_type:
                 return APIResponse.error('engineType is required', 400)
 
-            files = service.get_files(engine_type)
-            return APIResponse.success({'files': files})
+            return APIResponse.conditional(
+                event or {},
+                make_etag('files', engine_type, service.get_bundle_version(engine_type)),
+                lambda: {'files': service.get_files(engine_type)},
+                HTTP_CACHE_CONFIG['prompts_cache_control']
+            )
 
         elif method == 'POST':
             # 새 파일 추가
@@ -233,5 +246,5 @@ def handle_files(
         return APIResponse.error('Method not allowed', 405)
 
     except Exception as e:
-        logger.error(f"Error in handle_files: {str(e)}", exc_info=True)
+        logger.error("Error in handle_files: %s", e, exc_info=True)
         return APIResponse.error(str(e))
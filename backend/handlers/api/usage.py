@@ -7,13 +7,17 @@ import logging
 from urllib.parse import unquote
 
 from src.services import SimpleUsageService
-from utils.logger import setup_logger
-from utils.response import APIResponse
+from src.config.aws import HTTP_CACHE_CONFIG
+from utils.logger import get_structured_logger, event_summary
+from utils.metrics import track_aws_calls
+from utils.response import APIResponse, make_etag, compressed
 
 # 로깅 설정
-logger = setup_logger(__name__)
+logger = get_structured_logger(__name__)
 
 
+@track_aws_calls('usage')
+@compressed
 def handler(event, context):
     """
     Lambda 핸들러 - 사용량 API
@@ -24,7 +28,7 @@ def handler(event, context):
     3. 응답 반환
     """
     try:
-        logger.info(f"Usage API Event: {json.dumps(event)}")
+        logger.info("Usage API event", **event_summary(event))
 
         # API Gateway v2 형식 처리
         if 'version' in event and event['version'] == '2.0':
@@ -45,7 +49,7 @@ def handler(event, context):
 
         # 라우팅
         if http_method == 'GET':
-            return handle_get_usage(usage_service, path_params)
+            return handle_get_usage(usage_service, path_params, event)
 
         elif http_method == 'POST':
             body = event.get('body')
@@ -59,13 +63,14 @@ def handler(event, context):
             return APIResponse.error('지원하지 않는 HTTP 메서드', 405)
 
     except Exception as e:
-        logger.error(f"Lambda 핸들러 오류: {e}", exc_info=True)
+        logger.error("Lambda 핸들러 오류: %s", e, exc_info=True)
         return APIResponse.error('서버 내부 오류', 500)
 
 
 def handle_get_usage(
     service: SimpleUsageService,
-    path_params: dict
+    path_params: dict,
+    event: dict = None
 ) -> dict:
     """
     사용량 조회 처리
@@ -73,6 +78,7 @@ def handle_get_usage(
     Args:
         service: SimpleUsageService 인스턴스
         path_params: 경로 파라미터
+        event: Lambda 이벤트 (조건부 GET 헤더 확인용)
 
     Returns:
         API Response
@@ -91,20 +97,26 @@ def handle_get_usage(
         if engine_type_or_all == 'all':
             # 전체 사용량 조회
             data = service.get_all_usage(user_id)
-            return APIResponse.success({
-                'success': True,
-                'data': data
-            })
+            records = [record for records in data.values() for record in records]
         else:
             # 특정 엔진 사용량 조회
             data = service.get_usage(user_id, engine_type_or_all)
-            return APIResponse.success({
-                'success': True,
-                'data': data
-            })
+            records = [data] if data else []
+
+        # 사용량 레코드의 updatedAt/토큰 수로 ETag 생성 (변경 없으면 304)
+        versions = sorted(
+            f"{r.get('date') or r.get('usageDate')}@{r.get('updatedAt')}#{r.get('totalTokens')}"
+            for r in records
+        )
+        return APIResponse.conditional(
+            event or {},
+            make_etag('usage', user_id, engine_type_or_all, *versions),
+            lambda: {'success': True, 'data': data},
+            HTTP_CACHE_CONFIG['usage_cache_control']
+        )
 
     except Exception as e:
-        logger.error(f"Error in handle_get_usage: {str(e)}", exc_info=True)
+        logger.error("Error in handle_get_usage: %s", e, exc_info=True)
         return APIResponse.error(str(e))
 
 
@@ -145,5 +157,5 @@ def handle_update_usage(
         return APIResponse.success(result)
 
     except Exception as e:
-        logger.error(f"Error in handle_update_usage: {str(e)}", exc_info=True)
+        logger.error("Error in handle_update_usage: %s", e, exc_info=True)
         return APIResponse.error(str(e))
@@ -1,16 +1,18 @@
 """
 WebSocket 연결 핸들러 (Refactored)
 """
-import boto3
 from datetime import datetime
 from src.config.database import get_table_name, AWS_REGION
+from src.repositories.aws_clients import get_resource
 from src.config.business import DEFAULT_ENGINE_TYPE, WEBSOCKET_CONFIG
-from utils.logger import get_logger
+from utils.logger import get_structured_logger
 from utils.response import create_response
+from utils.metrics import put_metrics, track_aws_calls
 
-logger = get_logger(__name__)
+logger = get_structured_logger(__name__)
 
 
+@track_aws_calls('connect')
 def handler(event, context):
     """
     WebSocket 연결 시 처리
@@ -19,6 +21,7 @@ def handler(event, context):
     1. 연결 ID 추출
     2. 사용자 정보 파싱
     3. 연결 정보 DynamoDB에 저장
+    4. 연결/재연결 메트릭 기록
     """
     try:
         connection_id = event['requestContext']['connectionId']
@@ -27,9 +30,11 @@ def handler(event, context):
         query_params = event.get('queryStringParameters', {}) or {}
         user_id = query_params.get('userId', 'anonymous')
         engine_type = query_params.get('engineType', DEFAULT_ENGINE_TYPE)
+        # 클라이언트 자동 재연결 여부 (재연결률 측정용)
+        is_reconnect = str(query_params.get('reconnect', '')).lower() in ('1', 'true')
 
         # 연결 정보 저장
-        dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+        dynamodb = get_resource('dynamodb', AWS_REGION)
         table = dynamodb.Table(get_table_name('websocket_connections'))
 
         table.put_item(
@@ -38,13 +43,22 @@ def handler(event, context):
                 'userId': user_id,
                 'engineType': engine_type,
                 'connectedAt': datetime.utcnow().isoformat(),
+                'isReconnect': is_reconnect,
                 'ttl': int(datetime.utcnow().timestamp()) + WEBSOCKET_CONFIG['connection_ttl']
             }
         )
 
-        logger.info(f"WebSocket connected: {connection_id} for user {user_id}")
+        put_metrics(
+            {
+                'WebSocketConnect': 1,
+                'WebSocketReconnect': 1 if is_reconnect else 0
+            },
+            dimensions={'Handler': 'connect'}
+        )
+
+        logger.info("WebSocket connected", connectionId=connection_id, userId=user_id, reconnect=is_reconnect)
         return create_response(200, {'message': 'Connected'})
 
     except Exception as e:
-        logger.error(f"Connection error: {str(e)}", exc_info=True)
+        logger.error("Connection error: %s", e, exc_info=True)
         return create_response(500, {'error': str(e)})
@@ -1,14 +1,17 @@
 """
 WebSocket 연결 해제 핸들러 (Refactored)
 """
-import boto3
+from datetime import datetime
 from src.config.database import get_table_name, AWS_REGION
-from utils.logger import get_logger
+from src.repositories.aws_clients import get_resource
+from utils.logger import get_structured_logger
 from utils.response import create_response
+from utils.metrics import put_metrics, track_aws_calls
 
-logger = get_logger(__name__)
+logger = get_structured_logger(__name__)
 
 
+@track_aws_calls('disconnect')
 def handler(event, context):
     """
     WebSocket 연결 해제 시 처리
@@ -16,21 +19,34 @@ def handler(event, context):
     Responsibilities:
     1. 연결 ID 추출
     2. 연결 정보 DynamoDB에서 삭제
+    3. 연결 유지 시간 메트릭 기록
     """
     try:
         connection_id = event['requestContext']['connectionId']
 
         # 연결 정보 삭제
-        dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+        dynamodb = get_resource('dynamodb', AWS_REGION)
         table = dynamodb.Table(get_table_name('websocket_connections'))
 
-        table.delete_item(
-            Key={'connectionId': connection_id}
+        response = table.delete_item(
+            Key={'connectionId': connection_id},
+            ReturnValues='ALL_OLD'
         )
 
-        logger.info(f"WebSocket disconnected: {connection_id}")
+        # 연결 유지 시간 기록 (삭제된 연결 정보 사용 - 추가 조회 없음)
+        connected_at = response.get('Attributes', {}).get('connectedAt')
+        if connected_at:
+            lifetime = (datetime.utcnow() - datetime.fromisoformat(connected_at)).total_seconds()
+            put_metrics(
+                {'ConnectionLifetime': (lifetime, 'Seconds')},
+                dimensions={'Handler': 'disconnect'},
+                disconnectStatusCode=event['requestContext'].get('disconnectStatusCode'),
+                disconnectReason=event['requestContext'].get('disconnectReason')
+            )
+
+        logger.info("WebSocket disconnected", connectionId=connection_id)
         return create_response(200, {'message': 'Disconnected'})
 
     except Exception as e:
-        logger.error(f"Disconnect error: {str(e)}", exc_info=True)
+        logger.error("Disconnect error: %s", e, exc_info=True)
         return create_response(500, {'error': str(e)})
@@ -3,42 +3,53 @@ WebSocket Message Handler
 WebSocket 메시지 처리 Lambda 핸들러
 """
 import json
-import boto3
-import logging
+import time
 from datetime import datetime
 
 import sys
 import os
 
 
-from src.services import WebSocketService
+from src.services import WebSocketService, CapacityExceededError, IdempotencyService
+from src.services.idempotency_service import STATUS_COMPLETED, STATUS_IN_PROGRESS
 from src.config.database import AWS_REGION, get_table_name
-from src.config.business import DEFAULT_ENGINE_TYPE, ADMIN_EMAILS
-from utils.logger import setup_logger
+from src.config.aws import GUARDRAIL_CONFIG
+from src.repositories.aws_clients import get_client, get_resource
+from src.config.business import DEFAULT_ENGINE_TYPE, ADMIN_EMAILS, IDEMPOTENCY_CONFIG, get_user_plan
+from lib.bedrock_client_enhanced import GUARDRAIL_STOP_REASON
+from utils.logger import get_structured_logger, event_summary
+from utils.metrics import put_metric, put_metrics, track_aws_calls
+from utils.serialization import encode_ai_chunk, encode_frame
 
-logger = setup_logger(__name__)
+logger = get_structured_logger(__name__)
 
+# API Gateway Management API 클라이언트 (웜 컨테이너에서 재사용)
+_apigateway_clients = {}
 
+
+@track_aws_calls('message')
 def handler(event, context):
     """
     WebSocket 메시지 핸들러 - Service Layer 사용
     """
-    logger.info(f"Message event: {json.dumps(event)}")
-    
     # WebSocket 연결 정보
     connection_id = event['requestContext']['connectionId']
     domain_name = event['requestContext']['domainName']
     stage = event['requestContext']['stage']
     
     # API Gateway Management API 클라이언트
-    apigateway_client = boto3.client(
-        'apigatewaymanagementapi',
-        endpoint_url=f'https://{domain_name}/{stage}',
-        region_name=AWS_REGION
-    )
+    apigateway_client = get_apigateway_client(domain_name, stage)
+    
+    # Keepalive ping - DynamoDB 접근이나 서비스 초기화 없이 즉시 응답
+    if is_ping(event):
+        return handle_ping(connection_id, apigateway_client)
+    
+    logger.info("Message event", **event_summary(event))
     
     # Service 초기화
     websocket_service = WebSocketService()
+    idempotency_service = None
+    request_id = None
     
     try:
         # 요청 파싱
@@ -72,8 +83,39 @@ def handler(event, context):
             user_id = body.get('userId', body.get('email', connection_id))
             conversation_history = body.get('conversationHistory', [])
             user_role = determine_user_role(user_id, body)
+            user_plan = determine_user_plan(user_id)
             
-            logger.info(f"Processing message for {engine_type}, user: {user_id}, role: {user_role}")
+            logger.info(
+                "Processing message",
+                engineType=engine_type, userId=user_id, role=user_role, plan=user_plan,
+                conversationId=conversation_id, messageChars=len(user_message), historyMessages=len(conversation_history)
+            )
+            
+            # 0. 멱등성 확인 - 재시도 요청은 새 생성 대신 기존 결과에 합류
+            save_user_message = True
+            request_id = resolve_request_id(body)
+            
+            if request_id:
+                service = IdempotencyService()
+                if not service.enabled:
+                    request_id = None
+                else:
+                    begin_result = service.begin(request_id, connection_id, user_id)
+                    
+                    # 중복 요청은 원본 요청의 레코드를 건드리지 않고 결과에만 합류
+                    if begin_result['status'] in (STATUS_COMPLETED, STATUS_IN_PROGRESS):
+                        return handle_duplicate_request(
+                            websocket_service, service, request_id,
+                            begin_result['record'], connection_id, apigateway_client
+                        )
+                    
+                    idempotency_service = service
+            
+                    # 중단된 이전 생성을 이어받는 경우 저장된 대화/사용자 메시지 재사용
+                    if begin_result['status'] == 'takeover':
+                        record = begin_result['record']
+                        conversation_id = record.get('conversationId', conversation_id)
+                        save_user_message = not record.get('userMessageSaved', False)
             
             # 1. 메시지 처리 시작
             process_result = websocket_service.process_message(
@@ -82,11 +124,16 @@ def handler(event, context):
                 conversation_id=conversation_id,
                 user_id=user_id,
                 conversation_history=conversation_history,
-                user_role=user_role
+                user_role=user_role,
+                save_user_message=save_user_message
             )
             
             conversation_id = process_result['conversation_id']
             merged_history = process_result['merged_history']
+            conversation_summary = process_result.get('summary')
+            
+            if idempotency_service:
+                idempotency_service.mark_user_message_saved(request_id, conversation_id)
             
             # 2. AI 시작 알림
             send_message_to_client(connection_id, {
@@ -94,9 +141,12 @@ def handler(event, context):
                 'timestamp': datetime.utcnow().isoformat() + 'Z'
             }, apigateway_client)
             
-            # 3. 스트리밍 응답 전송
+            # 3. 스트리밍 응답 전송 (재시도로 합류한 연결에도 함께 전송)
             chunk_index = 0
             total_response = ""
+            recipients = [connection_id]
+            last_subscriber_refresh = time.monotonic()
+            stream_info = {}
             
             for chunk in websocket_service.stream_response(
                 user_message=user_message,
@@ -104,17 +154,29 @@ def handler(event, context):
                 conversation_id=conversation_id,
                 user_id=user_id,
                 conversation_history=merged_history,
-                user_role=user_role
+                user_role=user_role,
+                user_plan=user_plan,
+                conversation_summary=conversation_summary,
+                stream_info=stream_info,
+                on_queued=lambda position: send_message_to_client(connection_id, {
+                    'type': 'queued',
+                    'position': position,
+                    'timestamp': datetime.utcnow().isoformat() + 'Z'
+                }, apigateway_client)
             ):
+                # 새로 합류한 연결에는 지금까지의 응답을 먼저 전송
+                if idempotency_service and time.monotonic() - last_subscriber_refresh >= IDEMPOTENCY_CONFIG['subscriber_refresh_interval']:
+                    last_subscriber_refresh = time.monotonic()
+                    for subscriber in idempotency_service.get_subscribers(request_id) - set(recipients):
+                        send_replay_chunk(subscriber, total_response, apigateway_client)
+                        recipients.append(subscriber)
+                
                 total_response += chunk
                 
-                # 청크 전송
-                send_message_to_client(connection_id, {
-                    'type': 'ai_chunk',
-                    'chunk': chunk,
-                    'chunk_index': chunk_index,
-                    'timestamp': datetime.utcnow().isoformat() + 'Z'
-                }, apigateway_client)
+                # 청크 전송 (한 번만 인코딩해 모든 수신자에게 전송)
+                frame = encode_ai_chunk(chunk, chunk_index, datetime.utcnow().isoformat() + 'Z')
+                for recipient in recipients:
+                    send_message_to_client(recipient, frame, apigateway_client)
                 
                 chunk_index += 1
             
@@ -123,23 +185,52 @@ def handler(event, context):
                 user_id=user_id,
                 engine_type=engine_type,
                 input_text=user_message,
-                output_text=total_response
+                output_text=total_response,
+                user_plan=user_plan
             )
 
             # Note: AI 응답은 WebSocketService.stream_response() 내부에서 이미 저장됨
 
+            # 가드레일 개입 - 중단 프레임 전송, 재생용 응답도 차단 메시지로 대체
+            guardrail_frame = build_guardrail_frame(stream_info, conversation_id)
+            if guardrail_frame:
+                total_response = guardrail_frame['message']
+                for recipient in recipients:
+                    send_message_to_client(recipient, guardrail_frame, apigateway_client)
+            record_stream_metrics(stream_info, 'message')
+
+            # 재생용 응답 저장 - 완료 직전에 합류한 연결에는 전체 응답 전송
+            if idempotency_service:
+                subscribers = idempotency_service.complete(
+                    request_id, conversation_id, total_response, chunk_index
+                )
+                for subscriber in subscribers - set(recipients):
+                    send_replay_chunk(subscriber, total_response, apigateway_client)
+                    recipients.append(subscriber)
+
             # 5. 완료 알림
-            send_message_to_client(connection_id, {
-                'type': 'chat_end',
-                'engine': engine_type,
-                'conversationId': conversation_id,
-                'total_chunks': chunk_index,
-                'response_length': len(total_response),
-                'message': '응답 생성이 완료되었습니다.',
-                'timestamp': datetime.utcnow().isoformat() + 'Z'
-            }, apigateway_client)
+            for recipient in recipients:
+                send_message_to_client(recipient, {
+                    'type': 'chat_end',
+                    'engine': engine_type,
+                    'conversationId': conversation_id,
+                    'requestId': request_id,
+                    'total_chunks': chunk_index,
+                    'response_length': len(total_response),
+                    # 종료 사유: end_turn, soft_limit(예산 근처 문단 경계), max_tokens(예산 도달), guardrail_intervened
+                    'stopReason': stream_info.get('stop_reason'),
+                    'maxTokens': stream_info.get('max_tokens'),
+                    'message': '응답 생성이 완료되었습니다.',
+                    'timestamp': datetime.utcnow().isoformat() + 'Z'
+                }, apigateway_client)
             
-            logger.info(f"Chat completed: {chunk_index} chunks, {len(total_response)} chars")
+            logger.info(
+                "Chat completed", conversationId=conversation_id, chunks=chunk_index, chars=len(total_response),
+                stopReason=stream_info.get('stop_reason')
+            )
+
+            # 6. 긴 대화 요약 (응답 완료 후 - 다음 턴의 입력 토큰 절감, 실패해도 무시)
+            websocket_service.summarize_history(conversation_id)
             
             return {
                 'statusCode': 200,
@@ -162,8 +253,28 @@ def handler(event, context):
                 'body': json.dumps({'error': 'Unknown action'})
             }
             
+    except CapacityExceededError as e:
+        logger.warning("Request shed by capacity scheduler: %s", e)
+
+        if idempotency_service:
+            idempotency_service.fail(request_id)
+
+        send_message_to_client(connection_id, {
+            'type': 'capacity_exceeded',
+            'message': str(e),
+            'retryAfter': e.retry_after
+        }, apigateway_client)
+
+        return {
+            'statusCode': 429,
+            'body': json.dumps({'error': 'Capacity exceeded'})
+        }
+
     except Exception as e:
-        logger.error(f"Error processing message: {str(e)}", exc_info=True)
+        logger.error("Error processing message: %s", e, exc_info=True, connectionId=connection_id)
+        
+        if idempotency_service:
+            idempotency_service.fail(request_id)
         
         # 에러 전송
         try:
@@ -172,7 +283,7 @@ def handler(event, context):
                 'message': f'처리 중 오류가 발생했습니다: {str(e)}'
             }, apigateway_client)
         except Exception as send_error:
-            logger.error(f"Failed to send error message to client: {str(send_error)}")
+            logger.error("Failed to send error message to client: %s", send_error, connectionId=connection_id)
         
         return {
             'statusCode': 500,
@@ -180,6 +291,171 @@ def handler(event, context):
         }
 
 
+def get_apigateway_client(domain_name, stage):
+    """엔드포인트별 API Gateway Management API 클라이언트 (캐시)"""
+    endpoint_url = f'https://{domain_name}/{stage}'
+    if endpoint_url not in _apigateway_clients:
+        _apigateway_clients[endpoint_url] = get_client('apigatewaymanagementapi', AWS_REGION, endpoint_url)
+    return _apigateway_clients[endpoint_url]
+
+
+def is_ping(event):
+    """keepalive ping 요청 여부"""
+    body = event.get('body')
+    if not body or '"ping"' not in body:
+        return False
+    try:
+        return json.loads(body).get('action') == 'ping'
+    except (ValueError, AttributeError):
+        return False
+
+
+def handle_ping(connection_id, apigateway_client):
+    """keepalive ping 처리 - 서버 시간을 담은 pong 응답"""
+    send_message_to_client(connection_id, {
+        'type': 'pong',
+        'serverTime': datetime.utcnow().isoformat() + 'Z'
+    }, apigateway_client)
+
+    put_metric('WebSocketPing', 1, dimensions={'Handler': 'message'})
+
+    return {
+        'statusCode': 200,
+        'body': json.dumps({'message': 'pong'})
+    }
+
+
+def build_guardrail_frame(stream_info, conversation_id):
+    """
+    가드레일 개입 시 클라이언트 중단 프레임 생성
+
+    비동기 가드레일 모드에서는 평가 전에 일부 청크가 이미 전송되므로,
+    클라이언트는 이 프레임을 받으면 표시 중인 응답을 message로 대체해야 합니다.
+
+    Returns:
+        guardrail_intervened 프레임 (개입이 없으면 None)
+    """
+    if stream_info.get('stop_reason') != GUARDRAIL_STOP_REASON:
+        return None
+    return {
+        'type': 'guardrail_intervened',
+        'conversationId': conversation_id,
+        'message': stream_info.get('guardrail_message') or GUARDRAIL_CONFIG['blocked_message'],
+        'timestamp': datetime.utcnow().isoformat() + 'Z'
+    }
+
+
+def record_stream_metrics(stream_info, handler_name):
+    """
+    스트리밍 지연/가드레일 메트릭 기록
+
+    GuardrailMode 차원(ASYNCHRONOUS/SYNCHRONOUS/OFF)별 TimeToFirstChunk를 비교하면
+    가드레일이 사용자 체감 지연에 더하는 시간을, GuardrailProcessingLatency로는
+    비동기 모드에서 응답과 병렬로 진행된 평가 시간을 확인할 수 있습니다.
+    """
+    metrics = {
+        'GuardrailIntervened': 1 if stream_info.get('stop_reason') == GUARDRAIL_STOP_REASON else 0
+    }
+    if stream_info.get('first_chunk_ms') is not None:
+        metrics['TimeToFirstChunk'] = (stream_info['first_chunk_ms'], 'Milliseconds')
+    if stream_info.get('guardrail_latency_ms') is not None:
+        metrics['GuardrailProcessingLatency'] = (stream_info['guardrail_latency_ms'], 'Milliseconds')
+
+    put_metrics(
+        metrics,
+        dimensions={'Handler': handler_name, 'GuardrailMode': stream_info.get('guardrail_mode', 'OFF')},
+        stopReason=stream_info.get('stop_reason')
+    )
+
+
+def resolve_request_id(body):
+    """클라이언트 요청 ID 추출 (분할 전송 시 청크별로 구분)"""
+    request_id = body.get('requestId') or body.get('idempotencyKey')
+    if not request_id:
+        return None
+
+    chunk_info = body.get('chunkInfo') or {}
+    if chunk_info.get('total', 1) > 1:
+        return f"{request_id}#{chunk_info.get('current', 1)}"
+
+    return str(request_id)
+
+
+def handle_duplicate_request(
+    websocket_service,
+    idempotency_service,
+    request_id,
+    record,
+    connection_id,
+    apigateway_client
+):
+    """재시도 요청 처리 - 진행 중이면 스트림에 합류, 완료되었으면 응답 재생"""
+    if record.get('status') == STATUS_IN_PROGRESS:
+        if idempotency_service.subscribe(request_id, connection_id):
+            logger.info("Request joined in-progress generation", requestId=request_id)
+            send_message_to_client(connection_id, {
+                'type': 'ai_start',
+                'requestId': request_id,
+                'resumed': True,
+                'timestamp': datetime.utcnow().isoformat() + 'Z'
+            }, apigateway_client)
+            return {
+                'statusCode': 200,
+                'body': json.dumps({'message': 'Joined in-progress generation'})
+            }
+
+        # 합류 직전에 완료됨 - 저장된 응답 재생
+        record = idempotency_service.get(request_id) or record
+
+    conversation_id = record.get('conversationId')
+    response_text = record.get('response', '')
+
+    # 응답이 너무 커서 저장되지 않은 경우 대화의 마지막 AI 메시지 사용
+    if not record.get('responseStored', True) and conversation_id:
+        conversation = websocket_service.conversation_repo.find_by_id(conversation_id)
+        assistant_messages = [m for m in (conversation.messages if conversation else []) if m.role == 'assistant']
+        if assistant_messages:
+            websocket_service.conversation_repo.hydrate_messages(assistant_messages[-1:])
+        response_text = assistant_messages[-1].content if assistant_messages else ''
+
+    logger.info("Request replayed from stored result", requestId=request_id, chars=len(response_text))
+
+    send_message_to_client(connection_id, {
+        'type': 'ai_start',
+        'requestId': request_id,
+        'replayed': True,
+        'timestamp': datetime.utcnow().isoformat() + 'Z'
+    }, apigateway_client)
+    send_replay_chunk(connection_id, response_text, apigateway_client)
+    send_message_to_client(connection_id, {
+        'type': 'chat_end',
+        'conversationId': conversation_id,
+        'requestId': request_id,
+        'replayed': True,
+        'total_chunks': 1,
+        'response_length': len(response_text),
+        'message': '응답 생성이 완료되었습니다.',
+        'timestamp': datetime.utcnow().isoformat() + 'Z'
+    }, apigateway_client)
+
+    return {
+        'statusCode': 200,
+        'body': json.dumps({'message': 'Replayed stored response'})
+    }
+
+
+def send_replay_chunk(connection_id, text, apigateway_client):
+    """지금까지 생성된 응답을 하나의 청크로 전송"""
+    if not text:
+        return
+
+    send_message_to_client(
+        connection_id,
+        encode_ai_chunk(text, 0, datetime.utcnow().isoformat() + 'Z', replay=True),
+        apigateway_client
+    )
+
+
 def determine_user_role(user_id, body):
     """사용자 역할 판단"""
     # body에서 직접 userRole 확인
@@ -194,25 +470,40 @@ def determine_user_role(user_id, body):
     return 'user'
 
 
+def determine_user_plan(user_id):
+    """
+    사용자 플랜 판단 (응답 예산, 용량 스케줄링 우선순위)
+
+    클라이언트가 보낸 userPlan/userRole은 신뢰하지 않고 서버 설정(PLAN_ASSIGNMENTS, ADMIN_EMAILS)으로만 판단합니다.
+    플랜을 확인할 수 없으면 None - 플랜별 응답/월 한도를 적용하지 않습니다.
+    """
+    return get_user_plan(user_id)
+
+
 def send_message_to_client(connection_id, message, apigateway_client):
-    """클라이언트에게 메시지 전송"""
+    """클라이언트에게 메시지 전송 (message는 dict 또는 미리 인코딩된 JSON 문자열)"""
     try:
         apigateway_client.post_to_connection(
             ConnectionId=connection_id,
-            Data=json.dumps(message, ensure_ascii=False, default=str)
+            Data=message if isinstance(message, str) else encode_frame(message)
+        )
+        logger.debug(
+            "Message sent",
+            sample=True,
+            connectionId=connection_id,
+            messageType=lambda: 'encoded' if isinstance(message, str) else message.get('type', 'unknown')
         )
-        logger.debug(f"Message sent to {connection_id}: {message.get('type', 'unknown')}")
         
     except apigateway_client.exceptions.GoneException:
-        logger.warning(f"Connection {connection_id} is gone")
+        logger.warning("Connection is gone", connectionId=connection_id)
         # 연결이 끊어진 경우 정리
         try:
-            dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+            dynamodb = get_resource('dynamodb', AWS_REGION)
             connections_table = dynamodb.Table(get_table_name('websocket_connections'))
             connections_table.delete_item(Key={'connectionId': connection_id})
         except Exception as cleanup_error:
-            logger.error(f"Failed to cleanup connection {connection_id}: {str(cleanup_error)}")
+            logger.error("Failed to cleanup connection: %s", cleanup_error, connectionId=connection_id)
             
     except Exception as e:
-        logger.error(f"Error sending message to {connection_id}: {str(e)}")
+        logger.error("Error sending message: %s", e, connectionId=connection_id)
         raise
\ No newline at end of file
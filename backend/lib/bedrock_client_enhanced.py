@@ -2,20 +2,21 @@
 AWS Bedrock Claude 클라이언트 - 최적화 버전
 관리자가 정의한 프롬프트를 효과적으로 처리
 """
-import boto3
 import json
 import logging
+import time
 from typing import Dict, Any, Iterator, List, Optional
 from datetime import datetime
 import os
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.config.aws import AWS_REGION, BEDROCK_CONFIG
+from src.config.aws import AWS_REGION, BEDROCK_CONFIG, GUARDRAIL_CONFIG
+from src.repositories.aws_clients import get_client
 
 logger = logging.getLogger(__name__)
 
-# Bedrock Runtime 클라이언트 초기화
-bedrock_runtime = boto3.client('bedrock-runtime', region_name=AWS_REGION)
+# Bedrock Runtime 클라이언트 초기화 (공유 팩토리 - 호출 계측)
+bedrock_runtime = get_client('bedrock-runtime', AWS_REGION)
 
 # Claude 4.1 Opus 모델 설정 - 준수 모드 최적화 (inference profile 사용)
 CLAUDE_MODEL_ID = BEDROCK_CONFIG['opus_model_id']
@@ -24,6 +25,9 @@ TEMPERATURE = BEDROCK_CONFIG['temperature']   # 균형잡힌 창의성
 TOP_P = BEDROCK_CONFIG['top_p']
 TOP_K = BEDROCK_CONFIG['top_k']
 
+# 가드레일 개입 시 stream_info['stop_reason']
+GUARDRAIL_STOP_REASON = 'guardrail_intervened'
+
 
 
 
@@ -398,32 +402,59 @@ def stream_claude_response_enhanced(
     use_cot: bool = False,  # 복잡한 CoT 비활성화
     max_retries: int = 0,   # 재시도 제거
     validate_constraints: bool = False,  # 검증 제거
-    prompt_data: Optional[Dict[str, Any]] = None
+    prompt_data: Optional[Dict[str, Any]] = None,
+    max_tokens: Optional[int] = None,
+    stream_info: Optional[Dict[str, Any]] = None,
+    guardrail: Optional[bool] = None,
+    runtime=None
 ) -> Iterator[str]:
     """
     Claude 스트리밍 응답 생성 (단순화 버전)
+
+    가드레일은 비동기 스트리밍 모드(GUARDRAIL_CONFIG['stream_processing_mode'])로 적용되어
+    청크는 바로 전달되고 평가는 Bedrock 쪽에서 병렬로 진행됩니다. 개입(INTERVENED)이 오면
+    이후 텍스트는 전달하지 않고 stop_reason을 guardrail_intervened로 기록합니다.
+
+    Args:
+        max_tokens: 응답 토큰 상한 (없으면 BEDROCK_CONFIG['max_tokens'])
+        stream_info: 전달 시 stop_reason, output_tokens, first_chunk_ms와
+            가드레일 결과(guardrail_mode, guardrail_message, guardrail_latency_ms)를 기록
+        guardrail: 가드레일 적용 여부 (없으면 GUARDRAIL_CONFIG['enabled'])
+        runtime: bedrock-runtime 클라이언트 (없으면 모듈 기본 클라이언트, 로컬 시뮬레이터 주입용)
     """
+    info = stream_info if stream_info is not None else {}
+    stream = None
     try:
         messages = [{"role": "user", "content": user_message}]
 
         body = {
             "anthropic_version": BEDROCK_CONFIG['anthropic_version'],
-            "max_tokens": MAX_TOKENS,
+            "max_tokens": max_tokens or MAX_TOKENS,
             "temperature": TEMPERATURE,
             "system": system_prompt,
             "messages": messages,
             "top_p": TOP_P,
             "top_k": TOP_K
         }
+        request = {'modelId': CLAUDE_MODEL_ID}
+
+        if GUARDRAIL_CONFIG['enabled'] if guardrail is None else guardrail:
+            mode = GUARDRAIL_CONFIG['stream_processing_mode']
+            body['amazon-bedrock-guardrailConfig'] = {'streamProcessingMode': mode}
+            request.update({
+                'guardrailIdentifier': GUARDRAIL_CONFIG['identifier'],
+                'guardrailVersion': GUARDRAIL_CONFIG['version'],
+                'trace': 'ENABLED' if GUARDRAIL_CONFIG['trace'] else 'DISABLED'
+            })
+            info['guardrail_mode'] = mode
 
         logger.info("Calling Bedrock API")
 
-        response = bedrock_runtime.invoke_model_with_response_stream(
-            modelId=CLAUDE_MODEL_ID,
-            body=json.dumps(body)
-        )
+        started = time.monotonic()
+        response = (runtime or bedrock_runtime).invoke_model_with_response_stream(body=json.dumps(body), **request)
 
         # 스트리밍 처리
+        intervened = False
         stream = response.get('body')
         if stream:
             for event in stream:
@@ -431,13 +462,35 @@ def stream_claude_response_enhanced(
                 if chunk:
                     chunk_obj = json.loads(chunk.get('bytes').decode())
 
+                    # 가드레일 개입 - 이후 텍스트는 차단 메시지로만 보관
+                    if chunk_obj.get('amazon-bedrock-guardrailAction') == 'INTERVENED' and not intervened:
+                        intervened = True
+                        info['stop_reason'] = GUARDRAIL_STOP_REASON
+                        info['guardrail_message'] = ''
+                        logger.warning("Guardrail intervened in streaming response")
+
+                    trace = chunk_obj.get('amazon-bedrock-trace', {}).get('guardrail')
+                    if trace:
+                        info['guardrail_latency_ms'] = (
+                            info.get('guardrail_latency_ms', 0) + _guardrail_latency_ms(trace)
+                        )
+
                     if chunk_obj.get('type') == 'content_block_delta':
                         delta = chunk_obj.get('delta', {})
                         if delta.get('type') == 'text_delta':
                             text = delta.get('text', '')
-                            if text:
+                            if text and intervened:
+                                info['guardrail_message'] += text
+                            elif text:
+                                if 'first_chunk_ms' not in info:
+                                    info['first_chunk_ms'] = round((time.monotonic() - started) * 1000)
                                 yield text
 
+                    elif chunk_obj.get('type') == 'message_delta':
+                        if not intervened:
+                            info['stop_reason'] = chunk_obj.get('delta', {}).get('stop_reason')
+                        info['output_tokens'] = chunk_obj.get('usage', {}).get('output_tokens')
+
                     elif chunk_obj.get('type') == 'message_stop':
                         logger.info("Streaming completed")
                         break
@@ -446,17 +499,37 @@ def stream_claude_response_enhanced(
         logger.error(f"Error in streaming: {str(e)}")
         yield f"\n\n[오류] AI 응답 생성 실패: {str(e)}"
 
+    finally:
+        # 호출자가 중간에 멈춘 경우(soft stop) 연결을 바로 닫아 생성 중단
+        if stream is not None and hasattr(stream, 'close'):
+            stream.close()
+
+
+def _guardrail_latency_ms(trace: Any) -> int:
+    """가드레일 트레이스의 평가 지연 시간 합계 (입력/출력 평가의 guardrailProcessingLatency)"""
+    if isinstance(trace, dict):
+        return sum(
+            int(value) if key == 'guardrailProcessingLatency' else _guardrail_latency_ms(value)
+            for key, value in trace.items()
+        )
+    if isinstance(trace, list):
+        return sum(_guardrail_latency_ms(value) for value in trace)
+    return 0
+
 
 
 
 class BedrockClientEnhanced:
     """향상된 Bedrock 클라이언트 - 대화 컨텍스트 지원"""
 
-    def __init__(self):
-        self.bedrock_client = boto3.client(
-            'bedrock-runtime',
-            region_name=AWS_REGION
-        )
+    def __init__(self, runtime_client=None):
+        """
+        Args:
+            runtime_client: bedrock-runtime 클라이언트 (테스트/벤치마크에서 로컬 시뮬레이터 주입,
+                없으면 공유 클라이언트 사용)
+        """
+        self.bedrock_client = runtime_client or bedrock_runtime
+        self.model_id = CLAUDE_MODEL_ID
         logger.info("BedrockClientEnhanced initialized")
 
     def stream_bedrock(
@@ -467,7 +540,9 @@ class BedrockClientEnhanced:
         user_role: str = 'user',
         guidelines: Optional[str] = None,
         description: Optional[str] = None,
-        files: Optional[List[Dict]] = None
+        files: Optional[List[Dict]] = None,
+        max_tokens: Optional[int] = None,
+        stream_info: Optional[Dict[str, Any]] = None
     ) -> Iterator[str]:
         """
         Bedrock 스트리밍 응답 생성 - 대화 컨텍스트 포함
@@ -479,6 +554,8 @@ class BedrockClientEnhanced:
             user_role: 사용자 역할
             guidelines: 가이드라인
             files: 참조 파일들
+            max_tokens: 응답 토큰 상한 (요청별 예산)
+            stream_info: 전달 시 stop_reason, output_tokens를 기록
 
         Yields:
             응답 청크
@@ -508,7 +585,10 @@ class BedrockClientEnhanced:
             for chunk in stream_claude_response_enhanced(
                 user_message=user_message,
                 system_prompt=system_prompt,
-                prompt_data=prompt_data
+                prompt_data=prompt_data,
+                max_tokens=max_tokens,
+                stream_info=stream_info,
+                runtime=self.bedrock_client
             ):
                 yield chunk
 
@@ -516,6 +596,47 @@ class BedrockClientEnhanced:
             logger.error(f"Error in stream_bedrock: {str(e)}")
             yield f"\n\n[오류] 응답 생성 실패: {str(e)}"
 
+    def complete(
+        self,
+        user_message: str,
+        system_prompt: str,
+        model_id: Optional[str] = None,
+        max_tokens: int = 1024,
+        temperature: float = 0.2
+    ) -> str:
+        """
+        단건(비스트리밍) 응답 생성 - 요약 등 사용자에게 스트리밍하지 않는 보조 작업용
+
+        Args:
+            user_message: 사용자 메시지
+            system_prompt: 시스템 프롬프트
+            model_id: 모델 ID (없으면 기본 모델)
+            max_tokens: 최대 출력 토큰
+            temperature: 샘플링 온도
+
+        Returns:
+            응답 텍스트
+
+        Raises:
+            Exception: Bedrock 호출 실패 (호출자가 처리)
+        """
+        body = {
+            "anthropic_version": BEDROCK_CONFIG['anthropic_version'],
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "system": system_prompt,
+            "messages": [{"role": "user", "content": user_message}]
+        }
+
+        response = self.bedrock_client.invoke_model(
+            modelId=model_id or self.model_id,
+            body=json.dumps(body)
+        )
+        result = json.loads(response['body'].read())
+        return ''.join(
+            block.get('text', '') for block in result.get('content', []) if block.get('type') == 'text'
+        )
+
     def _create_system_prompt_with_context(
         self,
         prompt_data: Dict[str, Any],
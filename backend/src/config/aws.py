@@ -12,6 +12,8 @@ BEDROCK_CONFIG = {
     'region_name': AWS_REGION,
     'model_id': os.environ.get('BEDROCK_MODEL_ID', 'us.anthropic.claude-sonnet-4-20250514-v1:0'),
     'opus_model_id': os.environ.get('BEDROCK_OPUS_MODEL_ID', 'us.anthropic.claude-opus-4-1-20250805-v1:0'),
+    # 대화 요약 등 보조 작업용 저비용 모델
+    'summary_model_id': os.environ.get('BEDROCK_SUMMARY_MODEL_ID', 'us.anthropic.claude-3-5-haiku-20241022-v1:0'),
     'max_tokens': int(os.environ.get('BEDROCK_MAX_TOKENS', '16384')),
     'temperature': float(os.environ.get('BEDROCK_TEMPERATURE', '0.81')),
     'top_p': float(os.environ.get('BEDROCK_TOP_P', '0.9')),
@@ -26,6 +28,27 @@ API_GATEWAY_CONFIG = {
     'stage': os.environ.get('API_STAGE', 'prod')
 }
 
+# REST 응답 캐시 설정 (ETag 재검증 + CloudFront Cache-Control)
+HTTP_CACHE_CONFIG = {
+    # 프롬프트/파일 번들 - 관리자만 수정하는 읽기 위주 리소스
+    'prompts_cache_control': os.environ.get(
+        'PROMPTS_CACHE_CONTROL', 'public, max-age=60, stale-while-revalidate=300'
+    ),
+    # 대화 상세 - 사용자별 리소스, 매 요청 ETag로 재검증
+    'conversation_cache_control': os.environ.get('CONVERSATION_CACHE_CONTROL', 'private, no-cache'),
+    # 사용량 스냅샷 - 짧게 캐시
+    'usage_cache_control': os.environ.get('USAGE_CACHE_CONTROL', 'private, max-age=10')
+}
+
+# REST 응답 압축 설정 (Accept-Encoding 협상)
+RESPONSE_COMPRESSION_CONFIG = {
+    'enabled': os.environ.get('RESPONSE_COMPRESSION_ENABLED', 'true').lower() == 'true',
+    # 이 크기(바이트) 미만 응답은 압축하지 않음 (CPU 대비 이득이 작음)
+    'min_size': int(os.environ.get('RESPONSE_COMPRESSION_MIN_SIZE', '1024')),
+    'gzip_level': int(os.environ.get('RESPONSE_GZIP_LEVEL', '6')),
+    'brotli_quality': int(os.environ.get('RESPONSE_BROTLI_QUALITY', '5'))
+}
+
 # Lambda 설정
 LAMBDA_CONFIG = {
     'timeout': int(os.environ.get('LAMBDA_TIMEOUT', '30')),
@@ -33,10 +56,41 @@ LAMBDA_CONFIG = {
     'log_level': os.environ.get('LOG_LEVEL', 'INFO')
 }
 
-# S3 설정 (파일 업로드용)
+# 구조화 로깅 설정 (utils/logger.py)
+LOGGING_CONFIG = {
+    # json: 한 줄 JSON (CloudWatch Logs Insights 필드 조회), text: 사람이 읽는 형식
+    'format': os.environ.get('LOG_FORMAT', 'json').lower(),
+    # 필드 문자열 최대 길이 (초과분은 잘라내고 원래 길이 표시)
+    'max_field_chars': int(os.environ.get('LOG_MAX_FIELD_CHARS', '256')),
+    # 리스트 필드 최대 항목 수
+    'max_field_items': int(os.environ.get('LOG_MAX_FIELD_ITEMS', '20')),
+    # 값을 남기지 않고 길이만 기록할 필드 (사용자 본문, 자격 증명)
+    'redact_keys': frozenset(
+        key.strip().lower() for key in os.environ.get(
+            'LOG_REDACT_KEYS',
+            'message,content,chunk,body,conversationHistory,history,fileContent,compactContent,'
+            'instruction,description,password,token,authorization,cookie,idToken,accessToken,refreshToken'
+        ).split(',') if key.strip()
+    ),
+    # 문자열 필드의 이메일 주소 마스킹 (사용자 ID가 이메일)
+    'mask_emails': os.environ.get('LOG_MASK_EMAILS', 'true').lower() == 'true',
+    # 핫 경로 샘플링 로그(sample=True)의 기본 기록 비율
+    'sample_rate': float(os.environ.get('LOG_SAMPLE_RATE', '0.1')),
+    # 로거별 샘플링 비율 (예: "handlers.websocket.message=0.01,handlers.api.chat_stream=0.5")
+    'sample_rates': {
+        name.strip(): float(rate)
+        for name, _, rate in (
+            item.partition('=') for item in os.environ.get('LOG_SAMPLE_RATES', '').split(',') if '=' in item
+        )
+    }
+}
+
+# S3 설정 (파일 업로드, 대형 메시지 본문 오프로드)
 S3_CONFIG = {
     'bucket': os.environ.get('S3_BUCKET', ''),
     'region': AWS_REGION,
+    # S3 호환 로컬 엔드포인트 (MinIO, moto server 등 - 비어 있으면 AWS S3)
+    'endpoint_url': os.environ.get('S3_ENDPOINT_URL') or None,
     'max_file_size': int(os.environ.get('MAX_FILE_SIZE', '10485760'))  # 10MB
 }
 
@@ -47,6 +101,13 @@ CLOUDWATCH_CONFIG = {
     'metrics_enabled': os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
 }
 
+# AWS 호출 계측 설정 (src/repositories/aws_clients.py)
+AWS_CALL_TRACKING_CONFIG = {
+    'enabled': os.environ.get('AWS_CALL_TRACKING_ENABLED', 'true').lower() == 'true',
+    # 핸들러 종료 시 호출 요약 로그 출력
+    'log_summary': os.environ.get('AWS_CALL_SUMMARY_LOG', 'true').lower() == 'true'
+}
+
 # Cognito 설정
 COGNITO_CONFIG = {
     'user_pool_id': os.environ.get('COGNITO_USER_POOL_ID', ''),
@@ -58,7 +119,14 @@ COGNITO_CONFIG = {
 GUARDRAIL_CONFIG = {
     'identifier': os.environ.get('GUARDRAIL_ID', 'ycwjnmzxut7k'),
     'version': os.environ.get('GUARDRAIL_VERSION', '1'),
-    'enabled': os.environ.get('GUARDRAIL_ENABLED', 'true').lower() == 'true'
+    'enabled': os.environ.get('GUARDRAIL_ENABLED', 'true').lower() == 'true',
+    # 스트리밍 평가 모드: ASYNCHRONOUS(청크를 바로 전송하고 평가는 병렬 수행, 개입 시 중단)
+    # 또는 SYNCHRONOUS(청크마다 평가 완료 후 전송 - 첫 청크 지연 증가)
+    'stream_processing_mode': os.environ.get('GUARDRAIL_STREAM_MODE', 'ASYNCHRONOUS').upper(),
+    # 가드레일 트레이스 (평가 지연 시간 메트릭 수집용)
+    'trace': os.environ.get('GUARDRAIL_TRACE', 'true').lower() == 'true',
+    # 개입 시 Bedrock 차단 메시지가 없을 때 저장/표시할 문구
+    'blocked_message': os.environ.get('GUARDRAIL_BLOCKED_MESSAGE', '가드레일 정책에 따라 응답이 중단되었습니다.')
 }
 
 # DynamoDB 테이블 설정
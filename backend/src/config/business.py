@@ -4,6 +4,7 @@
 """
 import os
 from decimal import Decimal
+from typing import Optional
 
 
 # 사용량 플랜 제한
@@ -26,6 +27,66 @@ USAGE_LIMITS = {
 }
 
 
+# Bedrock 용량 스케줄링 (플랜 우선순위 기반 입장 제어)
+CAPACITY_SCHEDULER_CONFIG = {
+    # 스케줄러 사용 여부 (CAPACITY_TABLE 설정 필요)
+    'enabled': os.environ.get('CAPACITY_SCHEDULER_ENABLED', 'false').lower() == 'true',
+
+    # 모델별 분당 토큰 할당량 (Bedrock TPM quota)
+    'tokens_per_minute': int(os.environ.get('BEDROCK_TOKENS_PER_MINUTE', '400000')),
+
+    # 모델별 동시 생성 최대 수 (모든 컨테이너 합산)
+    'max_in_flight': int(os.environ.get('BEDROCK_MAX_IN_FLIGHT', '40')),
+
+    # 플랜별 사용 가능한 용량 비율 - 남은 여유분은 상위 플랜 전용
+    'tier_headroom': {
+        'premium': 1.0,
+        'basic': float(os.environ.get('BASIC_TIER_HEADROOM', '0.85')),
+        'free': float(os.environ.get('FREE_TIER_HEADROOM', '0.7')),
+    },
+
+    # 용량 사용률이 이 값 이상이면 대기열 대신 즉시 거절
+    'tier_shed_threshold': {
+        'premium': 1.0,
+        'basic': float(os.environ.get('BASIC_TIER_SHED_THRESHOLD', '0.95')),
+        'free': float(os.environ.get('FREE_TIER_SHED_THRESHOLD', '0.9')),
+    },
+
+    # 대기열 재시도 간격 및 최대 대기 시간 (초)
+    'queue_poll_interval': float(os.environ.get('CAPACITY_QUEUE_POLL_INTERVAL', '1.0')),
+    'max_queue_wait': int(os.environ.get('CAPACITY_MAX_QUEUE_WAIT', '30')),
+
+    # 카운터 아이템 TTL (초) - DynamoDB 자동 삭제
+    'counter_ttl': int(os.environ.get('CAPACITY_COUNTER_TTL', '3600')),
+
+    # 진행 중 생성 리스 만료 (초) - 최대 생성 시간보다 길게, release 없이 종료된 Lambda의 슬롯은 만료 후 회수
+    'lease_ttl': int(os.environ.get('CAPACITY_LEASE_TTL', '600')),
+
+    # 대기 리스 만료 (초) - 폴링마다 연장, 대기 중 종료된 Lambda는 만료 후 순번/양보 계산에서 제외
+    'waiter_ttl': int(os.environ.get('CAPACITY_WAITER_TTL', '10')),
+
+    # 서버에서 플랜을 확인할 수 없는 사용자의 우선순위 플랜
+    'default_plan': os.environ.get('CAPACITY_DEFAULT_PLAN', 'free'),
+}
+
+
+# 요청별 응답 토큰 예산 (플랜/엔진/월 잔여 토큰 기반 max_tokens)
+OUTPUT_BUDGET_CONFIG = {
+    # 예산 적용 여부 (false면 BEDROCK_CONFIG['max_tokens'] 고정)
+    'enabled': os.environ.get('OUTPUT_BUDGET_ENABLED', 'true').lower() == 'true',
+
+    # 월 잔여 토큰을 예산에 반영할지 여부 (usage 테이블 월간 합계 조회 1회)
+    'monthly_enabled': os.environ.get('OUTPUT_BUDGET_MONTHLY_ENABLED', 'true').lower() == 'true',
+
+    # 최소 응답 토큰 - 월 한도를 모두 사용해도 이 길이까지는 응답
+    'min_output_tokens': int(os.environ.get('OUTPUT_BUDGET_MIN_TOKENS', '256')),
+
+    # 예산의 이 비율을 넘으면 다음 문단 경계에서 응답 종료 (soft stop)
+    'soft_stop_enabled': os.environ.get('OUTPUT_SOFT_STOP_ENABLED', 'true').lower() == 'true',
+    'soft_stop_ratio': float(os.environ.get('OUTPUT_SOFT_STOP_RATIO', '0.85')),
+}
+
+
 # 대화 관련 제한
 CONVERSATION_LIMITS = {
     # 대화에 저장될 최대 메시지 수 (메모리 관리)
@@ -42,6 +103,24 @@ CONVERSATION_LIMITS = {
 }
 
 
+# 대화 요약(compaction) 설정 - 긴 대화의 오래된 턴을 요약으로 대체해 턴당 입력 토큰을 일정하게 유지
+CONVERSATION_SUMMARY_CONFIG = {
+    # 요약 사용 여부
+    'enabled': os.environ.get('CONVERSATION_SUMMARY_ENABLED', 'true').lower() == 'true',
+
+    # 요약되지 않은 히스토리가 이 토큰 수(추정)를 넘으면 요약 실행
+    'trigger_tokens': int(os.environ.get('CONVERSATION_SUMMARY_TRIGGER_TOKENS', '6000')),
+
+    # 요약하지 않고 원문으로 남길 최근 메시지 수
+    'keep_recent_messages': int(os.environ.get('CONVERSATION_SUMMARY_KEEP_RECENT', '4')),
+
+    # 요약 최대 출력 토큰
+    'max_summary_tokens': int(os.environ.get('CONVERSATION_SUMMARY_MAX_TOKENS', '1024')),
+
+    # 요약 입력에 포함할 메시지당 최대 문자 수 (긴 기사 초안은 앞부분만 사용)
+    'message_chars': int(os.environ.get('CONVERSATION_SUMMARY_MESSAGE_CHARS', '4000')),
+}
+
 # 토큰 추정 (문자당 토큰 수)
 TOKEN_ESTIMATION = {
     'korean_chars_per_token': float(os.environ.get('KOREAN_CHARS_PER_TOKEN', '2.5')),
@@ -69,6 +148,80 @@ WEBSOCKET_CONFIG = {
 }
 
 
+# 요청 멱등성 설정 (sendMessage 재시도 중복 생성 방지)
+IDEMPOTENCY_CONFIG = {
+    # 멱등성 레코드 TTL (초) - DynamoDB 자동 삭제
+    'record_ttl': int(os.environ.get('IDEMPOTENCY_RECORD_TTL', '86400')),  # 24시간
+
+    # 진행 중 레코드 임대 시간 (초) - 만료되면 재시도 요청이 생성을 이어받음
+    'lease_seconds': int(os.environ.get('IDEMPOTENCY_LEASE_SECONDS', WEBSOCKET_CONFIG['message_timeout'])),
+
+    # 재생용으로 저장할 최대 응답 크기 (바이트) - 초과 시 대화에서 재조회
+    'max_stored_response_bytes': int(os.environ.get('IDEMPOTENCY_MAX_RESPONSE_BYTES', '300000')),
+
+    # 진행 중 스트림에 합류한 연결 조회 간격 (초)
+    'subscriber_refresh_interval': float(os.environ.get('IDEMPOTENCY_SUBSCRIBER_REFRESH', '1.0')),
+}
+
+
+# 대화 델타 동기화 설정 (since 워터마크 기반 변경분 조회)
+DELTA_SYNC_CONFIG = {
+    # 삭제 tombstone 보관 기간 (초) - 이보다 오래된 워터마크는 전체 재동기화
+    'tombstone_ttl': int(os.environ.get('TOMBSTONE_TTL', '2592000')),  # 30일
+
+    # 워터마크 비교 겹침 구간 (초) - 동시 쓰기로 인한 변경분 누락 방지
+    'overlap_seconds': int(os.environ.get('DELTA_SYNC_OVERLAP_SECONDS', '5')),
+}
+
+
+# 메시지 본문 압축 설정 (큰 응답을 Binary 속성으로 저장 - 읽기/쓰기 용량 및 400KB 아이템 한도 대응)
+MESSAGE_COMPRESSION_CONFIG = {
+    # 압축 사용 여부 (false여도 압축된 기존 메시지는 계속 읽힘)
+    'enabled': os.environ.get('MESSAGE_COMPRESSION_ENABLED', 'true').lower() == 'true',
+
+    # 압축 임계값 (UTF-8 바이트)
+    'min_bytes': int(os.environ.get('MESSAGE_COMPRESSION_MIN_BYTES', '2048')),
+
+    # zlib 압축 레벨 (1-9)
+    'level': int(os.environ.get('MESSAGE_COMPRESSION_LEVEL', '6')),
+}
+
+
+# 메시지 본문 S3 오프로드 설정 (claim-check - 아주 큰 본문은 S3에 두고 아이템에는 포인터 + 미리보기만 저장)
+MESSAGE_OFFLOAD_CONFIG = {
+    # 오프로드 사용 여부 (S3_CONFIG['bucket']이 비어 있으면 사용하지 않음, 기존 포인터는 계속 읽힘)
+    'enabled': os.environ.get('MESSAGE_OFFLOAD_ENABLED', 'true').lower() == 'true',
+
+    # 오프로드 임계값 (UTF-8 바이트) - 이보다 작은 본문은 압축(MESSAGE_COMPRESSION_CONFIG)만 적용
+    'min_bytes': int(os.environ.get('MESSAGE_OFFLOAD_MIN_BYTES', '65536')),
+
+    # 아이템에 남기는 미리보기 길이 (문자)
+    'preview_chars': int(os.environ.get('MESSAGE_OFFLOAD_PREVIEW_CHARS', '500')),
+
+    # S3 객체 키 접두사 (대화별 하위 경로)
+    'key_prefix': os.environ.get('MESSAGE_OFFLOAD_KEY_PREFIX', 'conversation-messages/'),
+
+    # 본문 병렬 조회 스레드 수
+    'max_workers': int(os.environ.get('MESSAGE_OFFLOAD_MAX_WORKERS', '8')),
+
+    # 웜 컨테이너 본문 캐시 크기 (객체 키가 본문 해시라 변경되지 않음)
+    'cache_entries': int(os.environ.get('MESSAGE_OFFLOAD_CACHE_ENTRIES', '64')),
+}
+
+
+# 대화 읽기 캐시 설정 (Lambda 웜 컨테이너 내 LRU + TTL)
+CONVERSATION_CACHE_CONFIG = {
+    # 캐시 사용 여부
+    'enabled': os.environ.get('CONVERSATION_CACHE_ENABLED', 'true').lower() == 'true',
+
+    # 최대 캐시 대화 수
+    'max_entries': int(os.environ.get('CONVERSATION_CACHE_MAX_ENTRIES', '256')),
+
+    # 재검증 없이 사용하는 기간 (초) - 이후에는 version 속성만 조회해 변경 여부 확인
+    'ttl_seconds': float(os.environ.get('CONVERSATION_CACHE_TTL', '5')),
+}
+
+
 # 엔진 타입 정의 (완전히 환경변수 기반 - 동적 구성)
 def _load_engine_types():
     """
@@ -81,6 +234,7 @@ def _load_engine_types():
     ENGINE_ONE_MODEL_ID=us.anthropic.claude-sonnet-4-20250514-v1:0
     ENGINE_ONE_INPUT_COST=0.003
     ENGINE_ONE_OUTPUT_COST=0.015
+    ENGINE_ONE_MAX_OUTPUT_TOKENS=8000  (선택 - 엔진별 응답 길이 상한)
     """
     # 사용 가능한 엔진 ID 목록
     available_engines = os.environ.get('AVAILABLE_ENGINES', 'one,two').split(',')
@@ -98,6 +252,9 @@ def _load_engine_types():
             'model_id': os.environ.get(f'ENGINE_{env_key}_MODEL_ID'),
             'input_cost_per_1k': Decimal(os.environ.get(f'ENGINE_{env_key}_INPUT_COST', '0.003')),
             'output_cost_per_1k': Decimal(os.environ.get(f'ENGINE_{env_key}_OUTPUT_COST', '0.015')),
+            # 엔진별 응답 토큰 상한 (없으면 플랜 한도만 적용)
+            'max_output_tokens': int(os.environ[f'ENGINE_{env_key}_MAX_OUTPUT_TOKENS'])
+            if os.environ.get(f'ENGINE_{env_key}_MAX_OUTPUT_TOKENS') else None,
         }
 
     return engine_types
@@ -132,9 +289,21 @@ COST_DECIMAL_PRECISION = Decimal('0.0001')
 ADMIN_EMAILS = os.environ.get('ADMIN_EMAILS', 'ai@sedaily.com').split(',')
 
 
+# 서버에서 지정하는 사용자 플랜 (클라이언트가 보낸 userPlan/userRole은 플랜 판단에 사용하지 않음)
+# 관리자는 premium, 목록에 없는 사용자는 플랜 미확인(None) - 플랜별 응답/월 한도를 적용하지 않음
+PLAN_ASSIGNMENTS = {
+    plan: [email.strip().lower() for email in os.environ.get(env_key, '').split(',') if email.strip()]
+    for plan, env_key in (('premium', 'PREMIUM_USER_EMAILS'), ('basic', 'BASIC_USER_EMAILS'), ('free', 'FREE_USER_EMAILS'))
+}
+
+
 # 데이터베이스 쿼리 제한
 DB_QUERY_LIMITS = {
     'max_conversations_query': int(os.environ.get('MAX_CONVERSATIONS_QUERY', '1000')),
+    'default_conversations_page_size': int(os.environ.get('CONVERSATIONS_PAGE_SIZE', '50')),
+    'max_conversations_page_size': int(os.environ.get('MAX_CONVERSATIONS_PAGE_SIZE', '100')),
+    'default_messages_page_size': int(os.environ.get('MESSAGES_PAGE_SIZE', '20')),
+    'max_messages_page_size': int(os.environ.get('MAX_MESSAGES_PAGE_SIZE', '50')),
     'default_public_prompts_limit': int(os.environ.get('DEFAULT_PUBLIC_PROMPTS_LIMIT', '50')),
     'max_usage_history_days': int(os.environ.get('MAX_USAGE_HISTORY_DAYS', '90')),
 }
@@ -147,6 +316,28 @@ TEXT_PROCESSING = {
 }
 
 
+# 지식베이스 파일 정규화 설정 - 업로드 시 한 번 정리한 텍스트(compactContent)를 프롬프트에 사용
+KNOWLEDGE_BASE_CONFIG = {
+    # 정규화 사용 여부 (끄면 원문을 그대로 프롬프트에 사용)
+    'normalize_enabled': os.environ.get('KB_NORMALIZE_ENABLED', 'true').lower() == 'true',
+
+    # 페이지 구분(\f)이 있는 문서에서 머리말/꼬리말/쪽 번호로 볼 페이지 처음/마지막 줄 수
+    'page_edge_lines': int(os.environ.get('KB_PAGE_EDGE_LINES', '2')),
+
+    # 이 페이지 수 이상에서 가장자리에 반복되는 짧은 줄은 머리말/꼬리말로 보고 첫 번째만 유지
+    'repeated_line_min_count': int(os.environ.get('KB_REPEATED_LINE_MIN_COUNT', '3')),
+
+    # 반복 줄 판정 대상 최대 길이 (본문 문장이 반복 제거되지 않도록)
+    'repeated_line_max_chars': int(os.environ.get('KB_REPEATED_LINE_MAX_CHARS', '120')),
+
+    # 이 길이 이상인 동일 문단은 한 번만 유지 (반복되는 안내문/면책 문구)
+    'duplicate_paragraph_min_chars': int(os.environ.get('KB_DUPLICATE_PARAGRAPH_MIN_CHARS', '40')),
+
+    # 표 행을 "셀 | 셀" 형태로 평탄화 (정렬용 공백/테두리 제거)
+    'flatten_tables': os.environ.get('KB_FLATTEN_TABLES', 'true').lower() == 'true',
+}
+
+
 # 사용량 제한 기본값 (Usage Service용)
 USAGE_LIMITS_DEFAULT = {
     'daily': {
@@ -187,6 +378,27 @@ def get_usage_limit(plan: str, limit_type: str) -> int:
     return plan_limits.get(limit_type, 0)
 
 
+def get_user_plan(user_id: str) -> Optional[str]:
+    """
+    서버 측 사용자 플랜 조회
+
+    Args:
+        user_id: 사용자 ID (이메일)
+
+    Returns:
+        플랜 이름 (free, basic, premium) 또는 None (플랜 미확인)
+    """
+    user_key = str(user_id or '').strip().lower()
+    if not user_key:
+        return None
+    if any(email.strip().lower() == user_key for email in ADMIN_EMAILS):
+        return 'premium'
+    for plan, emails in PLAN_ASSIGNMENTS.items():
+        if user_key in emails:
+            return plan
+    return None
+
+
 def get_conversation_limit(limit_type: str) -> int:
     """
     대화 제한 조회
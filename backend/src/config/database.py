@@ -17,6 +17,15 @@ TABLES = {
             'userEngineType-createdAt-index': {
                 'partition_key': 'userEngineType',
                 'sort_key': 'createdAt'
+            },
+            # 최근 활동순 목록용 (요약 속성만 projection)
+            'userId-updatedAt-index': {
+                'partition_key': 'userId',
+                'sort_key': 'updatedAt'
+            },
+            'userEngineType-updatedAt-index': {
+                'partition_key': 'userEngineType',
+                'sort_key': 'updatedAt'
             }
         }
     },
@@ -45,6 +54,14 @@ TABLES = {
         'name': os.environ.get('WEBSOCKET_TABLE'),
         'partition_key': 'connectionId'
     },
+    'capacity': {
+        'name': os.environ.get('CAPACITY_TABLE'),
+        'partition_key': 'counterId'
+    },
+    'idempotency': {
+        'name': os.environ.get('IDEMPOTENCY_TABLE'),
+        'partition_key': 'requestId'
+    },
     'files': {
         'name': os.environ.get('FILES_TABLE'),
         'partition_key': 'promptId',
@@ -62,6 +79,15 @@ DYNAMODB_CONFIG = {
     'timeout': int(os.environ.get('DB_TIMEOUT', '10')),
     'max_pool_connections': int(os.environ.get('DB_MAX_POOL_CONNECTIONS', '50')),
     'batch_write_size': int(os.environ.get('DB_BATCH_WRITE_SIZE', '25')),
+    # 핫 경로 읽기에 저수준 client + 전용 디코더 사용 (false면 resource 계층 사용)
+    'fast_read': os.environ.get('DB_FAST_READ', 'true').lower() == 'true',
+    # 소비 용량 집계 (ReturnConsumedCapacity 요청 - opt-in, src/repositories/aws_clients.py)
+    'capacity_tracking': os.environ.get('DB_CAPACITY_TRACKING', 'false').lower() == 'true',
+    # INDEXES: 테이블/인덱스별 분리, TOTAL: 테이블 합계만
+    'capacity_detail': os.environ.get('DB_CAPACITY_DETAIL', 'INDEXES').upper(),
+    # 단일 요청 용량 예산 (초과 시 경고 로그 - 예: 파일 테이블 전체 scan)
+    'capacity_request_budget': float(os.environ.get('DB_CAPACITY_REQUEST_BUDGET', '10')),
+    'capacity_alert_sample_rate': float(os.environ.get('DB_CAPACITY_ALERT_SAMPLE_RATE', '0.1')),
 }
 
 def get_table_name(table_type: str) -> str:
@@ -0,0 +1,39 @@
+"""
+도메인 모델 공통 유틸리티
+"""
+import sys
+from dataclasses import dataclass, fields
+
+
+def slotted_dataclass(cls=None, **kwargs):
+    """
+    __slots__를 사용하는 dataclass 데코레이터
+
+    인스턴스마다 __dict__를 만들지 않아 메모리를 줄입니다.
+    Python 3.10+ 에서는 dataclass(slots=True)를, Lambda python3.9 런타임에서는
+    같은 방식(클래스 재생성)으로 __slots__를 추가합니다.
+    """
+    def wrap(klass):
+        if sys.version_info >= (3, 10):
+            return dataclass(klass, slots=True, **kwargs)
+
+        klass = dataclass(klass, **kwargs)
+        field_names = tuple(f.name for f in fields(klass))
+        namespace = dict(klass.__dict__)
+        namespace['__slots__'] = field_names
+        for name in field_names:
+            # 기본값은 생성된 __init__에 이미 반영되어 있음 - 클래스 속성은 slot과 충돌
+            namespace.pop(name, None)
+        namespace.pop('__dict__', None)
+        namespace.pop('__weakref__', None)
+
+        slotted = type(klass)(klass.__name__, klass.__bases__, namespace)
+        slotted.__qualname__ = klass.__qualname__
+        return slotted
+
+    return wrap if cls is None else wrap(cls)
+
+
+def intern_value(value):
+    """반복되는 짧은 문자열(role, type 등) 인터닝 - 메시지마다 같은 문자열 객체 공유"""
+    return sys.intern(value) if type(value) is str else value
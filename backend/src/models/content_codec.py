@@ -0,0 +1,109 @@
+"""
+메시지 본문 저장 코덱
+큰 메시지 content를 압축해 DynamoDB Binary 속성으로 저장
+
+저장 포맷:
+    일반 메시지:  {'role', 'type', 'content': str, 'timestamp', 'metadata'}
+    압축 메시지:  {'role', 'type', 'contentBin': bytes, 'codec': 'zlib', 'timestamp', 'metadata'}
+    오프로드 메시지: {'role', 'type', 'contentRef': S3 키, 'preview': str, 'timestamp', 'metadata'}
+                   (본문은 S3에 저장 - MessageBodyStore로 조회)
+
+읽기 쪽(read_content)은 두 형태를 모두 처리하므로 기존 아이템은 마이그레이션 없이 읽히고,
+다음 저장 시 임계값을 넘는 메시지만 압축 형태로 다시 기록됩니다.
+"""
+import zlib
+from typing import Any, Dict, List
+
+# 코덱 마커 - 새 코덱 추가 시 _DECODERS에 등록
+CODEC_ZLIB = 'zlib'
+
+_DECODERS = {
+    CODEC_ZLIB: zlib.decompress
+}
+
+
+def _raw_bytes(value: Any) -> bytes:
+    # boto3 resource 계층은 Binary 래퍼(.value), 저수준 client는 bytes 반환
+    return getattr(value, 'value', value)
+
+
+def read_content(data: Dict[str, Any]) -> str:
+    """
+    저장된 메시지에서 본문 복원 (일반/압축 형태 모두 지원)
+
+    Args:
+        data: 저장 포맷 메시지 dict
+
+    Returns:
+        메시지 본문 (오프로드 메시지는 미리보기)
+
+    Raises:
+        ValueError: 알 수 없는 코덱
+    """
+    content = data.get('content')
+    if content is not None:
+        return content
+
+    if 'contentRef' in data:
+        return data.get('preview') or ''
+
+    codec = data.get('codec')
+    if codec is None:
+        return ''
+
+    decoder = _DECODERS.get(codec)
+    if decoder is None:
+        raise ValueError(f"Unknown message codec: {codec}")
+    return decoder(_raw_bytes(data['contentBin'])).decode('utf-8')
+
+
+def encode_message(message: Dict[str, Any], min_bytes: int, level: int = 6) -> Dict[str, Any]:
+    """
+    저장용 메시지 dict 변환 - 본문이 임계값 이상이고 압축 효과가 있을 때만 압축
+
+    Args:
+        message: 저장 포맷 메시지 dict (변경하지 않음)
+        min_bytes: 압축 임계값 (UTF-8 바이트)
+        level: zlib 압축 레벨
+
+    Returns:
+        저장할 메시지 dict (압축하지 않으면 입력 그대로)
+    """
+    content = message.get('content')
+    # UTF-8은 문자당 최대 4바이트 - 문자 수로 먼저 걸러 encode 비용 절약
+    if not isinstance(content, str) or len(content) * 4 < min_bytes:
+        return message
+
+    raw = content.encode('utf-8')
+    if len(raw) < min_bytes:
+        return message
+
+    packed = zlib.compress(raw, level)
+    if len(packed) >= len(raw):
+        return message
+
+    encoded = {key: value for key, value in message.items() if key != 'content'}
+    encoded['contentBin'] = packed
+    encoded['codec'] = CODEC_ZLIB
+    return encoded
+
+
+def encode_messages(messages: List[Dict[str, Any]], min_bytes: int, level: int = 6) -> List[Dict[str, Any]]:
+    """메시지 목록 저장용 변환"""
+    return [encode_message(message, min_bytes, level) for message in messages]
+
+
+def pointer_message(message: Dict[str, Any], preview_chars: int) -> Dict[str, Any]:
+    """
+    오프로드된 메시지(contentRef 포함)를 저장용 포인터 + 미리보기 형태로 변환
+
+    Args:
+        message: 'contentRef'와 'content'(전체 본문 또는 미리보기)를 가진 메시지 dict (변경하지 않음)
+        preview_chars: 미리보기 길이 (문자)
+
+    Returns:
+        content 대신 preview를 가진 메시지 dict
+    """
+    pointer = {key: value for key, value in message.items() if key != 'content'}
+    pointer['preview'] = (message.get('content') or '')[:preview_chars]
+    return pointer
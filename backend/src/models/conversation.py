@@ -1,76 +1,245 @@
 """
 대화(Conversation) 도메인 모델
+
+메모리 절감을 위해 __slots__를 사용합니다.
+- role/type 문자열은 인터닝하여 메시지 간 공유
+- 메시지 metadata는 접근하거나 값이 있을 때만 dict 생성
+- from_dict는 메시지를 처음 접근할 때 변환하고, to_dict는 요청한 필드만 변환
+- S3로 오프로드된 메시지는 미리보기만 가진 상태(is_partial)로 읽고, 전체 본문이 필요할 때
+  ConversationRepository.hydrate_messages로 채움
 """
-from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable
 from datetime import datetime
 
+from .base import intern_value
+from .content_codec import read_content
+
+# 저장 포맷 메시지 키 - 이 형태의 dict는 to_dict에서 다시 만들지 않고 그대로 사용
+_STORED_MESSAGE_KEYS = ('role', 'type', 'content', 'timestamp', 'metadata')
+
+# 인터닝된 role 값 (from_dict 핫 경로에서 sys.intern 호출 생략)
+_ROLES = {role: intern_value(role) for role in ('user', 'assistant', 'system')}
+
 
-@dataclass
 class Message:
     """메시지 모델"""
-    role: str  # 'user' or 'assistant'
-    content: str
-    timestamp: Optional[str] = None
-    type: Optional[str] = None  # 'user' or 'assistant' - 프론트엔드 호환성
-    metadata: Optional[Dict[str, Any]] = field(default_factory=dict)
 
+    __slots__ = ('role', 'content', 'timestamp', 'content_ref', '_type', '_metadata', '_partial')
+
+    def __init__(
+        self,
+        role: str,  # 'user' or 'assistant'
+        content: str,
+        timestamp: Optional[str] = None,
+        type: Optional[str] = None,  # 'user' or 'assistant' - 프론트엔드 호환성
+        metadata: Optional[Dict[str, Any]] = None,
+        content_ref: Optional[str] = None  # S3 오프로드 본문 키
+    ):
+        self.role = intern_value(role)
+        self.content = content
+        self.timestamp = timestamp
+        self.content_ref = content_ref
+        self._partial = False
+        # role과 같으면 저장하지 않음 (type 속성은 role로 대체)
+        self._type = None if type is None or type == role else intern_value(type)
+        self._metadata = metadata or None
+
+    @property
+    def type(self) -> str:
+        return self._type or self.role
+
+    @type.setter
+    def type(self, value: Optional[str]) -> None:
+        self._type = None if value is None or value == self.role else intern_value(value)
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        # 첫 접근 시에만 dict 생성 (대부분의 메시지는 metadata가 비어 있음)
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: Optional[Dict[str, Any]]) -> None:
+        self._metadata = value or None
+
+    @property
+    def is_partial(self) -> bool:
+        """content가 오프로드 본문의 미리보기뿐인지 여부"""
+        return self._partial
+
+    def restore_content(self, content: str) -> None:
+        """오프로드 본문으로 content 채우기 (content_ref는 유지 - 다시 저장해도 재업로드하지 않음)"""
+        self.content = content
+        self._partial = False
 
-@dataclass
-class Conversation:
-    """대화 모델"""
-    conversation_id: str
-    user_id: str
-    engine_type: str  # 'C1' or 'C2'
-    title: Optional[str] = None
-    messages: List[Message] = field(default_factory=list)
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
-    metadata: Optional[Dict[str, Any]] = field(default_factory=dict)
-    
     def to_dict(self) -> Dict[str, Any]:
         """DynamoDB 저장용 딕셔너리 변환"""
-        return {
+        result = {
+            'role': self.role,
+            'type': self._type or self.role,  # type 필드 추가 (role과 동일)
+            'content': self.content,
+            'timestamp': self.timestamp,
+            'metadata': self._metadata if self._metadata is not None else {}
+        }
+        if self.content_ref is not None:
+            result['contentRef'] = self.content_ref
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Message':
+        """DynamoDB 데이터에서 모델 생성"""
+        message = object.__new__(cls)
+        role = data['role']
+        message.role = _ROLES.get(role) or intern_value(role)
+        content = data.get('content')
+        # 압축 저장된 메시지(contentBin + codec)는 복원, 오프로드 메시지(contentRef)는 미리보기
+        message.content = content if content is not None else read_content(data)
+        message.timestamp = data.get('timestamp')
+        message.content_ref = data.get('contentRef')
+        message._partial = content is None and message.content_ref is not None
+        message_type = data.get('type')
+        message._type = None if message_type is None or message_type == role else intern_value(message_type)
+        message._metadata = data.get('metadata') or None
+        return message
+
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            self.role == other.role and self.content == other.content
+            and self.timestamp == other.timestamp and self.type == other.type
+            and (self._metadata or {}) == (other._metadata or {})
+        )
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (
+            f"Message(role={self.role!r}, content={self.content!r}, timestamp={self.timestamp!r}, "
+            f"type={self.type!r}, metadata={self._metadata or {}!r})"
+        )
+
+
+def _stored_message(data: Dict[str, Any]) -> Dict[str, Any]:
+    """저장 포맷 메시지 dict - 이미 같은 형태면 그대로 반환"""
+    if (len(data) == len(_STORED_MESSAGE_KEYS) and all(key in data for key in _STORED_MESSAGE_KEYS)
+            and data['type'] and data['metadata'] is not None):
+        return data
+    return Message.from_dict(data).to_dict()
+
+
+class Conversation:
+    """대화 모델"""
+
+    __slots__ = (
+        'conversation_id', 'user_id', 'engine_type', 'title',
+        'created_at', 'updated_at', 'metadata', 'version', '_messages', '_raw_messages'
+    )
+
+    def __init__(
+        self,
+        conversation_id: str,
+        user_id: str,
+        engine_type: str,  # 'C1' or 'C2'
+        title: Optional[str] = None,
+        messages: Optional[List[Message]] = None,
+        created_at: Optional[str] = None,
+        updated_at: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        version: Optional[str] = None
+    ):
+        self.conversation_id = conversation_id
+        self.user_id = user_id
+        self.engine_type = engine_type
+        self.title = title
+        self._messages = messages if messages is not None else []
+        # from_dict로 만든 경우 변환 전 메시지 dict 목록 (messages 첫 접근 시 변환)
+        self._raw_messages = None
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.metadata = metadata if metadata is not None else {}
+        # 읽은 시점의 저장 버전 (조건부 저장용, 새 대화는 None)
+        self.version = version
+
+    @property
+    def messages(self) -> List[Message]:
+        if self._raw_messages is not None:
+            self._messages = [Message.from_dict(msg) for msg in self._raw_messages]
+            self._raw_messages = None
+        return self._messages
+
+    @messages.setter
+    def messages(self, value: List[Message]) -> None:
+        self._messages = value
+        self._raw_messages = None
+
+    def to_dict(self, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        DynamoDB 저장용 딕셔너리 변환
+
+        Args:
+            fields: 변환할 키 목록 (None이면 전체) - 예: ('messages',)
+
+        Returns:
+            저장 포맷 딕셔너리
+        """
+        wanted = None if fields is None else set(fields)
+        result = {
             'conversationId': self.conversation_id,
             'userId': self.user_id,
             'engineType': self.engine_type,
-            'title': self.title,
-            'messages': [
-                {
-                    'role': msg.role,
-                    'type': msg.type or msg.role,  # type 필드 추가 (role과 동일)
-                    'content': msg.content,
-                    'timestamp': msg.timestamp,
-                    'metadata': msg.metadata
-                }
-                for msg in self.messages
-            ],
-            'createdAt': self.created_at or datetime.now().isoformat(),
-            'updatedAt': self.updated_at or datetime.now().isoformat(),
-            'metadata': self.metadata
+            'title': self.title
         }
-    
+
+        if wanted is None or 'messages' in wanted:
+            if self._raw_messages is not None:
+                # 메시지를 한 번도 접근하지 않았으면 원본 dict 재사용
+                result['messages'] = [_stored_message(msg) for msg in self._raw_messages]
+            else:
+                result['messages'] = [msg.to_dict() for msg in self._messages]
+
+        result['createdAt'] = self.created_at or datetime.now().isoformat()
+        result['updatedAt'] = self.updated_at or datetime.now().isoformat()
+        result['metadata'] = self.metadata
+
+        if wanted is not None:
+            return {key: value for key, value in result.items() if key in wanted}
+        return result
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Conversation':
-        """DynamoDB 데이터에서 모델 생성"""
-        messages = [
-            Message(
-                role=msg['role'],
-                content=msg['content'],
-                timestamp=msg.get('timestamp'),
-                type=msg.get('type', msg['role']),  # type 필드 추가
-                metadata=msg.get('metadata', {})
-            )
-            for msg in data.get('messages', [])
-        ]
-        
-        return cls(
+        """DynamoDB 데이터에서 모델 생성 (메시지는 처음 접근할 때 변환)"""
+        conversation = cls(
             conversation_id=data['conversationId'],
             user_id=data['userId'],
             engine_type=data['engineType'],
             title=data.get('title'),
-            messages=messages,
             created_at=data.get('createdAt'),
             updated_at=data.get('updatedAt'),
-            metadata=data.get('metadata', {})
-        )
\ No newline at end of file
+            metadata=data.get('metadata', {}),
+            version=data.get('version')
+        )
+        raw_messages = data.get('messages')
+        if raw_messages:
+            conversation._raw_messages = raw_messages
+        return conversation
+
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (
+            self.conversation_id == other.conversation_id and self.user_id == other.user_id
+            and self.engine_type == other.engine_type and self.title == other.title
+            and self.created_at == other.created_at and self.updated_at == other.updated_at
+            and self.metadata == other.metadata and self.messages == other.messages
+        )
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (
+            f"Conversation(conversation_id={self.conversation_id!r}, user_id={self.user_id!r}, "
+            f"engine_type={self.engine_type!r}, title={self.title!r}, messages={self.messages!r}, "
+            f"created_at={self.created_at!r}, updated_at={self.updated_at!r}, metadata={self.metadata!r})"
+        )
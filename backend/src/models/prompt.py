@@ -1,12 +1,14 @@
 """
 프롬프트(Prompt) 도메인 모델
 """
-from dataclasses import dataclass, field
+from dataclasses import field
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
+from .base import slotted_dataclass
 
-@dataclass
+
+@slotted_dataclass
 class PromptFile:
     """프롬프트 파일 모델"""
     file_name: str
@@ -15,7 +17,7 @@ class PromptFile:
     metadata: Optional[Dict[str, Any]] = field(default_factory=dict)
 
 
-@dataclass 
+@slotted_dataclass
 class PromptConfig:
     """프롬프트 설정 모델"""
     description: str
@@ -23,7 +25,7 @@ class PromptConfig:
     metadata: Optional[Dict[str, Any]] = field(default_factory=dict)
 
 
-@dataclass
+@slotted_dataclass
 class Prompt:
     """프롬프트 모델"""
     prompt_id: str
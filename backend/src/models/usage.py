@@ -1,13 +1,15 @@
 """
 사용량(Usage) 도메인 모델
 """
-from dataclasses import dataclass, field
+from dataclasses import field
 from typing import Dict, Any, Optional
 from datetime import datetime
 from decimal import Decimal
 
+from .base import slotted_dataclass
 
-@dataclass
+
+@slotted_dataclass
 class Usage:
     """사용량 모델"""
     user_id: str
@@ -65,7 +67,7 @@ class Usage:
         self.updated_at = datetime.now().isoformat()
 
 
-@dataclass
+@slotted_dataclass
 class UsageSummary:
     """사용량 요약 모델"""
     user_id: str
@@ -2,12 +2,13 @@
 리포지토리 패키지
 데이터 접근 계층
 """
-from .conversation_repository import ConversationRepository
+from .conversation_repository import ConversationRepository, ConversationConflictError
 from .prompt_repository import PromptRepository
 from .usage_repository import UsageRepository
 
 __all__ = [
     'ConversationRepository',
+    'ConversationConflictError',
     'PromptRepository',
     'UsageRepository'
 ]
\ No newline at end of file
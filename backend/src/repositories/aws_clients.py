@@ -0,0 +1,362 @@
+"""
+공유 AWS 클라이언트 팩토리 + 호출 계측
+botocore before-call/after-call 훅으로 호출별 횟수/지연/페이로드 바이트를 집계
+
+이 팩토리로 만든 클라이언트/리소스에는 계측 훅이 등록되어, 핸들러 호출(invocation) 단위로
+서비스.오퍼레이션별 호출 수, 지연 시간, 요청/응답 바이트를 기록합니다.
+핸들러는 utils.metrics.track_aws_calls 데코레이터로 호출 경계를 지정하고 종료 시 요약을 남깁니다.
+
+- 지연 시간은 요청 전송부터 응답 헤더 수신(after-call)까지입니다.
+  스트리밍 응답(Bedrock 이벤트 스트림, S3 GetObject 본문)의 본문 소비 시간은 포함하지 않으며,
+  응답 바이트도 Content-Length 헤더가 있을 때만 집계합니다.
+- DYNAMODB_CONFIG['capacity_tracking']이 켜져 있으면 DynamoDB 요청에 ReturnConsumedCapacity를
+  추가하고 테이블/인덱스별 RCU/WCU를 집계합니다. 단일 요청이 용량 예산을 넘으면 샘플링된 경고 로그를 남깁니다.
+- 호출 경계는 contextvars로 추적합니다. 스레드 풀 작업처럼 컨텍스트가 전달되지 않는 호출은
+  가장 최근에 시작된 호출에 집계합니다 (Lambda 컨테이너는 한 번에 하나의 호출만 처리).
+"""
+import contextvars
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+import boto3
+
+from ..config.aws import AWS_REGION, AWS_CALL_TRACKING_CONFIG
+from ..config.database import DYNAMODB_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# (서비스, 리전, 엔드포인트)별 클라이언트 (웜 컨테이너 동안 재사용, 스레드 간 공유 가능)
+_clients: Dict[Any, Any] = {}
+_clients_lock = threading.Lock()
+
+_current: contextvars.ContextVar = contextvars.ContextVar('aws_call_invocation', default=None)
+_latest: Optional['InvocationCalls'] = None
+
+_CONTEXT_KEY = 'aws_call_tracking'
+_INDEX_KEY = 'aws_call_tracking_index'
+
+# ConsumedCapacity에 Read/Write 구분이 없을 때(온디맨드 TOTAL 등) 읽기로 분류할 오퍼레이션
+_READ_OPERATIONS = frozenset(['GetItem', 'BatchGetItem', 'Query', 'Scan', 'TransactGetItems'])
+
+
+@dataclass
+class OperationStats:
+    """서비스.오퍼레이션 하나의 호출 집계"""
+    count: int = 0
+    errors: int = 0
+    latency_ms: float = 0.0
+    max_latency_ms: float = 0.0
+    request_bytes: int = 0
+    response_bytes: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'latencyMs': round(self.latency_ms, 1),
+            'maxLatencyMs': round(self.max_latency_ms, 1),
+            'requestBytes': self.request_bytes,
+            'responseBytes': self.response_bytes
+        }
+
+
+@dataclass
+class TableCapacity:
+    """테이블 하나의 소비 용량 (인덱스별 내역 포함)"""
+    read_units: float = 0.0
+    write_units: float = 0.0
+    indexes: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+    def add(self, read_units: float, write_units: float, index: Optional[str] = None) -> None:
+        if index is None:
+            self.read_units += read_units
+            self.write_units += write_units
+            return
+        units = self.indexes.setdefault(index, {'rcu': 0.0, 'wcu': 0.0})
+        units['rcu'] += read_units
+        units['wcu'] += write_units
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {'rcu': round(self.read_units, 2), 'wcu': round(self.write_units, 2)}
+        if self.indexes:
+            result['indexes'] = {
+                name: {key: round(value, 2) for key, value in units.items()}
+                for name, units in self.indexes.items()
+            }
+        return result
+
+
+class InvocationCalls:
+    """핸들러 호출 하나의 AWS 호출 집계 (스레드 안전)"""
+
+    def __init__(self, handler_name: str = ''):
+        self.handler_name = handler_name
+        self.operations: Dict[str, OperationStats] = {}
+        self.capacity: Dict[str, TableCapacity] = {}
+        self.budget_exceeded = 0
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        operation: str,
+        latency_ms: float,
+        request_bytes: int = 0,
+        response_bytes: int = 0,
+        error: bool = False
+    ) -> None:
+        with self._lock:
+            stats = self.operations.get(operation)
+            if stats is None:
+                stats = self.operations[operation] = OperationStats()
+            stats.count += 1
+            stats.errors += int(error)
+            stats.latency_ms += latency_ms
+            stats.max_latency_ms = max(stats.max_latency_ms, latency_ms)
+            stats.request_bytes += request_bytes
+            stats.response_bytes += response_bytes
+
+    def record_capacity(self, operation: str, consumed: Dict[str, Any], over_budget: bool = False) -> None:
+        """ConsumedCapacity 항목 하나 집계 (테이블 합계 + 인덱스별 내역)"""
+        is_read = operation in _READ_OPERATIONS
+        with self._lock:
+            table = self.capacity.get(consumed.get('TableName', 'unknown'))
+            if table is None:
+                table = self.capacity[consumed.get('TableName', 'unknown')] = TableCapacity()
+            table.add(*_split_units(consumed, is_read))
+            for key in ('LocalSecondaryIndexes', 'GlobalSecondaryIndexes'):
+                for index, units in (consumed.get(key) or {}).items():
+                    table.add(*_split_units(units, is_read), index=index)
+            self.budget_exceeded += int(over_budget)
+
+    @property
+    def total_read_units(self) -> float:
+        return sum(table.read_units for table in self.capacity.values())
+
+    @property
+    def total_write_units(self) -> float:
+        return sum(table.write_units for table in self.capacity.values())
+
+    @property
+    def total_calls(self) -> int:
+        return sum(stats.count for stats in self.operations.values())
+
+    @property
+    def total_latency_ms(self) -> float:
+        return sum(stats.latency_ms for stats in self.operations.values())
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(stats.request_bytes + stats.response_bytes for stats in self.operations.values())
+
+    def summary(self) -> Dict[str, Any]:
+        """로그용 요약 (호출 수가 많은 오퍼레이션 순)"""
+        with self._lock:
+            operations = sorted(self.operations.items(), key=lambda item: -item[1].count)
+            return {
+                'handler': self.handler_name,
+                'calls': sum(stats.count for _, stats in operations),
+                'latencyMs': round(sum(stats.latency_ms for _, stats in operations), 1),
+                'bytes': sum(stats.request_bytes + stats.response_bytes for _, stats in operations),
+                'operations': {name: stats.to_dict() for name, stats in operations},
+                'capacity': {name: table.to_dict() for name, table in self.capacity.items()},
+                'capacityBudgetExceeded': self.budget_exceeded
+            }
+
+
+def begin_invocation(handler_name: str = ''):
+    """
+    핸들러 호출 집계 시작
+
+    Args:
+        handler_name: 요약에 표시할 핸들러 이름
+
+    Returns:
+        (InvocationCalls, end_invocation에 넘길 토큰)
+    """
+    global _latest
+    invocation = InvocationCalls(handler_name)
+    _latest = invocation
+    return invocation, _current.set(invocation)
+
+
+def end_invocation(token) -> None:
+    """핸들러 호출 집계 종료"""
+    global _latest
+    invocation = _current.get()
+    _current.reset(token)
+    if _latest is invocation:
+        _latest = None
+
+
+def current_invocation() -> Optional[InvocationCalls]:
+    """현재 집계 중인 호출 (컨텍스트가 없으면 가장 최근 호출)"""
+    return _current.get() or _latest
+
+
+def _body_size(body: Any) -> int:
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+    if isinstance(body, str):
+        return len(body.encode('utf-8'))
+    return 0  # 파일 객체/form 파라미터는 집계하지 않음
+
+
+def _split_units(units: Dict[str, Any], is_read: bool):
+    """(RCU, WCU) - Read/WriteCapacityUnits가 없으면 오퍼레이션 종류로 CapacityUnits 분류"""
+    if 'ReadCapacityUnits' in units or 'WriteCapacityUnits' in units:
+        return float(units.get('ReadCapacityUnits', 0)), float(units.get('WriteCapacityUnits', 0))
+    total = float(units.get('CapacityUnits', 0))
+    return (total, 0.0) if is_read else (0.0, total)
+
+
+def _operation_name(model) -> str:
+    return f"{model.service_model.service_name}.{model.name}"
+
+
+def _before_call(model, params, context, **kwargs) -> None:
+    invocation = current_invocation()
+    if invocation is None:
+        return
+    context[_CONTEXT_KEY] = (
+        invocation, _operation_name(model), time.perf_counter(), _body_size(params.get('body'))
+    )
+
+
+def _request_consumed_capacity(params, model, context, **kwargs) -> None:
+    """DynamoDB 요청에 ReturnConsumedCapacity 추가 (호출자가 지정한 값은 유지)"""
+    if 'ReturnConsumedCapacity' in model.input_shape.members:
+        params.setdefault('ReturnConsumedCapacity', DYNAMODB_CONFIG['capacity_detail'])
+        context[_INDEX_KEY] = params.get('IndexName')
+
+
+def _record_consumed_capacity(
+    invocation: Optional[InvocationCalls],
+    model,
+    consumed: Any,
+    index_name: Optional[str] = None
+) -> None:
+    """응답의 ConsumedCapacity 집계 + 단일 요청 예산 초과 경고 (샘플링)"""
+    entries = consumed if isinstance(consumed, list) else [consumed]
+    units = sum(float(entry.get('CapacityUnits', 0)) for entry in entries)
+    over_budget = units > DYNAMODB_CONFIG['capacity_request_budget']
+
+    if over_budget and random.random() < DYNAMODB_CONFIG['capacity_alert_sample_rate']:
+        logger.warning(
+            f"DynamoDB request over capacity budget: {model.name} "
+            f"tables={[entry.get('TableName') for entry in entries]} units={units:.1f} "
+            f"budget={DYNAMODB_CONFIG['capacity_request_budget']} "
+            f"handler={invocation.handler_name if invocation else None} "
+            f"index={index_name}"
+        )
+
+    if invocation is not None:
+        for i, entry in enumerate(entries):
+            invocation.record_capacity(model.name, entry, over_budget=over_budget and i == 0)
+
+
+def _after_call(http_response, parsed, model, context, **kwargs) -> None:
+    tracked = context.pop(_CONTEXT_KEY, None)
+    consumed = parsed.get('ConsumedCapacity') if isinstance(parsed, dict) else None
+    if consumed:
+        _record_consumed_capacity(tracked[0] if tracked else None, model, consumed, context.get(_INDEX_KEY))
+    if tracked is None:
+        return
+    invocation, operation, started, request_bytes = tracked
+
+    if model.has_streaming_output or model.has_event_stream_output:
+        # 본문을 읽으면 스트림이 소비되므로 헤더 값만 사용
+        response_bytes = int(http_response.headers.get('content-length') or 0)
+    else:
+        response_bytes = len(http_response.content or b'')
+
+    invocation.record(
+        operation,
+        (time.perf_counter() - started) * 1000,
+        request_bytes,
+        response_bytes,
+        error=http_response.status_code >= 300
+    )
+
+
+def _after_call_error(context, **kwargs) -> None:
+    """연결 오류 등 응답 없이 실패한 호출"""
+    tracked = context.pop(_CONTEXT_KEY, None)
+    if tracked is None:
+        return
+    invocation, operation, started, request_bytes = tracked
+    invocation.record(operation, (time.perf_counter() - started) * 1000, request_bytes, error=True)
+
+
+def instrument(client):
+    """
+    클라이언트에 계측 훅 등록 (중복 등록 없음)
+
+    Args:
+        client: botocore 클라이언트
+
+    Returns:
+        같은 클라이언트
+    """
+    meta = getattr(client, 'meta', None)  # 하네스가 주입한 스텁 클라이언트는 그대로 반환
+    if AWS_CALL_TRACKING_CONFIG['enabled'] and meta is not None:
+        events = meta.events
+        events.register('before-call', _before_call, unique_id='aws-call-tracking-before')
+        events.register('after-call', _after_call, unique_id='aws-call-tracking-after')
+        events.register('after-call-error', _after_call_error, unique_id='aws-call-tracking-error')
+        if DYNAMODB_CONFIG['capacity_tracking'] and meta.service_model.service_name == 'dynamodb':
+            # provide-client-params는 boto3 리소스 계층이 파라미터를 복사해 반환하므로 그 이후 단계에 등록
+            events.register(
+                'before-parameter-build.dynamodb', _request_consumed_capacity, unique_id='aws-call-tracking-capacity'
+            )
+    return client
+
+
+def get_client(service: str, region: str = None, endpoint_url: Optional[str] = None):
+    """
+    계측된 boto3 클라이언트 조회 (컨테이너 내 재사용)
+
+    Args:
+        service: 서비스 이름 (예: 'dynamodb', 's3', 'bedrock-runtime')
+        region: AWS 리전 (기본값: AWS_REGION)
+        endpoint_url: 엔드포인트 (API Gateway Management API, 로컬 S3 등)
+
+    Returns:
+        boto3 client
+    """
+    cache_key = (service, region or AWS_REGION, endpoint_url)
+    client = _clients.get(cache_key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(cache_key)
+            if client is None:
+                client = instrument(boto3.client(service, region_name=cache_key[1], endpoint_url=endpoint_url))
+                _clients[cache_key] = client
+    return client
+
+
+def get_resource(service: str = 'dynamodb', region: str = None):
+    """
+    계측된 boto3 리소스 생성
+
+    Note: 리소스 객체는 스레드 간 공유가 안전하지 않아 캐시하지 않습니다.
+
+    Args:
+        service: 서비스 이름
+        region: AWS 리전 (기본값: AWS_REGION)
+
+    Returns:
+        boto3 resource
+    """
+    resource = boto3.resource(service, region_name=region or AWS_REGION)
+    instrument(resource.meta.client)
+    return resource
+
+
+def clear_clients() -> None:
+    """클라이언트 캐시 초기화 (세션 교체 시 - 로컬 하네스/벤치마크용)"""
+    with _clients_lock:
+        _clients.clear()
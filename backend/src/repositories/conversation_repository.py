@@ -2,34 +2,90 @@
 대화(Conversation) 리포지토리
 DynamoDB와의 모든 상호작용을 캡슐화
 """
-import boto3
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
 from datetime import datetime
+import base64
+import json
+import time
 import uuid
 import logging
 import os
 
+from botocore.exceptions import ClientError
+
 from ..models import Conversation, Message
+from ..models.content_codec import encode_message, pointer_message
+from ..config.aws import S3_CONFIG
+from ..config.business import (
+    DELTA_SYNC_CONFIG, CONVERSATION_CACHE_CONFIG, MESSAGE_COMPRESSION_CONFIG, MESSAGE_OFFLOAD_CONFIG
+)
+from ..config.database import DYNAMODB_CONFIG
+from .aws_clients import get_resource
+from .item_cache import ItemCache
+from .fast_read import get_client, decode_conversation, encode_item
+from .message_body_store import MessageBodyStore
 
 logger = logging.getLogger(__name__)
 
+# 목록(사이드바)에 필요한 요약 속성 - updatedAt 인덱스에 projection된 속성과 동일
+SUMMARY_ATTRIBUTES = ('conversationId', 'userId', 'engineType', 'title', 'createdAt', 'updatedAt')
+
+# 삭제된 대화의 tombstone 아이템 ID 접두사 (createdAt이 없어 createdAt 인덱스에는 포함되지 않음)
+TOMBSTONE_PREFIX = 'deleted#'
+
+# modify() 동시 저장 충돌 시 최대 시도 횟수
+_SAVE_CONFLICT_ATTEMPTS = 3
+
+# list_summaries() 한 페이지를 채우기 위한 최대 쿼리 횟수 (tombstone이 많은 구간에서 짧은 페이지 + 커서 반환)
+_MAX_PAGE_QUERIES = 10
+
+# 웜 컨테이너 동안 유지되는 대화 읽기 캐시 (한 턴에 같은 대화를 여러 번 읽는 비용 제거)
+# 항목은 와이어 포맷으로 보관 - 조회마다 decode_conversation이 새 객체를 만들므로 복사 불필요
+_conversation_cache = ItemCache(
+    max_entries=CONVERSATION_CACHE_CONFIG['max_entries'],
+    ttl_seconds=CONVERSATION_CACHE_CONFIG['ttl_seconds'],
+    copy_items=False
+)
+
+
+def _new_version() -> str:
+    """쓰기마다 바뀌는 불투명 버전 토큰 (캐시 재검증/조건부 저장용)"""
+    return uuid.uuid4().hex
+
+
+class ConversationConflictError(Exception):
+    """읽은 이후 다른 요청이 대화를 먼저 저장한 경우 (조건부 저장 실패)"""
+
 
 class ConversationRepository:
     """대화 데이터 접근 계층"""
 
-    def __init__(self, table_name: str = None, region: str = None):
+    def __init__(self, table_name: str = None, region: str = None, body_store: MessageBodyStore = None):
         table_name = table_name or os.environ.get('CONVERSATIONS_TABLE')
         region = region or os.environ.get('AWS_REGION', 'us-east-1')
 
         if not table_name:
             raise ValueError("CONVERSATIONS_TABLE environment variable must be set")
 
-        self.dynamodb = boto3.resource('dynamodb', region_name=region)
+        self.dynamodb = get_resource('dynamodb', region)
         self.table = self.dynamodb.Table(table_name)
+        # 핫 경로 읽기용 저수준 클라이언트 (fast_read 비활성화 시 None)
+        self.client = get_client(region) if DYNAMODB_CONFIG['fast_read'] else None
+        # 오프로드 본문 저장소 - 버킷이 설정되어 있으면 오프로드를 끈 상태에서도 기존 포인터 조회용으로 생성
+        if body_store is None and S3_CONFIG['bucket']:
+            body_store = MessageBodyStore()
+        self.body_store = body_store
         logger.info(f"ConversationRepository initialized with table: {table_name}")
     
     def save(self, conversation: Conversation) -> Conversation:
-        """대화 저장"""
+        """
+        대화 저장 (읽은 시점의 version과 같을 때만 덮어씀)
+
+        conversation.version이 None이면 새 대화(또는 version이 없는 이전 아이템)로 보고 저장합니다.
+
+        Raises:
+            ConversationConflictError: 읽은 이후 다른 요청이 먼저 저장한 경우 (캐시 무효화됨)
+        """
         try:
             # ID가 없으면 생성
             if not conversation.conversation_id:
@@ -41,28 +97,118 @@ class ConversationRepository:
                 conversation.created_at = now
             conversation.updated_at = now
 
+            # 아주 큰 본문은 S3로 오프로드 (모델 메시지에 contentRef 기록)
+            self._offload_messages(conversation.conversation_id, conversation.messages)
+
             # DynamoDB에 저장 (userEngineType 복합키 추가)
             item = conversation.to_dict()
+            item['messages'] = self._encode_messages(item['messages'])
             # GSI를 위한 복합 키 생성: userId#engineType
             item['userEngineType'] = f"{conversation.user_id}#{conversation.engine_type}"
+            # 메시지 부분 조회(messages[i] projection)를 위한 메시지 수
+            item['messageCount'] = len(conversation.messages)
+            item['version'] = _new_version()
+
+            if conversation.version is None:
+                condition = 'attribute_not_exists(#version)'
+                values = None
+            else:
+                condition = '#version = :expected_version'
+                values = {':expected_version': conversation.version}
+            params = {
+                'Item': item,
+                'ConditionExpression': condition,
+                'ExpressionAttributeNames': {'#version': 'version'}
+            }
+            if values:
+                params['ExpressionAttributeValues'] = values
 
-            self.table.put_item(Item=item)
+            self.table.put_item(**params)
+            conversation.version = item['version']
+            self._cache_put(item)
 
             logger.info(f"Conversation saved: {conversation.conversation_id}")
             return conversation
 
+        except ClientError as e:
+            _conversation_cache.invalidate(self._cache_key(conversation.conversation_id))
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                logger.warning(f"Conversation changed since read: {conversation.conversation_id}")
+                raise ConversationConflictError(conversation.conversation_id) from e
+            logger.error(f"Error saving conversation: {str(e)}")
+            raise
+
         except Exception as e:
             logger.error(f"Error saving conversation: {str(e)}")
+            if conversation.conversation_id:
+                _conversation_cache.invalidate(self._cache_key(conversation.conversation_id))
             raise
     
-    def find_by_id(self, conversation_id: str) -> Optional[Conversation]:
-        """ID로 대화 조회"""
+    def modify(
+        self,
+        conversation_id: str,
+        apply: Callable[[Optional[Conversation]], Optional[Conversation]]
+    ) -> Optional[Conversation]:
+        """
+        조회 -> 변경 -> 조건부 저장 (충돌하면 테이블에서 다시 읽어 변경을 재적용)
+
+        Args:
+            conversation_id: 대화 ID
+            apply: 조회 결과(없으면 None)를 받아 저장할 대화를 반환하는 함수 (None이면 저장하지 않음)
+                   충돌 시 다시 호출되므로 조회 결과 외의 상태를 바꾸지 않아야 함
+
+        Returns:
+            저장된 대화 또는 None
+
+        Raises:
+            ConversationConflictError: 재시도 후에도 충돌한 경우
+        """
+        for attempt in range(_SAVE_CONFLICT_ATTEMPTS):
+            # 첫 시도만 캐시 사용 - 충돌 후에는 테이블의 최신 아이템 기준
+            conversation = apply(self.find_by_id(conversation_id, use_cache=attempt == 0))
+            if conversation is None:
+                return None
+            try:
+                return self.save(conversation)
+            except ConversationConflictError:
+                if attempt == _SAVE_CONFLICT_ATTEMPTS - 1:
+                    raise
+        return None
+
+    def find_by_id(self, conversation_id: str, use_cache: bool = True) -> Optional[Conversation]:
+        """
+        ID로 대화 조회 (컨테이너 캐시 우선)
+
+        Args:
+            conversation_id: 대화 ID
+            use_cache: False면 캐시를 거치지 않고 테이블에서 읽음 (읽은 결과는 캐시에 반영)
+
+        Returns:
+            대화 또는 None
+        """
         try:
+            if use_cache and CONVERSATION_CACHE_CONFIG['enabled']:
+                wire_item = self._cache_lookup(conversation_id)
+                if wire_item is not None:
+                    return decode_conversation(wire_item)
+
+            if self.client:
+                # 저수준 클라이언트 - 와이어 포맷을 그대로 모델로 변환
+                wire_item = self.client.get_item(
+                    TableName=self.table.name,
+                    Key={'conversationId': {'S': conversation_id}}
+                ).get('Item')
+                if wire_item is None:
+                    return None
+                self._cache_put_wire(wire_item)
+                return decode_conversation(wire_item)
+
             response = self.table.get_item(
                 Key={'conversationId': conversation_id}
             )
             
             if 'Item' in response:
+                self._cache_put(response['Item'])
                 return Conversation.from_dict(response['Item'])
             
             return None
@@ -70,51 +216,186 @@ class ConversationRepository:
         except Exception as e:
             logger.error(f"Error finding conversation by id: {str(e)}")
             raise
+
+    def _cache_lookup(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        캐시 조회 - TTL이 지난 항목은 version/updatedAt만 읽어 재검증
+
+        Returns:
+            최신임이 확인된 와이어 포맷 아이템 또는 None (테이블 전체 조회 필요)
+        """
+        key = self._cache_key(conversation_id)
+        wire_item, version, fresh = _conversation_cache.get(key)
+        if wire_item is None or fresh:
+            return wire_item
+
+        response = self.table.get_item(
+            Key={'conversationId': conversation_id},
+            ProjectionExpression='#version, updatedAt',
+            ExpressionAttributeNames={'#version': 'version'}
+        )
+        current = response.get('Item')
+        cached_updated_at = wire_item.get('updatedAt', {}).get('S')
+        if current and (current.get('version'), current.get('updatedAt')) == (version, cached_updated_at):
+            _conversation_cache.touch(key)
+            return wire_item
+
+        _conversation_cache.invalidate(key, stale=True)
+        return None
+
+    def _cache_update(self, conversation_id: str, changes: Dict[str, Any]) -> None:
+        """캐시된 대화에 변경 속성 반영 (write-through)"""
+        try:
+            _conversation_cache.update(self._cache_key(conversation_id), encode_item(changes), changes['version'])
+        except (TypeError, ValueError):
+            _conversation_cache.invalidate(self._cache_key(conversation_id))
+
+    def _cache_key(self, conversation_id: str) -> str:
+        return f"{self.table.name}#{conversation_id}"
+
+    def _cache_put(self, item: Dict[str, Any]) -> None:
+        """조회/저장한 아이템(resource 포맷)을 와이어 포맷으로 캐시에 반영"""
+        if not CONVERSATION_CACHE_CONFIG['enabled']:
+            return
+        try:
+            self._cache_put_wire(encode_item(item))
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Conversation not cacheable: {str(e)}")
+            _conversation_cache.invalidate(self._cache_key(item['conversationId']))
+
+    def _cache_put_wire(self, wire_item: Dict[str, Any]) -> None:
+        """와이어 포맷 아이템을 캐시에 반영"""
+        if CONVERSATION_CACHE_CONFIG['enabled']:
+            version = wire_item.get('version', {}).get('S')
+            _conversation_cache.put(self._cache_key(wire_item['conversationId']['S']), wire_item, version)
+
+    @staticmethod
+    def cache_stats() -> Dict[str, int]:
+        """컨테이너 캐시 히트/미스 카운터"""
+        return _conversation_cache.stats()
+
+    @staticmethod
+    def clear_cache() -> None:
+        """컨테이너 캐시 비우기"""
+        _conversation_cache.clear()
     
-    def find_by_user(self, user_id: str, limit: int = 1000) -> List[Conversation]:
-        """사용자별 모든 대화 목록 조회 - GSI 사용으로 최적화"""
+    def find_version(self, conversation_id: str) -> Optional[str]:
+        """대화 updatedAt만 조회 (없으면 None)"""
         try:
-            conversations = []
-            last_evaluated_key = None
+            response = self.table.get_item(
+                Key={'conversationId': conversation_id},
+                ProjectionExpression='updatedAt'
+            )
+            return response.get('Item', {}).get('updatedAt')
 
-            # GSI를 사용한 효율적인 Query (Scan 대신)
-            while True:
-                query_params = {
-                    'IndexName': 'userId-createdAt-index',
-                    'KeyConditionExpression': 'userId = :userId',
-                    'ExpressionAttributeValues': {
-                        ':userId': user_id
-                    },
-                    'ScanIndexForward': False  # 최신순 정렬 (createdAt 내림차순)
-                }
+        except Exception as e:
+            logger.error(f"Error finding conversation version: {str(e)}")
+            raise
 
-                # limit 적용
-                if limit:
-                    remaining = limit - len(conversations)
-                    if remaining <= 0:
-                        break
-                    query_params['Limit'] = remaining
+    def find_messages_page(
+        self,
+        conversation_id: str,
+        limit: int,
+        before_seq: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        대화의 최신 메시지 N개만 조회 (이전 메시지는 before_seq 커서로 조회)
+
+        메시지 수(messageCount)를 먼저 읽은 뒤 필요한 messages[i]만 projection하여
+        전체 메시지 목록을 전송/역직렬화하지 않습니다.
+
+        Args:
+            conversation_id: 대화 ID
+            limit: 조회할 메시지 수
+            before_seq: 이 순번 이전 메시지만 조회 (없으면 최신부터)
+
+        Returns:
+            {'conversation': 조회한 메시지만 포함한 Conversation, 'first_seq': 첫 메시지 순번,
+             'seq_base': 보관 중인 가장 오래된 순번, 'message_count': 전체 메시지 수}
+            대화가 없으면 None
+        """
+        try:
+            if CONVERSATION_CACHE_CONFIG['enabled']:
+                wire_item, _, fresh = _conversation_cache.get(self._cache_key(conversation_id))
+                if wire_item is not None and fresh:
+                    return self._slice_messages(decode_conversation(wire_item), limit, before_seq)
 
-                # 페이지네이션
-                if last_evaluated_key:
-                    query_params['ExclusiveStartKey'] = last_evaluated_key
+            header_attributes = SUMMARY_ATTRIBUTES + ('metadata', 'messageCount')
+            names = {f'#{attr}': attr for attr in header_attributes}
 
-                response = self.table.query(**query_params)
+            # 1. 헤더(메시지 제외) 조회
+            response = self.table.get_item(
+                Key={'conversationId': conversation_id},
+                ProjectionExpression=', '.join(names),
+                ExpressionAttributeNames=names
+            )
+            header = response.get('Item')
+            if not header:
+                return None
+
+            if 'messageCount' not in header:
+                # messageCount 도입 전 아이템 - 전체 조회 후 잘라서 반환
+                return self._slice_messages(self.find_by_id(conversation_id, use_cache=False), limit, before_seq)
+
+            seq_base = int((header.get('metadata') or {}).get('messageSeqBase', 0))
+            count = int(header['messageCount'])
+            end = count if before_seq is None else max(0, min(count, before_seq - seq_base))
+            start = max(0, end - limit)
+
+            messages = []
+            if start < end:
+                # 2. 필요한 메시지만 조회 (헤더 조회 이후 변경되었거나 개수가 맞지 않으면 전체 조회로 대체)
+                response = self.table.get_item(
+                    Key={'conversationId': conversation_id},
+                    ProjectionExpression=', '.join(
+                        ['#updatedAt'] + [f'messages[{index}]' for index in range(start, end)]
+                    ),
+                    ExpressionAttributeNames={'#updatedAt': 'updatedAt'}
+                )
+                item = response.get('Item', {})
+                messages = item.get('messages', [])
+                if item.get('updatedAt') != header.get('updatedAt') or len(messages) != end - start:
+                    return self._slice_messages(self.find_by_id(conversation_id, use_cache=False), limit, before_seq)
+
+            conversation = Conversation.from_dict({**header, 'messages': messages})
+            return {
+                'conversation': conversation,
+                'first_seq': seq_base + start,
+                'seq_base': seq_base,
+                'message_count': count
+            }
 
-                # 결과 추가
-                for item in response.get('Items', []):
-                    conversations.append(Conversation.from_dict(item))
+        except Exception as e:
+            logger.error(f"Error finding messages page: {str(e)}")
+            raise
 
-                # 더 이상 페이지가 없으면 종료
-                last_evaluated_key = response.get('LastEvaluatedKey')
-                if not last_evaluated_key:
-                    break
+    @staticmethod
+    def _slice_messages(
+        conversation: Optional[Conversation],
+        limit: int,
+        before_seq: Optional[int]
+    ) -> Optional[Dict[str, Any]]:
+        """전체 조회한 대화에서 메시지 페이지 추출 (find_messages_page 대체 경로)"""
+        if not conversation:
+            return None
 
-                # limit에 도달했으면 종료
-                if limit and len(conversations) >= limit:
-                    break
+        seq_base = int((conversation.metadata or {}).get('messageSeqBase', 0))
+        count = len(conversation.messages)
+        end = count if before_seq is None else max(0, min(count, before_seq - seq_base))
+        start = max(0, end - limit)
+        conversation.messages = conversation.messages[start:end]
 
-            return conversations[:limit] if limit else conversations
+        return {
+            'conversation': conversation,
+            'first_seq': seq_base + start,
+            'seq_base': seq_base,
+            'message_count': count
+        }
+
+    def find_by_user(self, user_id: str, limit: int = 1000) -> List[Conversation]:
+        """사용자별 모든 대화 목록 조회 - GSI 사용으로 최적화"""
+        try:
+            return self._query_conversations('userId-createdAt-index', 'userId', user_id, limit)
 
         except Exception as e:
             logger.error(f"Error finding conversations by user: {str(e)}")
@@ -123,151 +404,492 @@ class ConversationRepository:
     def find_by_user_and_engine(self, user_id: str, engine_type: str, limit: int = 1000) -> List[Conversation]:
         """사용자 + 엔진별 대화 목록 조회 - 효율적인 GSI 사용"""
         try:
-            conversations = []
-            last_evaluated_key = None
-
             # userEngineType GSI를 사용한 효율적인 Query
             user_engine_key = f"{user_id}#{engine_type}"
+            return self._query_conversations(
+                'userEngineType-createdAt-index', 'userEngineType', user_engine_key, limit
+            )
 
-            while True:
-                query_params = {
-                    'IndexName': 'userEngineType-createdAt-index',
-                    'KeyConditionExpression': 'userEngineType = :userEngineType',
-                    'ExpressionAttributeValues': {
-                        ':userEngineType': user_engine_key
-                    },
-                    'ScanIndexForward': False  # 최신순 정렬 (createdAt 내림차순)
-                }
+        except Exception as e:
+            logger.error(f"Error finding conversations by user and engine: {str(e)}")
+            raise
 
-                # limit 적용
-                if limit:
-                    remaining = limit - len(conversations)
-                    if remaining <= 0:
-                        break
-                    query_params['Limit'] = remaining
+    def _query_conversations(
+        self,
+        index_name: str,
+        key_name: str,
+        key_value: str,
+        limit: int
+    ) -> List[Conversation]:
+        """createdAt 인덱스(ALL projection) 전체 대화 조회 - 최신순, limit까지 페이지 순회"""
+        conversations = []
+        fast = self.client is not None
+        query_params = {
+            'IndexName': index_name,
+            'KeyConditionExpression': f'{key_name} = :pk',
+            'ExpressionAttributeValues': {':pk': {'S': key_value} if fast else key_value},
+            'ScanIndexForward': False  # 최신순 정렬 (createdAt 내림차순)
+        }
+        if fast:
+            query_params['TableName'] = self.table.name
+        query = self.client.query if fast else self.table.query
+
+        while True:
+            # limit 적용
+            if limit:
+                remaining = limit - len(conversations)
+                if remaining <= 0:
+                    break
+                query_params['Limit'] = remaining
 
-                # 페이지네이션
-                if last_evaluated_key:
-                    query_params['ExclusiveStartKey'] = last_evaluated_key
+            response = query(**query_params)
 
-                response = self.table.query(**query_params)
+            # 결과 추가
+            for item in response.get('Items', []):
+                conversations.append(decode_conversation(item) if fast else Conversation.from_dict(item))
 
-                # 결과 추가
-                for item in response.get('Items', []):
-                    conversations.append(Conversation.from_dict(item))
+            # 더 이상 페이지가 없으면 종료 (페이지네이션)
+            last_evaluated_key = response.get('LastEvaluatedKey')
+            if not last_evaluated_key:
+                break
+            query_params['ExclusiveStartKey'] = last_evaluated_key
+
+        return conversations[:limit] if limit else conversations
+    
+    def list_summaries(
+        self,
+        user_id: str,
+        engine_type: Optional[str] = None,
+        page_size: int = 50,
+        cursor: Optional[str] = None,
+        since: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        최근 활동순 대화 요약 목록 조회 (페이지 단위)
+
+        updatedAt 인덱스는 요약 속성만 projection하므로 메시지를 읽지 않습니다.
+        tombstone은 Limit 적용 후 필터링되므로 page_size개가 모이거나 마지막 페이지에 도달할 때까지
+        남은 개수만큼 다시 조회합니다 (커서는 마지막으로 반환한 아이템 위치).
+
+        Args:
+            user_id: 사용자 ID
+            engine_type: 엔진 타입 (지정 시 userEngineType 인덱스 사용)
+            page_size: 페이지 크기
+            cursor: 이전 페이지의 nextCursor
+            since: 이 시각(updatedAt) 이후 활동한 대화만 조회 (삭제 tombstone 포함)
+
+        Returns:
+            {
+                'conversations': 요약 딕셔너리 목록,
+                'deleted': since 이후 삭제된 대화 ID 목록,
+                'nextCursor': 다음 페이지 커서 또는 None
+            }
 
-                # 더 이상 페이지가 없으면 종료
+        Raises:
+            ValueError: 커서 형식이 잘못된 경우
+        """
+        try:
+            query_params = self._activity_query(
+                user_id, engine_type, since,
+                projection=SUMMARY_ATTRIBUTES,
+                include_deleted=bool(since)
+            )
+            if cursor:
+                start_key = self._decode_cursor(cursor)
+                key_name, key_value = self._activity_partition(user_id, engine_type)[1:]
+                if start_key.get(key_name) != key_value:
+                    raise ValueError("Cursor does not match this listing")
+                query_params['ExclusiveStartKey'] = start_key
+
+            conversations, deleted = [], []
+            last_evaluated_key = None
+            for _ in range(_MAX_PAGE_QUERIES):
+                # 남은 개수만 요청 - 한 페이지를 넘겨 읽지 않으므로 LastEvaluatedKey를 그대로 커서로 사용
+                query_params['Limit'] = page_size - len(conversations)
+                response = self.table.query(**query_params)
                 last_evaluated_key = response.get('LastEvaluatedKey')
-                if not last_evaluated_key:
-                    break
 
-                # limit에 도달했으면 종료
-                if limit and len(conversations) >= limit:
+                for item in response.get('Items', []):
+                    if item['conversationId'].startswith(TOMBSTONE_PREFIX):
+                        deleted.append(item['conversationId'][len(TOMBSTONE_PREFIX):])
+                    else:
+                        conversations.append(item)
+
+                if not last_evaluated_key or len(conversations) >= page_size:
                     break
+                query_params['ExclusiveStartKey'] = last_evaluated_key
 
-            return conversations[:limit] if limit else conversations
+            return {
+                'conversations': conversations,
+                'deleted': deleted,
+                'nextCursor': self._encode_cursor(last_evaluated_key) if last_evaluated_key else None
+            }
 
+        except ValueError:
+            raise
         except Exception as e:
-            logger.error(f"Error finding conversations by user and engine: {str(e)}")
+            logger.error(f"Error listing conversation summaries: {str(e)}")
             raise
-    
+
+    @staticmethod
+    def _activity_partition(user_id: str, engine_type: Optional[str]):
+        """최근 활동순 인덱스와 파티션 키 선택 (index_name, key_name, key_value)"""
+        if engine_type:
+            return 'userEngineType-updatedAt-index', 'userEngineType', f"{user_id}#{engine_type}"
+        return 'userId-updatedAt-index', 'userId', user_id
+
+    def _activity_query(
+        self,
+        user_id: str,
+        engine_type: Optional[str],
+        since: Optional[str],
+        projection,
+        include_deleted: bool = False
+    ) -> Dict[str, Any]:
+        """updatedAt 인덱스 key condition 쿼리 파라미터 생성 (최근 활동순)"""
+        index_name, key_name, key_value = self._activity_partition(user_id, engine_type)
+
+        key_condition = '#pk = :pk'
+        values = {':pk': key_value}
+        if since:
+            key_condition += ' AND updatedAt > :since'
+            values[':since'] = since
+
+        query_params = {
+            'IndexName': index_name,
+            'KeyConditionExpression': key_condition,
+            'ProjectionExpression': ', '.join(f'#{attr}' for attr in projection),
+            'ExpressionAttributeNames': {
+                '#pk': key_name,
+                **{f'#{attr}': attr for attr in projection}
+            },
+            'ExpressionAttributeValues': values,
+            'ScanIndexForward': False  # 최근 활동순 (updatedAt 내림차순)
+        }
+
+        if not include_deleted:
+            query_params['FilterExpression'] = 'NOT begins_with(#conversationId, :tombstone)'
+            query_params['ExpressionAttributeNames']['#conversationId'] = 'conversationId'
+            values[':tombstone'] = TOMBSTONE_PREFIX
+
+        return query_params
+
+    @staticmethod
+    def _encode_cursor(last_evaluated_key: Dict[str, Any]) -> str:
+        """LastEvaluatedKey를 불투명한 커서 문자열로 변환"""
+        raw = json.dumps(last_evaluated_key, separators=(',', ':'), default=str)
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Dict[str, Any]:
+        """커서 문자열을 ExclusiveStartKey로 복원"""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            start_key = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        except (ValueError, UnicodeError) as e:
+            raise ValueError("Invalid cursor") from e
+
+        if not isinstance(start_key, dict) or not all(isinstance(v, str) for v in start_key.values()):
+            raise ValueError("Invalid cursor")
+        return start_key
+
     def update_messages(self, conversation_id: str, messages: List[Message]) -> bool:
         """대화의 메시지 업데이트"""
         try:
-            messages_data = [
-                {
+            self._offload_messages(conversation_id, messages)
+            messages_data = []
+            for msg in messages:
+                data = {
                     'role': msg.role,
                     'content': msg.content,
                     'timestamp': msg.timestamp or datetime.now().isoformat(),
                     'metadata': msg.metadata
                 }
-                for msg in messages
-            ]
+                if msg.content_ref is not None:
+                    data['contentRef'] = msg.content_ref
+                messages_data.append(data)
             
+            changes = {
+                'messages': self._encode_messages(messages_data),
+                'messageCount': len(messages_data),
+                'updatedAt': datetime.now().isoformat(),
+                'version': _new_version()
+            }
             self.table.update_item(
                 Key={'conversationId': conversation_id},
-                UpdateExpression='SET messages = :messages, updatedAt = :updatedAt',
+                UpdateExpression='SET messages = :messages, messageCount = :count, updatedAt = :updatedAt, #version = :version',
+                ExpressionAttributeNames={'#version': 'version'},
                 ExpressionAttributeValues={
-                    ':messages': messages_data,
-                    ':updatedAt': datetime.now().isoformat()
+                    ':messages': changes['messages'],
+                    ':count': changes['messageCount'],
+                    ':updatedAt': changes['updatedAt'],
+                    ':version': changes['version']
                 }
             )
+            self._cache_update(conversation_id, changes)
             
             logger.info(f"Messages updated for conversation: {conversation_id}")
             return True
             
         except Exception as e:
             logger.error(f"Error updating messages: {str(e)}")
+            _conversation_cache.invalidate(self._cache_key(conversation_id))
             raise
     
+    @staticmethod
+    def _encode_messages(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        저장용 메시지 변환 (읽기는 Message.from_dict에서 복원)
+
+        - 오프로드된 메시지(contentRef): 본문 대신 미리보기
+        - 임계값 이상 본문: 압축
+        """
+        compress = MESSAGE_COMPRESSION_CONFIG['enabled']
+        encoded = []
+        for message in messages:
+            if 'contentRef' in message:
+                message = pointer_message(message, MESSAGE_OFFLOAD_CONFIG['preview_chars'])
+            elif compress:
+                message = encode_message(
+                    message, MESSAGE_COMPRESSION_CONFIG['min_bytes'], MESSAGE_COMPRESSION_CONFIG['level']
+                )
+            encoded.append(message)
+        return encoded
+
+    def _offload_messages(self, conversation_id: str, messages: List[Message]) -> None:
+        """
+        임계값 이상 본문을 S3에 저장하고 메시지에 contentRef 기록 (claim-check)
+
+        Note: 업로드 실패 시 본문을 아이템에 그대로 저장합니다 (압축 적용).
+        """
+        if self.body_store is None or not MESSAGE_OFFLOAD_CONFIG['enabled']:
+            return
+
+        min_bytes = MESSAGE_OFFLOAD_CONFIG['min_bytes']
+        for msg in messages:
+            content = msg.content
+            # UTF-8은 문자당 최대 4바이트 - 문자 수로 먼저 걸러 encode 비용 절약
+            if msg.content_ref is not None or not content or len(content) * 4 < min_bytes:
+                continue
+            if len(content.encode('utf-8')) < min_bytes:
+                continue
+            try:
+                msg.content_ref = self.body_store.put(conversation_id, content)
+            except Exception as e:
+                logger.error(f"Error offloading message body for {conversation_id}: {str(e)}")
+
+    def hydrate_messages(self, messages: List[Message]) -> List[Message]:
+        """
+        오프로드된 메시지의 전체 본문을 병렬 조회해 content 채우기
+
+        대화 상세 응답이나 프롬프트 컨텍스트처럼 전체 본문이 필요할 때만 호출합니다.
+        조회에 실패한 메시지는 미리보기를 유지합니다.
+
+        Args:
+            messages: 메시지 목록 (제자리에서 갱신)
+
+        Returns:
+            같은 메시지 목록
+        """
+        partial = [msg for msg in messages if msg.is_partial]
+        if not partial or self.body_store is None:
+            return messages
+
+        bodies = self.body_store.fetch_many(msg.content_ref for msg in partial)
+        for msg in partial:
+            content = bodies.get(msg.content_ref)
+            if content is not None:
+                msg.restore_content(content)
+        return messages
+
+    def update_summary(self, conversation_id: str, summary: Dict[str, Any]) -> bool:
+        """
+        대화 요약(metadata.summary) 저장 - 메시지는 다시 쓰지 않음
+
+        더 최근 구간까지 요약한 결과가 이미 저장되어 있으면 덮어쓰지 않습니다.
+        상세 응답(metadata)이 바뀌므로 updatedAt도 갱신합니다 (ETag/델타 동기화 watermark 기준).
+
+        Args:
+            conversation_id: 대화 ID
+            summary: {'text', 'throughSeq', 'updatedAt', 'model'}
+
+        Returns:
+            저장 여부 (대화가 없거나 더 최신 요약이 있으면 False)
+        """
+        try:
+            self.table.update_item(
+                Key={'conversationId': conversation_id},
+                UpdateExpression='SET metadata.#summary = :summary, updatedAt = :updatedAt, #version = :version',
+                ConditionExpression=(
+                    'attribute_exists(metadata) AND '
+                    '(attribute_not_exists(metadata.#summary) OR metadata.#summary.throughSeq < :through)'
+                ),
+                ExpressionAttributeNames={'#summary': 'summary', '#version': 'version'},
+                ExpressionAttributeValues={
+                    ':summary': summary,
+                    ':through': summary['throughSeq'],
+                    ':updatedAt': datetime.now().isoformat(),
+                    ':version': _new_version()
+                }
+            )
+            logger.info(f"Summary updated for conversation: {conversation_id} (through seq {summary['throughSeq']})")
+            return True
+
+        except self.table.meta.client.exceptions.ConditionalCheckFailedException:
+            logger.info(f"Summary not updated for {conversation_id}: conversation missing or newer summary exists")
+            return False
+
+        except Exception as e:
+            logger.error(f"Error updating summary: {str(e)}")
+            raise
+
+        finally:
+            # metadata 일부만 갱신 - 캐시 항목은 다음 조회 때 다시 읽음
+            _conversation_cache.invalidate(self._cache_key(conversation_id))
+
     def update_title(self, conversation_id: str, title: str) -> bool:
         """대화 제목 업데이트"""
         try:
-            logger.info(f"Attempting to update title for conversation: {conversation_id} to: {title}")
-            
-            response = self.table.update_item(
+            changes = {'title': title, 'updatedAt': datetime.now().isoformat(), 'version': _new_version()}
+            self.table.update_item(
                 Key={'conversationId': conversation_id},
-                UpdateExpression='SET title = :title, updatedAt = :updatedAt',
+                UpdateExpression='SET title = :title, updatedAt = :updatedAt, #version = :version',
+                ExpressionAttributeNames={'#version': 'version'},
                 ExpressionAttributeValues={
-                    ':title': title,
-                    ':updatedAt': datetime.now().isoformat()
-                },
-                ReturnValues='UPDATED_NEW'
+                    ':title': changes['title'],
+                    ':updatedAt': changes['updatedAt'],
+                    ':version': changes['version']
+                }
             )
+            self._cache_update(conversation_id, changes)
             
-            logger.info(f"DynamoDB update response: {response}")
-            logger.info(f"Title successfully updated for conversation: {conversation_id}")
+            logger.debug("Title updated for conversation %s", conversation_id)
             return True
             
         except Exception as e:
-            logger.error(f"Error updating title for {conversation_id}: {str(e)}")
-            logger.error(f"Exception type: {type(e).__name__}")
+            _conversation_cache.invalidate(self._cache_key(conversation_id))
+            logger.error("Error updating title for %s: %s: %s", conversation_id, type(e).__name__, e)
             raise
     
     def delete(self, conversation_id: str) -> bool:
-        """대화 삭제"""
+        """대화 삭제 (델타 동기화용 tombstone 기록)"""
         try:
-            self.table.delete_item(
-                Key={'conversationId': conversation_id}
+            _conversation_cache.invalidate(self._cache_key(conversation_id))
+            response = self.table.delete_item(
+                Key={'conversationId': conversation_id},
+                ReturnValues='ALL_OLD'
             )
-            
+
+            old_item = response.get('Attributes')
+            if old_item:
+                self._put_tombstone(old_item)
+                self._delete_bodies(conversation_id)
+
             logger.info(f"Conversation deleted: {conversation_id}")
             return True
             
         except Exception as e:
             logger.error(f"Error deleting conversation: {str(e)}")
             raise
+
+    def _put_tombstone(self, old_item: Dict[str, Any]) -> None:
+        """
+        삭제 tombstone 저장 - updatedAt 인덱스에 남아 since 조회 시 삭제 사실을 전달
+
+        Note: tombstone 저장 실패는 삭제를 되돌리지 않습니다 (다음 전체 동기화 시 반영).
+        """
+        try:
+            self.table.put_item(Item={
+                'conversationId': f"{TOMBSTONE_PREFIX}{old_item['conversationId']}",
+                'userId': old_item.get('userId'),
+                'engineType': old_item.get('engineType'),
+                'userEngineType': old_item.get('userEngineType')
+                or f"{old_item.get('userId')}#{old_item.get('engineType')}",
+                'updatedAt': datetime.now().isoformat(),
+                'ttl': int(time.time()) + DELTA_SYNC_CONFIG['tombstone_ttl']
+            })
+        except Exception as e:
+            logger.error(f"Error saving tombstone for {old_item.get('conversationId')}: {str(e)}")
     
-    def find_recent(self, user_id: str, engine_type: Optional[str] = None, days: int = 30) -> List[Conversation]:
-        """최근 대화 조회"""
+    def _delete_bodies(self, conversation_id: str) -> None:
+        """오프로드 본문 삭제 (실패해도 대화 삭제는 유지 - 키 접두사로 추후 정리 가능)"""
+        if self.body_store is None:
+            return
+        try:
+            deleted = self.body_store.delete_conversation(conversation_id)
+            if deleted:
+                logger.info(f"Deleted {deleted} offloaded message bodies for {conversation_id}")
+        except Exception as e:
+            logger.error(f"Error deleting offloaded message bodies for {conversation_id}: {str(e)}")
+
+    def find_recent(
+        self,
+        user_id: str,
+        engine_type: Optional[str] = None,
+        days: int = 30,
+        limit: Optional[int] = None
+    ) -> List[Conversation]:
+        """
+        최근 대화 조회 - updatedAt 인덱스 key condition으로 기간 내 대화만 읽음
+
+        Args:
+            user_id: 사용자 ID
+            engine_type: 엔진 타입
+            days: 조회 기간 (일)
+            limit: 최대 대화 수 (최근 활동순)
+
+        Returns:
+            최근 활동순 대화 목록
+        """
         try:
             from datetime import timedelta
             cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
-            
-            filter_expression = 'updatedAt > :cutoff'
-            expression_values = {
-                ':userId': user_id,
-                ':cutoff': cutoff_date
-            }
-            
-            if engine_type:
-                filter_expression += ' AND engineType = :engineType'
-                expression_values[':engineType'] = engine_type
-            
-            response = self.table.query(
-                IndexName='userId-createdAt-index',
-                KeyConditionExpression='userId = :userId',
-                FilterExpression=filter_expression,
-                ExpressionAttributeValues=expression_values,
-                ScanIndexForward=False
+
+            # 1. 인덱스에서 기간 내 대화 ID만 조회
+            conversation_ids = []
+            query_params = self._activity_query(
+                user_id, engine_type, cutoff_date,
+                projection=('conversationId',)
             )
-            
-            conversations = []
-            for item in response.get('Items', []):
-                conversations.append(Conversation.from_dict(item))
-            
+            while True:
+                if limit:
+                    query_params['Limit'] = limit - len(conversation_ids)
+
+                response = self.table.query(**query_params)
+                conversation_ids.extend(item['conversationId'] for item in response.get('Items', []))
+
+                last_evaluated_key = response.get('LastEvaluatedKey')
+                if not last_evaluated_key or (limit and len(conversation_ids) >= limit):
+                    break
+                query_params['ExclusiveStartKey'] = last_evaluated_key
+
+            # 2. 해당 대화만 일괄 조회
+            order = {conversation_id: index for index, conversation_id in enumerate(conversation_ids)}
+            conversations = self._batch_get(conversation_ids)
+            conversations.sort(key=lambda c: order[c.conversation_id])
             return conversations
-            
+
         except Exception as e:
             logger.error(f"Error finding recent conversations: {str(e)}")
-            raise
\ No newline at end of file
+            raise
+
+    def _batch_get(self, conversation_ids: List[str]) -> List[Conversation]:
+        """대화 ID 목록 일괄 조회 (BatchGetItem 100개 단위, 미처리 키 재시도)"""
+        conversations = []
+        table_name = self.table.name
+        fast = self.client is not None
+        batch_get_item = self.client.batch_get_item if fast else self.dynamodb.batch_get_item
+
+        for start in range(0, len(conversation_ids), 100):
+            request = {table_name: {'Keys': [
+                {'conversationId': {'S': conversation_id} if fast else conversation_id}
+                for conversation_id in conversation_ids[start:start + 100]
+            ]}}
+
+            while request:
+                response = batch_get_item(RequestItems=request)
+                for item in response.get('Responses', {}).get(table_name, []):
+                    conversations.append(decode_conversation(item) if fast else Conversation.from_dict(item))
+                request = response.get('UnprocessedKeys') or None
+
+        return conversations
@@ -0,0 +1,153 @@
+"""
+DynamoDB 저수준 클라이언트 읽기 경로
+AttributeValue 와이어 포맷을 도메인 모델로 바로 변환하는 디코더
+
+boto3 resource 계층은 모든 속성을 범용 TypeDeserializer로 변환(숫자는 Decimal)한 뒤
+from_dict에서 다시 복사합니다. 큰 대화 아이템을 읽는 핫 경로에서는
+저수준 client 응답을 여기의 전용 디코더로 한 번에 변환합니다.
+"""
+import threading
+from decimal import Decimal
+from typing import Any, Dict
+
+from boto3.dynamodb.types import TypeSerializer
+
+from ..models import Conversation, Message, Usage
+from .aws_clients import get_client as get_aws_client
+
+# 리전별 저수준 클라이언트 (웜 컨테이너 동안 재사용)
+_clients: Dict[str, Any] = {}
+_clients_lock = threading.Lock()
+
+_serializer = TypeSerializer()
+
+
+def get_client(region: str):
+    """
+    저수준 DynamoDB 클라이언트 조회 (컨테이너 내 재사용)
+
+    Note: resource.meta.client에는 resource 계층 변환 핸들러가 등록되어 있어
+    별도 클라이언트를 사용합니다.
+    """
+    client = _clients.get(region)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(region)
+            if client is None:
+                client = get_aws_client('dynamodb', region)
+                _clients[region] = client
+    return client
+
+
+def _number(raw: str) -> Any:
+    """N 타입 변환 - 정수는 int, 그 외는 Decimal (resource 계층과 같은 정밀도)"""
+    if '.' in raw or 'e' in raw or 'E' in raw:
+        return Decimal(raw)
+    return int(raw)
+
+
+def decode_value(value: Dict[str, Any]) -> Any:
+    """AttributeValue 하나를 파이썬 값으로 변환"""
+    for tag, raw in value.items():
+        if tag == 'S':
+            return raw
+        if tag == 'N':
+            return _number(raw)
+        if tag == 'M':
+            return {key: decode_value(item) for key, item in raw.items()}
+        if tag == 'L':
+            return [decode_value(item) for item in raw]
+        if tag == 'BOOL':
+            return raw
+        if tag == 'NULL':
+            return None
+        if tag == 'SS' or tag == 'BS':
+            return set(raw)
+        if tag == 'NS':
+            return {_number(item) for item in raw}
+        if tag == 'B':
+            return raw
+        raise ValueError(f"Unknown attribute type: {tag}")
+    raise ValueError("Empty attribute value")
+
+
+def decode_item(item: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """아이템 전체를 일반 dict로 변환"""
+    return {key: decode_value(value) for key, value in item.items()}
+
+
+def encode_item(item: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """일반 dict를 AttributeValue 와이어 포맷으로 변환 (None 값 속성은 NULL)"""
+    return {key: _serializer.serialize(value) for key, value in item.items()}
+
+
+def _optional(item: Dict[str, Any], key: str) -> Any:
+    value = item.get(key)
+    if value is None:
+        return None
+    text = value.get('S')
+    return text if text is not None else decode_value(value)
+
+
+def decode_message(value: Dict[str, Any]) -> Message:
+    """messages 리스트 원소(M)를 Message로 변환"""
+    attributes = value['M']
+    content = attributes.get('content')
+    if content is None:
+        # 압축(contentBin + codec)/오프로드(contentRef) 메시지 - 저장 포맷 규칙은 Message.from_dict에 위임
+        return Message.from_dict(decode_value(value))
+
+    role = attributes['role']['S']
+    metadata = attributes.get('metadata')
+
+    return Message(
+        role=role,
+        content=content['S'],
+        timestamp=_optional(attributes, 'timestamp'),
+        type=_optional(attributes, 'type') or role,
+        metadata=decode_value(metadata) if metadata is not None else {}
+    )
+
+
+def decode_conversation(item: Dict[str, Dict[str, Any]]) -> Conversation:
+    """대화 아이템을 Conversation으로 변환 (Conversation.from_dict와 동일한 결과)"""
+    messages = item.get('messages')
+    metadata = item.get('metadata')
+
+    return Conversation(
+        conversation_id=item['conversationId']['S'],
+        user_id=item['userId']['S'],
+        engine_type=item['engineType']['S'],
+        title=_optional(item, 'title'),
+        messages=[decode_message(message) for message in messages['L']] if messages and 'L' in messages else [],
+        created_at=_optional(item, 'createdAt'),
+        updated_at=_optional(item, 'updatedAt'),
+        metadata=decode_value(metadata) if metadata is not None else {},
+        version=_optional(item, 'version')
+    )
+
+
+def _int(item: Dict[str, Any], key: str) -> int:
+    value = item.get(key)
+    return int(value['N']) if value and 'N' in value else 0
+
+
+def decode_usage(item: Dict[str, Dict[str, Any]]) -> Usage:
+    """사용량 아이템을 Usage로 변환 (Usage.from_dict와 동일한 결과)"""
+    cost = item.get('estimatedCost')
+    metadata = item.get('metadata')
+
+    return Usage(
+        user_id=item['userId']['S'],
+        usage_date=item['usageDate']['S'],
+        engine_type=_optional(item, 'engineType') or 'unknown',
+        request_count=_int(item, 'requestCount'),
+        total_input_tokens=_int(item, 'totalInputTokens'),
+        total_output_tokens=_int(item, 'totalOutputTokens'),
+        total_tokens=_int(item, 'totalTokens'),
+        estimated_cost=Decimal(cost.get('N') or cost.get('S')) if cost else Decimal('0.00'),
+        metadata=decode_value(metadata) if metadata is not None else {},
+        created_at=_optional(item, 'createdAt'),
+        updated_at=_optional(item, 'updatedAt')
+    )
+
@@ -0,0 +1,107 @@
+"""
+컨테이너 내 아이템 캐시
+Lambda 웜 컨테이너 동안 유지되는 LRU + TTL 읽기 캐시
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class ItemCache:
+    """
+    LRU + TTL 아이템 캐시
+
+    - TTL 이내 항목은 그대로 반환(fresh), TTL이 지난 항목은 호출자가 버전 속성으로
+      재검증한 뒤 touch()로 갱신하거나 다시 저장합니다.
+    - 저장/반환 시 깊은 복사 - 호출자가 반환된 객체를 수정해도 캐시에 영향 없음
+      (copy_items=False: 호출자가 항목을 읽기 전용으로만 사용하는 경우, 예: 와이어 포맷 아이템)
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 5.0, copy_items: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._copy = copy.deepcopy if copy_items else (lambda item: item)
+        self._entries: 'OrderedDict[str, Tuple[Dict[str, Any], Optional[str], float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'revalidated': 0,
+            'stale': 0,
+            'evictions': 0,
+            'invalidations': 0
+        }
+
+    def get(self, key: str) -> Tuple[Optional[Dict[str, Any]], Optional[str], bool]:
+        """
+        캐시 조회
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            (item 복사본, version, fresh 여부) - 없으면 (None, None, False)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None, None, False
+
+            self._entries.move_to_end(key)
+            item, version, stored_at = entry
+            fresh = time.monotonic() - stored_at < self.ttl_seconds
+            if fresh:
+                self._stats['hits'] += 1
+
+        return self._copy(item), version, fresh
+
+    def put(self, key: str, item: Dict[str, Any], version: Optional[str]) -> None:
+        """항목 저장 (최대 개수 초과 시 가장 오래 사용하지 않은 항목 제거)"""
+        snapshot = self._copy(item)
+        with self._lock:
+            self._entries[key] = (snapshot, version, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def touch(self, key: str) -> None:
+        """재검증 성공 - TTL 재시작"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (entry[0], entry[1], time.monotonic())
+                self._stats['revalidated'] += 1
+
+    def update(self, key: str, changes: Dict[str, Any], version: Optional[str]) -> None:
+        """캐시된 항목이 있으면 변경 속성 반영 (write-through)"""
+        changes = self._copy(changes)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = ({**entry[0], **changes}, version, time.monotonic())
+
+    def invalidate(self, key: str, stale: bool = False) -> None:
+        """
+        항목 제거
+
+        Args:
+            key: 캐시 키
+            stale: 재검증에서 버전 불일치로 제거하는 경우 True
+        """
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._stats['stale' if stale else 'invalidations'] += 1
+
+    def clear(self) -> None:
+        """전체 항목 제거 (통계 유지)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """히트/미스 카운터와 현재 항목 수"""
+        with self._lock:
+            return {**self._stats, 'size': len(self._entries)}
@@ -0,0 +1,155 @@
+"""
+메시지 본문 S3 저장소 (claim-check)
+DynamoDB 아이템 한도(400KB)를 넘길 수 있는 아주 큰 메시지 본문을 S3에 저장하고,
+대화 아이템에는 객체 키(contentRef)와 미리보기만 남깁니다.
+
+- 객체 키는 대화 ID + 본문 SHA-256 - 같은 본문은 같은 키(재저장해도 덮어쓰기만 발생)이고
+  키가 가리키는 내용은 바뀌지 않으므로 웜 컨테이너 캐시를 재검증 없이 사용합니다.
+- 본문 조회는 전체 본문이 필요할 때만(대화 상세, 프롬프트 컨텍스트) 스레드 풀로 병렬 수행합니다.
+"""
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional
+
+from ..config.aws import S3_CONFIG
+from ..config.business import MESSAGE_OFFLOAD_CONFIG
+from .aws_clients import get_client
+from .item_cache import ItemCache
+
+logger = logging.getLogger(__name__)
+
+# (리전, 엔드포인트)별 S3 클라이언트 (웜 컨테이너 동안 재사용, 스레드 간 공유 가능)
+_clients: Dict[Any, Any] = {}
+_clients_lock = threading.Lock()
+
+# 본문 캐시 - 키가 본문 해시라 TTL 재검증이 필요 없음
+_body_cache = ItemCache(
+    max_entries=MESSAGE_OFFLOAD_CONFIG['cache_entries'],
+    ttl_seconds=float('inf'),
+    copy_items=False
+)
+
+
+def get_s3_client(region: str, endpoint_url: Optional[str] = None):
+    """S3 클라이언트 조회 (컨테이너 내 재사용)"""
+    cache_key = (region, endpoint_url)
+    client = _clients.get(cache_key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(cache_key)
+            if client is None:
+                client = get_client('s3', region, endpoint_url)
+                _clients[cache_key] = client
+    return client
+
+
+class MessageBodyStore:
+    """오프로드 메시지 본문 저장/조회"""
+
+    def __init__(
+        self,
+        bucket: str = None,
+        region: str = None,
+        endpoint_url: str = None,
+        key_prefix: str = None,
+        max_workers: int = None
+    ):
+        self.bucket = bucket or S3_CONFIG['bucket']
+        if not self.bucket:
+            raise ValueError("S3_BUCKET environment variable must be set for message offload")
+
+        self.client = get_s3_client(region or S3_CONFIG['region'], endpoint_url or S3_CONFIG['endpoint_url'])
+        self.key_prefix = key_prefix if key_prefix is not None else MESSAGE_OFFLOAD_CONFIG['key_prefix']
+        self.max_workers = max_workers or MESSAGE_OFFLOAD_CONFIG['max_workers']
+
+    def key_for(self, conversation_id: str, content: str) -> str:
+        """본문 객체 키 - {prefix}{대화 ID}/{본문 해시}.txt"""
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:32]
+        return f"{self.key_prefix}{conversation_id}/{digest}.txt"
+
+    def put(self, conversation_id: str, content: str) -> str:
+        """
+        본문 저장
+
+        Args:
+            conversation_id: 대화 ID
+            content: 메시지 본문
+
+        Returns:
+            객체 키 (메시지 contentRef)
+        """
+        key = self.key_for(conversation_id, content)
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=content.encode('utf-8'),
+            ContentType='text/plain; charset=utf-8'
+        )
+        _body_cache.put(self._cache_key(key), content, None)
+        return key
+
+    def fetch_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """
+        본문 일괄 조회 - 캐시에 없는 키만 병렬로 읽음
+
+        Args:
+            keys: 객체 키 목록
+
+        Returns:
+            {키: 본문} - 조회에 실패한 키는 포함하지 않음 (호출자는 미리보기 유지)
+        """
+        bodies = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            content = _body_cache.get(self._cache_key(key))[0]
+            if content is not None:
+                bodies[key] = content
+            else:
+                missing.append(key)
+
+        if len(missing) == 1:
+            fetched = [self._fetch(missing[0])]
+        elif missing:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+                fetched = list(executor.map(self._fetch, missing))
+        else:
+            fetched = []
+
+        for key, content in zip(missing, fetched):
+            if content is not None:
+                bodies[key] = content
+        return bodies
+
+    def _fetch(self, key: str) -> Optional[str]:
+        """본문 단건 조회 (실패 시 None)"""
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=key)
+            content = response['Body'].read().decode('utf-8')
+        except Exception as e:
+            logger.error(f"Error fetching message body {key}: {str(e)}")
+            return None
+        _body_cache.put(self._cache_key(key), content, None)
+        return content
+
+    def delete_conversation(self, conversation_id: str) -> int:
+        """
+        대화의 오프로드 본문 전체 삭제
+
+        Returns:
+            삭제한 객체 수
+        """
+        deleted = 0
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=f"{self.key_prefix}{conversation_id}/"):
+            objects = [{'Key': obj['Key']} for obj in page.get('Contents', [])]
+            if objects:
+                self.client.delete_objects(Bucket=self.bucket, Delete={'Objects': objects, 'Quiet': True})
+                for obj in objects:
+                    _body_cache.invalidate(self._cache_key(obj['Key']))
+                deleted += len(objects)
+        return deleted
+
+    def _cache_key(self, key: str) -> str:
+        return f"{self.bucket}/{key}"
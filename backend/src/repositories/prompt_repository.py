@@ -2,7 +2,6 @@
 프롬프트(Prompt) 리포지토리
 DynamoDB와의 모든 상호작용을 캡슐화
 """
-import boto3
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import uuid
@@ -10,6 +9,7 @@ import logging
 import os
 
 from ..models import Prompt, PromptConfig, PromptFile
+from .aws_clients import get_resource
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +24,7 @@ class PromptRepository:
         if not table_name:
             raise ValueError("PROMPTS_TABLE environment variable must be set")
 
-        self.dynamodb = boto3.resource('dynamodb', region_name=region)
+        self.dynamodb = get_resource('dynamodb', region)
         self.table = self.dynamodb.Table(table_name)
         logger.info(f"PromptRepository initialized with table: {table_name}")
     
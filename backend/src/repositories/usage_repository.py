@@ -2,7 +2,6 @@
 사용량(Usage) 리포지토리
 DynamoDB와의 모든 상호작용을 캡슐화
 """
-import boto3
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from decimal import Decimal
@@ -10,6 +9,9 @@ import logging
 import os
 
 from ..models import Usage, UsageSummary
+from ..config.database import DYNAMODB_CONFIG
+from .aws_clients import get_resource
+from .fast_read import get_client, decode_usage
 
 logger = logging.getLogger(__name__)
 
@@ -24,8 +26,10 @@ class UsageRepository:
         if not table_name:
             raise ValueError("USAGE_TABLE environment variable must be set")
 
-        self.dynamodb = boto3.resource('dynamodb', region_name=region)
+        self.dynamodb = get_resource('dynamodb', region)
         self.table = self.dynamodb.Table(table_name)
+        # 핫 경로 읽기용 저수준 클라이언트 (fast_read 비활성화 시 None)
+        self.client = get_client(region) if DYNAMODB_CONFIG['fast_read'] else None
         logger.info(f"UsageRepository initialized with table: {table_name}")
     
     def save(self, usage: Usage) -> Usage:
@@ -50,6 +54,16 @@ class UsageRepository:
     def find_by_date(self, user_id: str, usage_date: str, engine_type: str) -> Optional[Usage]:
         """특정 날짜의 사용량 조회"""
         try:
+            if self.client:
+                wire_item = self.client.get_item(
+                    TableName=self.table.name,
+                    Key={
+                        'userId': {'S': user_id},
+                        'usageDate#engineType': {'S': f"{usage_date}#{engine_type}"}
+                    }
+                ).get('Item')
+                return decode_usage(wire_item) if wire_item else None
+
             response = self.table.get_item(
                 Key={
                     'userId': user_id,
@@ -69,6 +83,18 @@ class UsageRepository:
     def find_by_user(self, user_id: str, start_date: str, end_date: str) -> List[Usage]:
         """사용자의 기간별 사용량 조회"""
         try:
+            if self.client:
+                response = self.client.query(
+                    TableName=self.table.name,
+                    KeyConditionExpression='userId = :userId AND usageDate#engineType BETWEEN :start AND :end',
+                    ExpressionAttributeValues={
+                        ':userId': {'S': user_id},
+                        ':start': {'S': start_date},
+                        ':end': {'S': f"{end_date}#zzz"}  # 모든 엔진 타입 포함
+                    }
+                )
+                return [decode_usage(item) for item in response.get('Items', [])]
+
             response = self.table.query(
                 KeyConditionExpression='userId = :userId AND usageDate#engineType BETWEEN :start AND :end',
                 ExpressionAttributeValues={
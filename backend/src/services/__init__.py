@@ -8,6 +8,9 @@ from .usage_service import UsageService
 from .websocket_service import WebSocketService
 from .engine_prompt_service import EnginePromptService
 from .simple_usage_service import SimpleUsageService
+from .capacity_scheduler import CapacityScheduler, CapacityExceededError
+from .idempotency_service import IdempotencyService
+from .conversation_summary_service import ConversationSummaryService
 
 __all__ = [
     'ConversationService',
@@ -15,5 +18,9 @@ __all__ = [
     'UsageService',
     'WebSocketService',
     'EnginePromptService',
-    'SimpleUsageService'
+    'SimpleUsageService',
+    'CapacityScheduler',
+    'CapacityExceededError',
+    'IdempotencyService',
+    'ConversationSummaryService'
 ]
\ No newline at end of file
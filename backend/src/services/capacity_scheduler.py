@@ -0,0 +1,392 @@
+"""
+Capacity Scheduler
+Bedrock 용량(TPM, 동시 생성 수)을 플랜 우선순위에 따라 배분하는 입장 제어 서비스
+
+여러 Lambda 컨테이너가 DynamoDB의 공유 아이템을 갱신하여
+모델별 진행 중 생성 수와 분당 예상 토큰 사용량을 추적합니다.
+- premium: 전체 용량 사용 가능, 가장 먼저 입장
+- basic/free: 여유 용량이 부족하면 대기열(queued 프레임)로 보내거나 즉시 거절
+
+진행 중 생성과 대기자는 숫자 카운터가 아니라 만료 시각이 있는 리스(ticketId -> 만료 epoch)로 기록합니다.
+Lambda가 release 전에 종료되어도 리스가 만료되면 더 이상 세지 않으며, 입장 시 만료 리스를 정리합니다.
+"""
+import logging
+import math
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+from ..config.business import CAPACITY_SCHEDULER_CONFIG, USAGE_LIMITS
+
+logger = logging.getLogger(__name__)
+
+# 플랜 우선순위 (USAGE_LIMITS 정의 순서: free < basic < premium)
+PLAN_PRIORITY = {plan: index for index, plan in enumerate(USAGE_LIMITS)}
+
+# 리스 추가 시 동시 갱신 충돌(revision 불일치) 재시도 횟수
+_LEASE_CONFLICT_RETRIES = 3
+
+
+class CapacityExceededError(Exception):
+    """용량 부족으로 요청이 거절(shed)된 경우"""
+
+    def __init__(self, message: str, retry_after: int = 0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class CapacityTicket:
+    """입장 허가 정보 - release() 시 리스 반환/토큰 카운터 보정에 사용"""
+    model_id: str
+    plan: str
+    estimated_tokens: int
+    window: str
+    tracked: bool = True
+    queued_seconds: float = 0.0
+    ticket_id: str = ''
+
+
+class CapacityScheduler:
+    """
+    플랜 우선순위 기반 Bedrock 용량 스케줄러
+
+    Note: 스케줄러가 비활성화되었거나 카운터 테이블 오류가 발생하면
+    요청을 막지 않고 추적 없이 통과시킵니다 (fail-open).
+    """
+
+    def __init__(self, table=None, config: Optional[Dict[str, Any]] = None):
+        """
+        의존성 주입을 통한 초기화
+
+        Args:
+            table: 카운터 테이블 (테스트 시 Mock 가능)
+            config: 스케줄러 설정 (기본값: CAPACITY_SCHEDULER_CONFIG)
+        """
+        self.config = config or CAPACITY_SCHEDULER_CONFIG
+        self.table = table
+        self._prepared_models = set()
+
+        if self.table is None and self.config['enabled']:
+            from ..config.database import get_table_name
+            from ..repositories.aws_clients import get_resource
+
+            table_name = get_table_name('capacity')
+            if table_name:
+                region = os.environ.get('AWS_REGION', 'us-east-1')
+                dynamodb = get_resource('dynamodb', region)
+                self.table = dynamodb.Table(table_name)
+            else:
+                logger.warning("CAPACITY_TABLE is not set, capacity scheduler disabled")
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.config['enabled'] and self.table is not None)
+
+    def acquire(
+        self,
+        model_id: str,
+        plan: Optional[str],
+        estimated_tokens: int,
+        on_queued: Optional[Callable[[int], None]] = None
+    ) -> CapacityTicket:
+        """
+        생성 슬롯 획득 (필요 시 대기)
+
+        Args:
+            model_id: Bedrock 모델 ID
+            plan: 서버에서 확인한 사용자 플랜 (free, basic, premium - 확인 불가면 default_plan 우선순위)
+            estimated_tokens: 예상 토큰 수 (입력 + 출력 한도)
+            on_queued: 대기열 진입/위치 갱신 시 호출되는 콜백 (position)
+
+        Returns:
+            CapacityTicket
+
+        Raises:
+            CapacityExceededError: 여유 용량이 없어 요청을 거절한 경우
+        """
+        plan = plan if plan in PLAN_PRIORITY else self.config.get('default_plan', 'free')
+
+        if not self.enabled:
+            return CapacityTicket(model_id, plan, estimated_tokens, '', tracked=False)
+
+        started = time.monotonic()
+        ticket_id = uuid.uuid4().hex
+        queued = False
+        max_wait = self.config['max_queue_wait']
+        shed_threshold = self.config['tier_shed_threshold'].get(plan, 1.0)
+
+        try:
+            while True:
+                admitted, utilization, window = self._try_admit(model_id, plan, estimated_tokens, ticket_id)
+                if admitted:
+                    ticket = CapacityTicket(
+                        model_id, plan, estimated_tokens, window,
+                        queued_seconds=time.monotonic() - started,
+                        ticket_id=ticket_id
+                    )
+                    logger.info(
+                        f"Capacity admitted: plan={plan}, tokens={estimated_tokens}, "
+                        f"queued={ticket.queued_seconds:.1f}s"
+                    )
+                    return ticket
+
+                # 사용률이 임계값 이상이면 대기하지 않고 즉시 거절
+                if utilization >= shed_threshold:
+                    raise CapacityExceededError(
+                        '현재 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.',
+                        retry_after=60 - datetime.now(timezone.utc).second
+                    )
+
+                if time.monotonic() - started >= max_wait:
+                    raise CapacityExceededError(
+                        '대기 시간이 초과되었습니다. 잠시 후 다시 시도해주세요.',
+                        retry_after=int(self.config['queue_poll_interval'] * 5)
+                    )
+
+                # 대기 리스 등록/갱신 (폴링마다 만료 시각 연장)
+                position = self._update_waiting(model_id, plan, ticket_id, waiting=True)
+                queued = True
+                if on_queued:
+                    on_queued(position)
+
+                time.sleep(self.config['queue_poll_interval'])
+
+        except ClientError as e:
+            logger.error(f"Capacity counter error, admitting untracked: {e}")
+            return CapacityTicket(model_id, plan, estimated_tokens, '', tracked=False)
+
+        finally:
+            if queued:
+                self._safe_update_waiting(model_id, plan, ticket_id, waiting=False)
+
+    def release(self, ticket: CapacityTicket, actual_tokens: Optional[int] = None) -> None:
+        """
+        생성 슬롯 반환 및 토큰 사용량 보정
+
+        Args:
+            ticket: acquire()가 반환한 티켓
+            actual_tokens: 실제 사용 토큰 수 (예상치와의 차이를 분당 카운터에 반영)
+        """
+        if not ticket.tracked:
+            return
+
+        try:
+            self.table.update_item(
+                Key={'counterId': self._in_flight_key(ticket.model_id)},
+                UpdateExpression='REMOVE #leases.#ticket',
+                ExpressionAttributeNames={'#leases': 'leases', '#ticket': ticket.ticket_id}
+            )
+
+            if actual_tokens is not None and actual_tokens != ticket.estimated_tokens:
+                self.table.update_item(
+                    Key={'counterId': self._window_key(ticket.model_id, ticket.window)},
+                    UpdateExpression='ADD tokens :delta',
+                    ExpressionAttributeValues={
+                        ':delta': Decimal(str(actual_tokens - ticket.estimated_tokens))
+                    }
+                )
+
+        except ClientError as e:
+            logger.error(f"Error releasing capacity: {e}")
+
+    def _try_admit(self, model_id: str, plan: str, estimated_tokens: int, ticket_id: str):
+        """
+        분당 토큰 카운터를 조건부로 증가하고 진행 중 리스 추가
+
+        Returns:
+            (입장 여부, 현재 사용률, 분 단위 윈도우)
+        """
+        headroom = self.config['tier_headroom'].get(plan, 1.0)
+        token_limit = self.config['tokens_per_minute'] * headroom
+        in_flight_limit = max(1, int(self.config['max_in_flight'] * headroom))
+        window = datetime.now(timezone.utc).strftime('%Y%m%d%H%M')
+
+        # 1. 분당 토큰 예약
+        try:
+            self.table.update_item(
+                Key={'counterId': self._window_key(model_id, window)},
+                UpdateExpression='ADD tokens :tokens SET #ttl = :ttl',
+                ConditionExpression='attribute_not_exists(tokens) OR tokens <= :limit',
+                ExpressionAttributeNames={'#ttl': 'ttl'},
+                ExpressionAttributeValues={
+                    ':tokens': Decimal(str(estimated_tokens)),
+                    ':limit': Decimal(str(max(0, int(token_limit) - estimated_tokens))),
+                    ':ttl': int(time.time()) + self.config['counter_ttl']
+                },
+                ReturnValuesOnConditionCheckFailure='ALL_OLD'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            tokens = float(e.response.get('Item', {}).get('tokens', {}).get('N', 0))
+            return False, tokens / self.config['tokens_per_minute'], window
+
+        # 2. 동시 생성 리스 추가 (상위 플랜 대기자가 있으면 양보)
+        try:
+            admitted, in_flight = self._add_lease(model_id, plan, ticket_id, in_flight_limit)
+        except ClientError:
+            self._rollback_tokens(model_id, window, estimated_tokens)
+            raise
+
+        if admitted:
+            return True, 0.0, window
+
+        self._rollback_tokens(model_id, window, estimated_tokens)
+        return False, in_flight / self.config['max_in_flight'], window
+
+    def _add_lease(self, model_id: str, plan: str, ticket_id: str, in_flight_limit: int) -> Tuple[bool, int]:
+        """
+        만료되지 않은 리스 수가 한도 미만이면 리스 추가 (만료 리스/대기자는 같은 갱신에서 정리)
+
+        읽은 시점의 revision을 조건으로 갱신하므로 동시에 입장한 요청이 한도를 넘기지 않습니다.
+
+        Returns:
+            (입장 여부, 현재 진행 중 생성 수)
+        """
+        self._prepare_item(model_id)
+        key = {'counterId': self._in_flight_key(model_id)}
+        in_flight = 0
+
+        for _ in range(_LEASE_CONFLICT_RETRIES):
+            item = self.table.get_item(Key=key, ConsistentRead=True).get('Item') or {}
+            now = time.time()
+            leases, expired_leases = self._split_leases(item.get('leases'), now)
+            in_flight = len(leases)
+
+            higher_waiting = any(
+                self._split_leases(item.get(f'waiters_{p}'), now)[0]
+                for p, rank in PLAN_PRIORITY.items() if rank > PLAN_PRIORITY[plan]
+            )
+            if in_flight >= in_flight_limit or higher_waiting:
+                return False, in_flight
+
+            names = {'#leases': 'leases', '#ticket': ticket_id}
+            values = {':expiry': Decimal(math.ceil(now + self.config['lease_ttl'])), ':one': Decimal('1')}
+            removals = []
+            for index, lease_id in enumerate(expired_leases):
+                names[f'#l{index}'] = lease_id
+                removals.append(f'#leases.#l{index}')
+            for p in PLAN_PRIORITY:
+                expired_waiters = self._split_leases(item.get(f'waiters_{p}'), now)[1]
+                if expired_waiters:
+                    names[f'#w_{p}'] = f'waiters_{p}'
+                for index, waiter_id in enumerate(expired_waiters):
+                    names[f'#w_{p}{index}'] = waiter_id
+                    removals.append(f'#w_{p}.#w_{p}{index}')
+
+            update = 'SET #leases.#ticket = :expiry ADD revision :one'
+            if removals:
+                update += ' REMOVE ' + ', '.join(removals)
+            if 'revision' in item:
+                condition = 'revision = :revision'
+                values[':revision'] = item['revision']
+            else:
+                condition = 'attribute_not_exists(revision)'
+
+            try:
+                self.table.update_item(
+                    Key=key,
+                    UpdateExpression=update,
+                    ConditionExpression=condition,
+                    ExpressionAttributeNames=names,
+                    ExpressionAttributeValues=values
+                )
+                if expired_leases:
+                    logger.warning(f"Pruned {len(expired_leases)} expired capacity leases for {model_id}")
+                return True, in_flight + 1
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+                # 다른 요청이 먼저 갱신 - 다시 읽고 재시도
+
+        return False, in_flight
+
+    def _rollback_tokens(self, model_id: str, window: str, estimated_tokens: int) -> None:
+        """입장 실패 시 분당 토큰 예약 롤백"""
+        self.table.update_item(
+            Key={'counterId': self._window_key(model_id, window)},
+            UpdateExpression='ADD tokens :tokens',
+            ExpressionAttributeValues={':tokens': Decimal(str(-estimated_tokens))}
+        )
+
+    def _prepare_item(self, model_id: str) -> None:
+        """
+        리스/대기자 맵 생성 (컨테이너당 모델별 1회)
+
+        이전 버전의 숫자 카운터(inFlight, waiting_<plan>)는 누수될 수 있으므로 함께 제거합니다.
+        """
+        if model_id in self._prepared_models:
+            return
+
+        names = {'#leases': 'leases'}
+        assignments = ['#leases = if_not_exists(#leases, :empty)']
+        for p in PLAN_PRIORITY:
+            names[f'#w_{p}'] = f'waiters_{p}'
+            assignments.append(f'#w_{p} = if_not_exists(#w_{p}, :empty)')
+        legacy = ['inFlight'] + [f'waiting_{p}' for p in PLAN_PRIORITY]
+
+        self.table.update_item(
+            Key={'counterId': self._in_flight_key(model_id)},
+            UpdateExpression='SET ' + ', '.join(assignments) + ' REMOVE ' + ', '.join(legacy),
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues={':empty': {}}
+        )
+        self._prepared_models.add(model_id)
+
+    def _update_waiting(self, model_id: str, plan: str, ticket_id: str, waiting: bool) -> int:
+        """
+        대기 리스 등록/갱신 또는 제거 후 대기 순번 반환
+
+        순번 = 자신보다 높거나 같은 우선순위 플랜의 만료되지 않은 대기자 수
+        """
+        self._prepare_item(model_id)
+        names = {'#waiting': f'waiters_{plan}', '#ticket': ticket_id}
+        params = {
+            'Key': {'counterId': self._in_flight_key(model_id)},
+            'ExpressionAttributeNames': names,
+            'ReturnValues': 'ALL_NEW'
+        }
+        if waiting:
+            params['UpdateExpression'] = 'SET #waiting.#ticket = :expiry'
+            params['ExpressionAttributeValues'] = {
+                ':expiry': Decimal(math.ceil(time.time() + self.config['waiter_ttl']))
+            }
+        else:
+            params['UpdateExpression'] = 'REMOVE #waiting.#ticket'
+
+        attributes = self.table.update_item(**params).get('Attributes', {})
+        now = time.time()
+        return sum(
+            len(self._split_leases(attributes.get(f'waiters_{p}'), now)[0])
+            for p, rank in PLAN_PRIORITY.items()
+            if rank >= PLAN_PRIORITY[plan]
+        )
+
+    def _safe_update_waiting(self, model_id: str, plan: str, ticket_id: str, waiting: bool) -> None:
+        try:
+            self._update_waiting(model_id, plan, ticket_id, waiting)
+        except ClientError as e:
+            logger.error(f"Error updating waiting lease: {e}")
+
+    @staticmethod
+    def _split_leases(leases: Optional[Dict[str, Any]], now: float) -> Tuple[List[str], List[str]]:
+        """리스 맵을 (유효 리스 ID, 만료 리스 ID)로 분리"""
+        live, expired = [], []
+        for lease_id, expiry in (leases or {}).items():
+            (live if float(expiry) > now else expired).append(lease_id)
+        return live, expired
+
+    @staticmethod
+    def _in_flight_key(model_id: str) -> str:
+        return f"inflight#{model_id}"
+
+    @staticmethod
+    def _window_key(model_id: str, window: str) -> str:
+        return f"tpm#{model_id}#{window}"
@@ -3,10 +3,11 @@
 """
 from typing import List, Optional, Dict, Any
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from ..models import Conversation, Message
 from ..repositories import ConversationRepository
+from ..config.business import DELTA_SYNC_CONFIG
 
 logger = logging.getLogger(__name__)
 
@@ -53,14 +54,34 @@ class ConversationService:
             logger.error(f"Error creating conversation: {str(e)}")
             raise
     
-    def get_conversation(self, conversation_id: str) -> Optional[Conversation]:
-        """대화 조회"""
+    def get_conversation(self, conversation_id: str, full_content: bool = False) -> Optional[Conversation]:
+        """
+        대화 조회
+
+        Args:
+            conversation_id: 대화 ID
+            full_content: S3로 오프로드된 메시지 본문까지 조회 (False면 미리보기 유지)
+
+        Returns:
+            대화 또는 None
+        """
         try:
-            return self.repository.find_by_id(conversation_id)
+            conversation = self.repository.find_by_id(conversation_id)
+            if conversation and full_content:
+                self.repository.hydrate_messages(conversation.messages)
+            return conversation
         except Exception as e:
             logger.error(f"Error getting conversation: {str(e)}")
             raise
     
+    def get_conversation_version(self, conversation_id: str) -> Optional[str]:
+        """대화 버전(updatedAt) 조회 - 메시지를 읽지 않음 (ETag 확인용)"""
+        try:
+            return self.repository.find_version(conversation_id)
+        except Exception as e:
+            logger.error(f"Error getting conversation version: {str(e)}")
+            raise
+    
     def get_user_conversations(
         self,
         user_id: str,
@@ -79,6 +100,168 @@ class ConversationService:
             logger.error(f"Error getting user conversations: {str(e)}")
             raise
     
+    def list_conversations(
+        self,
+        user_id: str,
+        engine_type: Optional[str] = None,
+        page_size: int = 50,
+        cursor: Optional[str] = None,
+        since: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        사용자의 대화 요약 목록 조회 - 최근 활동순 커서 페이지네이션
+
+        Args:
+            user_id: 사용자 ID
+            engine_type: 엔진 타입
+            page_size: 페이지 크기
+            cursor: 이전 페이지의 nextCursor
+            since: 이전 응답의 watermark (지정 시 변경/삭제분만 조회)
+
+        Returns:
+            {'conversations', 'deleted', 'nextCursor', 'watermark', 'reset'}
+            reset=True이면 since가 tombstone 보관 기간보다 오래되어 전체 목록을 반환한 것
+
+        Raises:
+            ValueError: since 또는 커서 형식이 잘못된 경우
+        """
+        try:
+            query_since = None
+            reset = False
+
+            if since:
+                since_at = self._parse_watermark(since)
+                since = since_at.isoformat()
+                if since_at < datetime.now() - timedelta(seconds=DELTA_SYNC_CONFIG['tombstone_ttl']):
+                    reset = True
+                else:
+                    # 겹침 구간만큼 이전부터 조회 (중복은 클라이언트가 ID 기준으로 병합)
+                    query_since = (since_at - timedelta(seconds=DELTA_SYNC_CONFIG['overlap_seconds'])).isoformat()
+
+            page = self.repository.list_summaries(user_id, engine_type, page_size, cursor, since=query_since)
+
+            # 새 워터마크 = 이번 페이지의 가장 최근 updatedAt (최근 활동순이므로 첫 페이지에 포함)
+            stamps = [item.get('updatedAt') or '' for item in page['conversations']]
+            page['watermark'] = max(stamps + [since or '']) or None
+            page['reset'] = reset
+            return page
+
+        except Exception as e:
+            logger.error(f"Error listing conversations: {str(e)}")
+            raise
+
+    def get_conversation_delta(
+        self,
+        conversation_id: str,
+        since: Optional[str] = None,
+        after_seq: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        대화 변경분 조회
+
+        Args:
+            conversation_id: 대화 ID
+            since: 이전 응답의 watermark (이후 변경이 없으면 메시지 없이 changed=False)
+            after_seq: 이 순번 이후에 추가된 메시지만 반환
+
+        Returns:
+            변경분 딕셔너리 (대화가 없으면 None)
+        """
+        try:
+            conversation = self.repository.find_by_id(conversation_id)
+            if not conversation:
+                return None
+
+            seq_base = self.message_seq_base(conversation)
+            last_seq = seq_base + len(conversation.messages) - 1
+            delta = {
+                'conversationId': conversation.conversation_id,
+                'title': conversation.title,
+                'engineType': conversation.engine_type,
+                'updatedAt': conversation.updated_at,
+                'watermark': conversation.updated_at,
+                'lastSeq': last_seq
+            }
+
+            if since and (conversation.updated_at or '') <= self._parse_watermark(since).isoformat():
+                return {**delta, 'changed': False, 'messages': []}
+
+            start = 0 if after_seq is None else max(0, after_seq + 1 - seq_base)
+            messages = conversation.to_dict(fields=('messages',))['messages']
+            if any('contentRef' in message for message in messages[start:]):
+                # 오프로드 본문이 포함된 경우에만 메시지를 변환해 전체 본문 조회
+                tail = self.repository.hydrate_messages(conversation.messages[start:])
+                messages = messages[:start] + [message.to_dict() for message in tail]
+            delta['messages'] = [
+                {**message, 'seq': seq_base + index}
+                for index, message in enumerate(messages[start:], start=start)
+            ]
+            # 요청한 순번이 이미 정리(trim)된 경우 클라이언트는 전체를 다시 받아야 함
+            delta['reset'] = after_seq is not None and after_seq + 1 < seq_base
+            delta['changed'] = True
+            return delta
+
+        except Exception as e:
+            logger.error(f"Error getting conversation delta: {str(e)}")
+            raise
+
+    def get_conversation_page(
+        self,
+        conversation_id: str,
+        limit: int,
+        before: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        대화 상세 조회 - 최신 메시지 limit개와 이전 메시지 커서
+
+        Args:
+            conversation_id: 대화 ID
+            limit: 메시지 수
+            before: 이전 응답의 olderCursor (이 순번 이전 메시지 조회)
+
+        Returns:
+            대화 정보 + messages(seq 포함) + olderCursor (대화가 없으면 None)
+        """
+        try:
+            page = self.repository.find_messages_page(conversation_id, limit, before)
+            if not page:
+                return None
+
+            conversation = page['conversation']
+            first_seq = page['first_seq']
+            self.repository.hydrate_messages(conversation.messages)
+            result = conversation.to_dict()
+            result['messages'] = [
+                {**message, 'seq': first_seq + index}
+                for index, message in enumerate(result['messages'])
+            ]
+            result['lastSeq'] = page['seq_base'] + page['message_count'] - 1
+            result['watermark'] = conversation.updated_at
+            # 더 오래된 메시지가 남아 있으면 첫 메시지 순번을 커서로 반환
+            result['olderCursor'] = str(first_seq) if result['messages'] and first_seq > page['seq_base'] else None
+            return result
+
+        except Exception as e:
+            logger.error(f"Error getting conversation page: {str(e)}")
+            raise
+
+    @staticmethod
+    def message_seq_base(conversation: Conversation) -> int:
+        """첫 번째 메시지의 순번 (오래된 메시지가 정리된 수)"""
+        return int((conversation.metadata or {}).get('messageSeqBase', 0))
+
+    @staticmethod
+    def _parse_watermark(watermark: str) -> datetime:
+        """워터마크 문자열을 저장 형식(naive ISO)과 비교 가능한 datetime으로 변환"""
+        try:
+            parsed = datetime.fromisoformat(watermark.replace('Z', '+00:00'))
+        except ValueError as e:
+            raise ValueError(f"Invalid since watermark: {watermark}") from e
+
+        if parsed.tzinfo:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
+    
     def add_message(
         self,
         conversation_id: str,
@@ -114,13 +297,9 @@ class ConversationService:
     def update_title(self, conversation_id: str, title: str) -> bool:
         """대화 제목 업데이트"""
         try:
-            logger.info(f"ConversationService.update_title called: {conversation_id} -> {title}")
-            result = self.repository.update_title(conversation_id, title)
-            logger.info(f"Repository update_title returned: {result}")
-            return result
+            return self.repository.update_title(conversation_id, title)
         except Exception as e:
-            logger.error(f"Error in ConversationService.update_title: {str(e)}")
-            logger.error(f"Exception details: {type(e).__name__}: {str(e)}")
+            logger.error("Error in ConversationService.update_title: %s: %s", type(e).__name__, e)
             raise
     
     def delete_conversation(self, conversation_id: str) -> bool:
@@ -135,11 +314,12 @@ class ConversationService:
         self,
         user_id: str,
         engine_type: Optional[str] = None,
-        days: int = 30
+        days: int = 30,
+        limit: Optional[int] = None
     ) -> List[Conversation]:
-        """최근 대화 조회"""
+        """최근 대화 조회 (최근 활동순, 최대 limit개)"""
         try:
-            return self.repository.find_recent(user_id, engine_type, days)
+            return self.repository.find_recent(user_id, engine_type, days, limit)
         except Exception as e:
             logger.error(f"Error getting recent conversations: {str(e)}")
             raise
@@ -0,0 +1,149 @@
+"""
+Conversation Summary Service
+긴 대화의 오래된 턴을 누적 요약(metadata.summary)으로 압축하는 서비스
+
+- 요약되지 않은 히스토리가 trigger_tokens를 넘거나 Bedrock 컨텍스트 메시지 수
+  (max_bedrock_context_messages)를 넘으면 최근 keep_recent_messages개를 제외한
+  오래된 턴을 기존 요약과 합쳐 저비용 모델로 다시 요약합니다.
+  (컨텍스트 창 밖으로 밀려난 턴이 요약에도 없는 구간이 생기지 않음)
+- 프롬프트 컨텍스트는 "요약 + 요약 이후 최근 턴"으로 구성되어 대화가 길어져도
+  턴당 입력 토큰이 거의 일정하게 유지됩니다.
+- 응답 완료(chat_end) 이후에 실행되며, 실패해도 대화 처리에는 영향이 없습니다.
+
+metadata.summary 포맷:
+    {'text': 요약, 'throughSeq': 요약에 포함된 마지막 메시지 순번, 'updatedAt': ISO 시각, 'model': 모델 ID}
+"""
+import logging
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from ..config.aws import BEDROCK_CONFIG
+from ..config.business import CONVERSATION_SUMMARY_CONFIG, CONVERSATION_LIMITS
+from ..models import Conversation, Message
+from ..repositories import ConversationRepository
+from .simple_usage_service import SimpleUsageService
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_SYSTEM_PROMPT = """당신은 서울경제신문 기사 작성 도우미의 대화 기록을 정리하는 요약기입니다.
+이전 요약과 새 대화 턴을 합쳐 하나의 누적 요약을 작성하세요.
+- 사용자가 요청한 기사 주제, 작성 조건(분량, 문체, 형식), 수정 요청과 결정 사항을 빠짐없이 유지
+- AI가 작성한 초안은 제목과 핵심 내용, 사용한 수치/고유명사 위주로 압축
+- 이후 대화를 이어가는 데 필요 없는 인사말이나 반복 내용은 제외
+- 요약문만 출력 (머리말, 설명 없이)"""
+
+
+class ConversationSummaryService:
+    """대화 누적 요약 서비스"""
+
+    def __init__(self, conversation_repository: ConversationRepository = None, bedrock_client=None):
+        """
+        Args:
+            conversation_repository: 대화 저장소
+            bedrock_client: complete()를 제공하는 Bedrock 클라이언트 (없으면 요약하지 않음)
+        """
+        self.conversation_repo = conversation_repository or ConversationRepository()
+        self.bedrock_client = bedrock_client
+        self.model_id = BEDROCK_CONFIG['summary_model_id']
+
+    @staticmethod
+    def split_history(conversation: Conversation) -> Tuple[Optional[str], List[Message]]:
+        """
+        대화를 (요약 텍스트, 요약 이후 메시지)로 분리
+
+        Args:
+            conversation: 대화
+
+        Returns:
+            (요약 텍스트 또는 None, 요약에 포함되지 않은 메시지 목록)
+        """
+        metadata = conversation.metadata or {}
+        summary = metadata.get('summary') or {}
+        if not summary.get('text'):
+            return None, conversation.messages
+
+        seq_base = int(metadata.get('messageSeqBase', 0))
+        skip = max(0, int(summary['throughSeq']) + 1 - seq_base)
+        return summary['text'], conversation.messages[skip:]
+
+    def summarize_if_needed(self, conversation_id: str) -> bool:
+        """
+        요약되지 않은 히스토리가 토큰/메시지 수 임계값을 넘으면 오래된 턴을 요약에 합침
+
+        Args:
+            conversation_id: 대화 ID
+
+        Returns:
+            요약 갱신 여부
+        """
+        if not CONVERSATION_SUMMARY_CONFIG['enabled'] or self.bedrock_client is None:
+            return False
+
+        try:
+            conversation = self.conversation_repo.find_by_id(conversation_id)
+            if not conversation:
+                return False
+
+            summary_text, pending = self.split_history(conversation)
+            keep_recent = CONVERSATION_SUMMARY_CONFIG['keep_recent_messages']
+            candidates = pending[:-keep_recent] if keep_recent else pending
+            if not candidates:
+                return False
+
+            pending_tokens = sum(SimpleUsageService.estimate_tokens(msg.content) for msg in pending if msg.content)
+            if (pending_tokens < CONVERSATION_SUMMARY_CONFIG['trigger_tokens']
+                    and len(pending) <= CONVERSATION_LIMITS['max_bedrock_context_messages']):
+                return False
+
+            # 오프로드된 본문은 요약에 포함할 메시지만 조회
+            self.conversation_repo.hydrate_messages(candidates)
+
+            started = datetime.now()
+            text = self.bedrock_client.complete(
+                user_message=self._build_request(summary_text, candidates),
+                system_prompt=SUMMARY_SYSTEM_PROMPT,
+                model_id=self.model_id,
+                max_tokens=CONVERSATION_SUMMARY_CONFIG['max_summary_tokens']
+            ).strip()
+            if not text:
+                logger.warning(f"Empty summary for conversation {conversation_id}")
+                return False
+
+            seq_base = int((conversation.metadata or {}).get('messageSeqBase', 0))
+            through_seq = seq_base + len(conversation.messages) - len(pending) + len(candidates) - 1
+            summary = {
+                'text': text,
+                'throughSeq': through_seq,
+                'updatedAt': datetime.now().isoformat(),
+                'model': self.model_id
+            }
+            updated = self.conversation_repo.update_summary(conversation_id, summary)
+
+            logger.info(
+                f"Conversation {conversation_id} summarized: {len(candidates)} messages, "
+                f"~{pending_tokens} pending tokens -> ~{SimpleUsageService.estimate_tokens(text)} summary tokens "
+                f"({(datetime.now() - started).total_seconds():.2f}s)"
+            )
+            return updated
+
+        except Exception as e:
+            logger.error(f"Error summarizing conversation {conversation_id}: {str(e)}")
+            return False
+
+    @staticmethod
+    def _build_request(summary_text: Optional[str], messages: List[Message]) -> str:
+        """요약 요청 본문 - 기존 요약 + 새로 요약할 턴"""
+        limit = CONVERSATION_SUMMARY_CONFIG['message_chars']
+        turns = []
+        for msg in messages:
+            content = msg.content or ''
+            if len(content) > limit:
+                content = content[:limit] + ' …(이하 생략)'
+            speaker = '사용자' if msg.role == 'user' else 'AI'
+            turns.append(f"{speaker}: {content}")
+
+        parts = []
+        if summary_text:
+            parts.append(f"=== 이전 요약 ===\n{summary_text}")
+        parts.append("=== 새 대화 턴 ===\n" + "\n\n".join(turns))
+        return "\n\n".join(parts)
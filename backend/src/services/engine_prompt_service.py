@@ -7,11 +7,14 @@ import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import uuid
-import boto3
 from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
 
 import os
 
+from ..config.business import KNOWLEDGE_BASE_CONFIG
+from .knowledge_base_normalizer import NormalizationResult, normalize_document
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,10 +29,10 @@ class EnginePromptService:
     def __init__(self):
         """서비스 초기화"""
         from src.config.database import get_table_name
-        import boto3
+        from ..repositories.aws_clients import get_resource
 
         region = os.environ.get('AWS_REGION', 'us-east-1')
-        dynamodb = boto3.resource('dynamodb', region_name=region)
+        dynamodb = get_resource('dynamodb', region)
 
         self.prompts_table = dynamodb.Table(get_table_name('prompts'))
         self.files_table = dynamodb.Table(get_table_name('files'))
@@ -62,6 +65,51 @@ class EnginePromptService:
             logger.error(f"Error getting prompt with files for {engine_type}: {e}")
             raise
 
+    def get_bundle_version(self, engine_type: str) -> str:
+        """
+        프롬프트+파일 번들 버전 조회 (ETag용, 파일 내용은 읽지 않음)
+
+        파일 변경 시 프롬프트 아이템의 contentVersion이 증가하므로
+        프롬프트 아이템 하나만 읽으면 됩니다. contentVersion이 없는 기존 아이템은
+        파일 목록의 ID/시각만 projection하여 버전을 계산합니다.
+
+        Args:
+            engine_type: 엔진 타입
+
+        Returns:
+            버전 문자열
+        """
+        response = self.prompts_table.get_item(
+            Key={'promptId': engine_type},
+            ProjectionExpression='updatedAt, contentVersion'
+        )
+        prompt = response.get('Item', {})
+
+        if 'contentVersion' in prompt:
+            return f"{prompt.get('updatedAt', '')}#{prompt['contentVersion']}"
+
+        files = self.files_table.query(
+            KeyConditionExpression=Key('promptId').eq(engine_type),
+            ProjectionExpression='fileId, createdAt, updatedAt'
+        ).get('Items', [])
+        file_versions = sorted(
+            f"{f['fileId']}@{f.get('updatedAt') or f.get('createdAt', '')}" for f in files
+        )
+        return '|'.join([prompt.get('updatedAt', '')] + file_versions)
+
+    def _bump_content_version(self, engine_type: str) -> None:
+        """파일 변경 시 번들 버전 증가 (프롬프트 아이템이 없으면 생략)"""
+        try:
+            self.prompts_table.update_item(
+                Key={'promptId': engine_type},
+                UpdateExpression='ADD contentVersion :one',
+                ConditionExpression='attribute_exists(promptId)',
+                ExpressionAttributeValues={':one': 1}
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                logger.error(f"Error bumping content version for {engine_type}: {e}")
+
     def get_prompt(self, engine_type: str) -> Optional[Dict[str, Any]]:
         """
         엔진 타입별 프롬프트 조회
@@ -253,7 +301,7 @@ class EnginePromptService:
             file_content: 파일 내용
 
         Returns:
-            생성된 파일 정보
+            생성된 파일 정보 (정규화 시 compactContent와 절감 리포트 normalization 포함)
         """
         try:
             file_id = str(uuid.uuid4())
@@ -266,10 +314,16 @@ class EnginePromptService:
                 'fileContent': file_content,
                 'createdAt': timestamp
             }
+            normalization = self._normalize(file_name, file_content)
+            if normalization:
+                item.update(self._compact_attributes(normalization))
 
             self.files_table.put_item(Item=item)
+            self._bump_content_version(engine_type)
 
             logger.info(f"File added: {file_name} for {engine_type}")
+            if normalization:
+                return {**item, 'normalization': normalization.to_report()}
             return item
 
         except Exception as e:
@@ -297,6 +351,7 @@ class EnginePromptService:
         """
         try:
             update_expr = []
+            remove_expr = []
             expr_attr_values = {}
 
             if file_name is not None:
@@ -307,6 +362,15 @@ class EnginePromptService:
                 update_expr.append('fileContent = :content')
                 expr_attr_values[':content'] = file_content
 
+                # 정리본도 함께 갱신 (정규화를 끈 경우 이전 정리본 제거)
+                normalization = self._normalize(file_name or file_id, file_content)
+                if normalization:
+                    for index, (name, value) in enumerate(self._compact_attributes(normalization).items()):
+                        update_expr.append(f'{name} = :compact{index}')
+                        expr_attr_values[f':compact{index}'] = value
+                else:
+                    remove_expr = ['compactContent', 'originalTokens', 'compactTokens']
+
             if not update_expr:
                 logger.warning("No fields to update")
                 return False
@@ -316,9 +380,12 @@ class EnginePromptService:
 
             self.files_table.update_item(
                 Key={'promptId': engine_type, 'fileId': file_id},
-                UpdateExpression='SET ' + ', '.join(update_expr),
+                UpdateExpression='SET ' + ', '.join(update_expr) + (
+                    ' REMOVE ' + ', '.join(remove_expr) if remove_expr else ''
+                ),
                 ExpressionAttributeValues=expr_attr_values
             )
+            self._bump_content_version(engine_type)
 
             logger.info(f"File updated: {file_id} for {engine_type}")
             return True
@@ -327,6 +394,59 @@ class EnginePromptService:
             logger.error(f"Error updating file {file_id} for {engine_type}: {e}")
             raise
 
+    def normalize_files(self, engine_type: str) -> List[Dict[str, Any]]:
+        """
+        저장된 파일의 정리본(compactContent) 재생성 - 정규화 도입 전 파일/규칙 변경 시 백필용
+
+        Args:
+            engine_type: 엔진 타입
+
+        Returns:
+            파일별 절감 리포트 목록 (fileId, fileName 포함)
+        """
+        reports = []
+        for file in self.get_files(engine_type):
+            normalization = self._normalize(file.get('fileName', ''), file.get('fileContent', ''))
+            if not normalization:
+                continue
+
+            attributes = self._compact_attributes(normalization)
+            self.files_table.update_item(
+                Key={'promptId': engine_type, 'fileId': file['fileId']},
+                UpdateExpression='SET ' + ', '.join(f'{name} = :{name}' for name in attributes),
+                ExpressionAttributeValues={f':{name}': value for name, value in attributes.items()}
+            )
+            reports.append({'fileId': file['fileId'], 'fileName': file.get('fileName'), **normalization.to_report()})
+
+        if reports:
+            self._bump_content_version(engine_type)
+        return reports
+
+    def _normalize(self, file_name: str, file_content: str) -> Optional[NormalizationResult]:
+        """업로드 파일 정규화 (비활성화 시 None, 실패 시 원문 사용)"""
+        if not KNOWLEDGE_BASE_CONFIG['normalize_enabled']:
+            return None
+        try:
+            normalization = normalize_document(file_content)
+        except Exception as e:
+            logger.error(f"Error normalizing file {file_name}: {e}")
+            return None
+
+        logger.info(
+            f"File normalized: {file_name} {normalization.original_tokens} -> {normalization.compact_tokens} tokens "
+            f"(-{normalization.saved_ratio:.1%}, removed={normalization.removed})"
+        )
+        return normalization
+
+    @staticmethod
+    def _compact_attributes(normalization: NormalizationResult) -> Dict[str, Any]:
+        """정리본 저장 속성"""
+        return {
+            'compactContent': normalization.content,
+            'originalTokens': normalization.original_tokens,
+            'compactTokens': normalization.compact_tokens
+        }
+
     def delete_file(self, engine_type: str, file_id: str) -> bool:
         """
         파일 삭제
@@ -342,6 +462,7 @@ class EnginePromptService:
             self.files_table.delete_item(
                 Key={'promptId': engine_type, 'fileId': file_id}
             )
+            self._bump_content_version(engine_type)
 
             logger.info(f"File deleted: {file_id} for {engine_type}")
             return True
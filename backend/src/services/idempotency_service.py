@@ -0,0 +1,251 @@
+"""
+Idempotency Service
+클라이언트 requestId 기반 sendMessage 중복 처리 방지 서비스
+
+재시도된 요청은 새 Bedrock 생성을 시작하지 않고
+- 완료된 요청: 저장된 응답을 재생
+- 진행 중인 요청: 구독자(connectionId)로 등록되어 진행 중 스트림에 합류
+- 임대가 만료된 요청 (Lambda 비정상 종료 등): 생성을 이어받아 다시 실행
+"""
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Set
+
+from botocore.exceptions import ClientError
+
+from ..config.business import IDEMPOTENCY_CONFIG
+
+logger = logging.getLogger(__name__)
+
+STATUS_IN_PROGRESS = 'in_progress'
+STATUS_COMPLETED = 'completed'
+STATUS_FAILED = 'failed'
+
+
+class IdempotencyService:
+    """
+    sendMessage 멱등성 레코드 관리 서비스
+
+    Note: IDEMPOTENCY_TABLE이 설정되지 않으면 비활성화되며,
+    모든 요청은 새 요청으로 처리됩니다.
+    """
+
+    def __init__(self, table=None):
+        """
+        의존성 주입을 통한 초기화
+
+        Args:
+            table: 멱등성 테이블 (테스트 시 Mock 가능)
+        """
+        self.table = table
+
+        if self.table is None:
+            from ..config.database import get_table_name
+            from ..repositories.aws_clients import get_resource
+
+            table_name = get_table_name('idempotency')
+            if table_name:
+                region = os.environ.get('AWS_REGION', 'us-east-1')
+                dynamodb = get_resource('dynamodb', region)
+                self.table = dynamodb.Table(table_name)
+
+    @property
+    def enabled(self) -> bool:
+        return self.table is not None
+
+    def begin(self, request_id: str, connection_id: str, user_id: str) -> Dict[str, Any]:
+        """
+        요청 시작 기록 (조건부 저장)
+
+        Args:
+            request_id: 클라이언트 요청 ID
+            connection_id: 요청한 WebSocket 연결 ID
+            user_id: 사용자 ID
+
+        Returns:
+            {'status': 'started' | 'takeover' | 'in_progress' | 'completed', 'record': 기존 레코드}
+        """
+        now = int(time.time())
+        item = {
+            'requestId': request_id,
+            'status': STATUS_IN_PROGRESS,
+            'userId': user_id,
+            'connectionId': connection_id,
+            'leaseExpiresAt': now + IDEMPOTENCY_CONFIG['lease_seconds'],
+            'startedAt': datetime.utcnow().isoformat() + 'Z',
+            'ttl': now + IDEMPOTENCY_CONFIG['record_ttl']
+        }
+
+        try:
+            self.table.put_item(
+                Item=item,
+                ConditionExpression='attribute_not_exists(requestId)'
+            )
+            return {'status': 'started', 'record': None}
+
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+
+        existing = self.get(request_id) or {}
+
+        if existing.get('userId') not in (None, user_id):
+            raise PermissionError(f"Request {request_id} belongs to another user")
+
+        status = existing.get('status')
+        lease_expired = int(existing.get('leaseExpiresAt', 0)) < now
+        if status == STATUS_FAILED or (status == STATUS_IN_PROGRESS and lease_expired):
+            # 이전 생성이 실패/중단됨 - 조건부로 이어받기
+            try:
+                self.table.put_item(
+                    Item={**item, **self._carried_over(existing)},
+                    ConditionExpression='#status = :status AND leaseExpiresAt = :lease',
+                    ExpressionAttributeNames={'#status': 'status'},
+                    ExpressionAttributeValues={
+                        ':status': status,
+                        ':lease': existing.get('leaseExpiresAt', 0)
+                    }
+                )
+                logger.info(f"Request {request_id} taken over from stale {status} record")
+                return {'status': 'takeover', 'record': existing}
+
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+                existing = self.get(request_id) or existing
+                status = existing.get('status')
+
+        return {'status': status, 'record': existing}
+
+    def get(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """멱등성 레코드 조회 (강한 일관성)"""
+        response = self.table.get_item(
+            Key={'requestId': request_id},
+            ConsistentRead=True
+        )
+        return response.get('Item')
+
+    def mark_user_message_saved(self, request_id: str, conversation_id: str) -> None:
+        """사용자 메시지 저장 완료 기록 (이어받기 시 중복 저장 방지)"""
+        try:
+            self.table.update_item(
+                Key={'requestId': request_id},
+                UpdateExpression='SET userMessageSaved = :true, conversationId = :conversation_id',
+                ExpressionAttributeValues={
+                    ':true': True,
+                    ':conversation_id': conversation_id
+                }
+            )
+        except ClientError as e:
+            logger.error(f"Error marking user message saved for {request_id}: {e}")
+
+    def subscribe(self, request_id: str, connection_id: str) -> bool:
+        """
+        진행 중인 스트림에 연결 합류
+
+        Args:
+            request_id: 요청 ID
+            connection_id: 합류할 WebSocket 연결 ID
+
+        Returns:
+            합류 성공 여부 (이미 완료된 경우 False)
+        """
+        try:
+            self.table.update_item(
+                Key={'requestId': request_id},
+                UpdateExpression='ADD subscribers :connection',
+                ConditionExpression='#status = :in_progress',
+                ExpressionAttributeNames={'#status': 'status'},
+                ExpressionAttributeValues={
+                    ':connection': {connection_id},
+                    ':in_progress': STATUS_IN_PROGRESS
+                }
+            )
+            return True
+
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return False
+            raise
+
+    def get_subscribers(self, request_id: str) -> Set[str]:
+        """진행 중 스트림에 합류한 연결 목록 조회"""
+        try:
+            response = self.table.get_item(
+                Key={'requestId': request_id},
+                ProjectionExpression='subscribers'
+            )
+            return set(response.get('Item', {}).get('subscribers', set()))
+
+        except ClientError as e:
+            logger.error(f"Error getting subscribers for {request_id}: {e}")
+            return set()
+
+    def complete(
+        self,
+        request_id: str,
+        conversation_id: str,
+        response_text: str,
+        total_chunks: int
+    ) -> Set[str]:
+        """
+        요청 완료 기록 및 응답 저장
+
+        Args:
+            request_id: 요청 ID
+            conversation_id: 대화 ID
+            response_text: 전체 응답
+            total_chunks: 전송한 청크 수
+
+        Returns:
+            완료 직전까지 합류한 구독자 연결 목록
+        """
+        stored = len(response_text.encode('utf-8')) <= IDEMPOTENCY_CONFIG['max_stored_response_bytes']
+
+        try:
+            result = self.table.update_item(
+                Key={'requestId': request_id},
+                UpdateExpression=(
+                    'SET #status = :completed, conversationId = :conversation_id, '
+                    '#response = :response, responseStored = :stored, '
+                    'totalChunks = :total_chunks, completedAt = :now'
+                ),
+                ExpressionAttributeNames={'#status': 'status', '#response': 'response'},
+                ExpressionAttributeValues={
+                    ':completed': STATUS_COMPLETED,
+                    ':conversation_id': conversation_id,
+                    ':response': response_text if stored else '',
+                    ':stored': stored,
+                    ':total_chunks': total_chunks,
+                    ':now': datetime.utcnow().isoformat() + 'Z'
+                },
+                ReturnValues='ALL_OLD'
+            )
+            return set(result.get('Attributes', {}).get('subscribers', set()))
+
+        except ClientError as e:
+            logger.error(f"Error completing request {request_id}: {e}")
+            return set()
+
+    def fail(self, request_id: str) -> None:
+        """요청 실패 기록 - 재시도 시 다시 생성할 수 있도록 함"""
+        try:
+            self.table.update_item(
+                Key={'requestId': request_id},
+                UpdateExpression='SET #status = :failed, leaseExpiresAt = :zero',
+                ExpressionAttributeNames={'#status': 'status'},
+                ExpressionAttributeValues={':failed': STATUS_FAILED, ':zero': 0}
+            )
+        except ClientError as e:
+            logger.error(f"Error marking request {request_id} failed: {e}")
+
+    @staticmethod
+    def _carried_over(existing: Dict[str, Any]) -> Dict[str, Any]:
+        """이어받기 시 유지할 속성 (대화 ID, 사용자 메시지 저장 여부)"""
+        return {
+            key: existing[key]
+            for key in ('conversationId', 'userMessageSaved')
+            if key in existing
+        }
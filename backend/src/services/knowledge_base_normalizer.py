@@ -0,0 +1,270 @@
+"""
+Knowledge Base Normalizer
+지식베이스 파일 업로드 시 한 번 실행하는 텍스트 정규화/압축
+
+파일 내용은 모든 메시지의 프롬프트에 그대로 들어가므로, 브라우저에서 추출한 PDF 텍스트의
+반복 머리말/꼬리말, 페이지 번호, 하이픈 줄바꿈, 정렬용 공백이 매 요청 비용이 됩니다.
+업로드 시점에 아래 순서로 정리해 compactContent로 저장하고 원문(fileContent)은 그대로 둡니다.
+
+1. 유니코드 NFC 정규화, 제어/폭 없는 문자 제거, 줄바꿈 통일 (페이지 구분 \f로 페이지 분할)
+2. 표 행 평탄화 (탭/파이프/공백 정렬 셀 -> "셀 | 셀", 구분선 행 제거)
+3. 줄 내부 공백 축약
+4. 페이지 가장자리(처음/마지막 N줄)의 페이지 번호 줄 제거
+5. 여러 페이지 가장자리에 반복되는 짧은 줄(머리말/꼬리말) 제거 - 앞뒤 쪽 번호만 다른 줄도 같은 줄로 취급
+6. 하이픈 줄바꿈 복원 (영문 단어)
+7. 동일 문단 중복 제거, 연속 빈 줄 축약
+
+4, 5단계는 페이지 구분(\f)이 있는 문서에만 적용합니다. 페이지를 알 수 없는 문서(일반 텍스트)의
+숫자만 있는 줄이나 반복 문장은 본문일 수 있으므로 그대로 둡니다.
+"""
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+from ..config.business import KNOWLEDGE_BASE_CONFIG
+from .simple_usage_service import SimpleUsageService
+
+# 제거할 문자 (폭 없는 공백, BOM, 소프트 하이픈)
+_INVISIBLE = dict.fromkeys(map(ord, '\u200b\u200c\u200d\u2060\ufeff\u00ad'))
+# 공백으로 바꿀 문자 (NBSP, 고정폭 공백, 전각 공백 등)
+_SPACES = dict.fromkeys(map(ord, '\u00a0\u2002\u2003\u2007\u2009\u202f\u3000'), ' ')
+
+_PAGE_NUMBER = re.compile(
+    r'^(?:[-–—]\s*\d{1,4}\s*[-–—]'
+    r'|\d{1,4}\s*/\s*\d{1,4}'
+    r'|(?:page|p\.)\s*\d{1,4}(?:\s*(?:of|/)\s*\d{1,4})?'
+    r'|\d{1,4}\s*(?:쪽|페이지|page)'
+    r'|페이지\s*\d{1,4}'
+    r'|\d{1,4})$',
+    re.IGNORECASE
+)
+_TABLE_SEPARATOR_CELL = re.compile(r'^:?[-=─━═]{2,}:?$')
+_RULE_LINE = re.compile(r'^[-=_─━═┼┬┴├┤+|\s]{3,}$')
+_CELL_GAP = re.compile(r' {2,}')
+_MAX_SPACED_CELL_CHARS = 30
+_WHITESPACE = re.compile(r'[ \t]+')
+_EDGE_NUMBER = re.compile(r'^\d+\s*|\s*\d+$')
+_HYPHEN_BREAK = re.compile(r'([A-Za-z]{2,})-$')
+
+
+@dataclass
+class NormalizationResult:
+    """정규화 결과와 파일별 절감 리포트"""
+    content: str
+    original_chars: int
+    compact_chars: int
+    original_tokens: int
+    compact_tokens: int
+    removed: Dict[str, int] = field(default_factory=dict)  # 단계별 제거 줄/문단 수
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.original_tokens - self.compact_tokens
+
+    @property
+    def saved_ratio(self) -> float:
+        return round(self.saved_tokens / self.original_tokens, 4) if self.original_tokens else 0.0
+
+    def to_report(self) -> Dict[str, Any]:
+        """API 응답/로그용 리포트"""
+        return {
+            'originalChars': self.original_chars,
+            'compactChars': self.compact_chars,
+            'originalTokens': self.original_tokens,
+            'compactTokens': self.compact_tokens,
+            'savedTokens': self.saved_tokens,
+            'savedRatio': self.saved_ratio,
+            'removed': self.removed
+        }
+
+
+def normalize_document(text: str, config: Optional[Dict[str, Any]] = None) -> NormalizationResult:
+    """
+    지식베이스 문서 정규화
+
+    Args:
+        text: 업로드된 원문
+        config: 정규화 설정 (없으면 KNOWLEDGE_BASE_CONFIG)
+
+    Returns:
+        NormalizationResult (content가 프롬프트에 사용할 텍스트)
+    """
+    config = config or KNOWLEDGE_BASE_CONFIG
+    text = text or ''
+    removed = Counter()
+
+    pages = []
+    for page in _clean_characters(text).split('\f'):
+        lines = page.split('\n')
+        if config['flatten_tables']:
+            lines = _flatten_tables(lines, removed)
+        pages.append([_WHITESPACE.sub(' ', line).strip() for line in lines])
+
+    if len(pages) > 1:
+        pages = _drop_page_numbers(pages, config, removed)
+        pages = _drop_repeated_lines(pages, config, removed)
+
+    lines = _join_hyphenated([line for page in pages for line in page], removed)
+    content = _dedupe_paragraphs(lines, config, removed)
+
+    return NormalizationResult(
+        content=content,
+        original_chars=len(text),
+        compact_chars=len(content),
+        original_tokens=SimpleUsageService.estimate_tokens(text),
+        compact_tokens=SimpleUsageService.estimate_tokens(content),
+        removed={name: count for name, count in removed.items() if count}
+    )
+
+
+def _clean_characters(text: str) -> str:
+    """NFC 정규화, 보이지 않는 문자 제거, 줄바꿈 통일 (페이지 구분 \f는 유지)"""
+    text = unicodedata.normalize('NFC', text)
+    text = text.translate(_INVISIBLE).translate(_SPACES)
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return ''.join(ch for ch in text if ch in '\n\t\f' or unicodedata.category(ch) != 'Cc')
+
+
+def _flatten_tables(lines: List[str], removed: Counter) -> List[str]:
+    """표 행을 "셀 | 셀"로 평탄화하고 구분선 행 제거"""
+    cells = [_split_cells(line) for line in lines]
+
+    # 공백 정렬 표는 열 수가 같은 행이 연속될 때만 표로 인정 (문장 사이 이중 공백 제외)
+    spaced = [_split_spaced_cells(line) if row is None else None for line, row in zip(lines, cells)]
+    for i, row in enumerate(spaced):
+        if row and any(
+            0 <= j < len(spaced) and spaced[j] and len(spaced[j]) == len(row) for j in (i - 1, i + 1)
+        ):
+            cells[i] = row
+
+    flattened = []
+    for line, row in zip(lines, cells):
+        if line.strip() and _RULE_LINE.match(line.strip()):
+            removed['table_rules'] += 1
+            continue
+        if row is None:
+            flattened.append(line)
+            continue
+        row = [cell.strip() for cell in row]
+        if all(not cell or _TABLE_SEPARATOR_CELL.match(cell) for cell in row):
+            removed['table_rules'] += 1
+            continue
+        flattened.append(' | '.join(cell for cell in row if cell))
+    return flattened
+
+
+def _split_cells(line: str) -> Optional[List[str]]:
+    """탭/파이프 구분 표 행이면 셀 목록 (아니면 None)"""
+    stripped = line.strip()
+    if '\t' in stripped:
+        return stripped.split('\t')
+    if stripped.count('|') >= 2:
+        return stripped.strip('|').split('|')
+    return None
+
+
+def _split_spaced_cells(line: str) -> Optional[List[str]]:
+    """공백 정렬 표 행 후보면 셀 목록 - 짧은 셀 3개 이상 (아니면 None)"""
+    row = _CELL_GAP.split(line.strip())
+    if len(row) < 3 or max(len(cell) for cell in row) > _MAX_SPACED_CELL_CHARS:
+        return None
+    return row
+
+
+def _edge_indexes(page: List[str], edge_lines: int) -> Set[int]:
+    """페이지의 처음/마지막 edge_lines개 (비어 있지 않은) 줄 인덱스"""
+    filled = [i for i, line in enumerate(page) if line]
+    return set(filled[:edge_lines] + filled[-edge_lines:]) if edge_lines > 0 else set()
+
+
+def _drop_page_numbers(pages: List[List[str]], config: Dict[str, Any], removed: Counter) -> List[List[str]]:
+    """페이지 가장자리에 있는 페이지 번호 줄만 제거 (본문 중간의 숫자 줄은 유지)"""
+    result = []
+    for page in pages:
+        edges = _edge_indexes(page, config['page_edge_lines'])
+        kept = [line for i, line in enumerate(page) if not (i in edges and _PAGE_NUMBER.match(line))]
+        removed['page_numbers'] += len(page) - len(kept)
+        result.append(kept)
+    return result
+
+
+def _drop_repeated_lines(pages: List[List[str]], config: Dict[str, Any], removed: Counter) -> List[List[str]]:
+    """여러 페이지 가장자리에 반복되는 짧은 줄(머리말/꼬리말)은 첫 번째만 유지"""
+    def signature(line: str) -> str:
+        # 앞뒤 쪽 번호만 다른 머리말("서울경제 가이드라인 3")은 같은 줄로 취급
+        # (숫자만 남는 표 행은 원문 그대로 비교)
+        masked = _EDGE_NUMBER.sub('#', line)
+        return masked if sum(ch.isalpha() for ch in masked) >= 2 else line
+
+    max_chars = config['repeated_line_max_chars']
+    page_edges = [
+        {i for i in _edge_indexes(page, config['page_edge_lines']) if len(page[i]) <= max_chars}
+        for page in pages
+    ]
+
+    # 같은 페이지 안의 반복은 세지 않고, 가장자리에 나타난 페이지 수로 판정
+    counts = Counter()
+    for page, edges in zip(pages, page_edges):
+        counts.update({signature(page[i]) for i in edges})
+    repeated = {sig for sig, count in counts.items() if count >= config['repeated_line_min_count']}
+    if not repeated:
+        return pages
+
+    seen = set()
+    result = []
+    for page, edges in zip(pages, page_edges):
+        kept = []
+        for i, line in enumerate(page):
+            sig = signature(line) if i in edges else None
+            if sig in repeated:
+                if sig in seen:
+                    removed['repeated_lines'] += 1
+                    continue
+                seen.add(sig)
+            kept.append(line)
+        result.append(kept)
+    return result
+
+
+def _join_hyphenated(lines: List[str], removed: Counter) -> List[str]:
+    """줄 끝 하이픈으로 나뉜 영문 단어를 다음 줄과 합침 (다음 줄이 소문자로 시작할 때만)"""
+    joined: List[str] = []
+    for line in lines:
+        if joined and line[:1].islower() and line[:1].isascii():
+            match = _HYPHEN_BREAK.search(joined[-1])
+            if match:
+                head = joined[-1][:match.end(1)]
+                word_rest, _, tail = line.partition(' ')
+                joined[-1] = head + word_rest
+                removed['hyphenations'] += 1
+                if tail:
+                    joined.append(tail)
+                continue
+        joined.append(line)
+    return joined
+
+
+def _dedupe_paragraphs(lines: List[str], config: Dict[str, Any], removed: Counter) -> str:
+    """동일 문단 중복 제거 + 연속 빈 줄을 하나로 축약"""
+    paragraphs: List[str] = []
+    current: List[str] = []
+    for line in lines + ['']:
+        if line:
+            current.append(line)
+        elif current:
+            paragraphs.append('\n'.join(current))
+            current = []
+
+    min_chars = config['duplicate_paragraph_min_chars']
+    seen = set()
+    kept = []
+    for paragraph in paragraphs:
+        if len(paragraph) >= min_chars:
+            if paragraph in seen:
+                removed['duplicate_paragraphs'] += 1
+                continue
+            seen.add(paragraph)
+        kept.append(paragraph)
+    return '\n\n'.join(kept)
@@ -0,0 +1,147 @@
+"""
+Output Budget Service
+요청별 응답 토큰 예산(max_tokens) 계산과 문단 경계 soft stop
+
+예산 = min(BEDROCK_CONFIG['max_tokens'], 플랜 max_tokens_per_request,
+           엔진 max_output_tokens, 월 잔여 토큰)  (최소 min_output_tokens)
+
+응답 종료 사유(stop_reason)는 클라이언트 chat_end 프레임으로 전달됩니다.
+- end_turn: 모델이 응답을 마침
+- soft_limit: 예산의 soft_stop_ratio를 넘긴 뒤 문단 경계에서 종료
+- max_tokens: 예산(max_tokens)에 도달해 모델이 중단
+"""
+import logging
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from ..config.aws import BEDROCK_CONFIG
+from ..config.business import ENGINE_TYPES, OUTPUT_BUDGET_CONFIG, get_usage_limit
+from .simple_usage_service import SimpleUsageService
+
+logger = logging.getLogger(__name__)
+
+STOP_END_TURN = 'end_turn'
+STOP_SOFT_LIMIT = 'soft_limit'
+STOP_MAX_TOKENS = 'max_tokens'
+
+PARAGRAPH_BREAK = '\n\n'
+
+
+@dataclass
+class OutputBudget:
+    """요청별 응답 토큰 예산"""
+    max_tokens: int
+    source: str  # 예산을 결정한 한도 (default, plan, engine, monthly)
+    soft_limit: Optional[int] = None  # 이 토큰 수를 넘으면 문단 경계에서 종료 (None이면 사용 안 함)
+    monthly_remaining: Optional[int] = None
+
+
+class OutputBudgetService:
+    """플랜/엔진/월 잔여 토큰 기반 응답 예산 계산"""
+
+    def __init__(self, usage_service: SimpleUsageService = None):
+        """
+        Args:
+            usage_service: 월간 사용량 조회 서비스 (없으면 처음 필요할 때 생성)
+        """
+        self._usage_service = usage_service
+
+    def resolve(self, user_id: str, engine_type: str, user_plan: Optional[str] = None) -> OutputBudget:
+        """
+        요청 예산 계산
+
+        Args:
+            user_id: 사용자 ID
+            engine_type: 엔진 타입
+            user_plan: 사용자 플랜 (free, basic, premium - None이면 플랜/월 한도 미적용)
+
+        Returns:
+            OutputBudget
+        """
+        default = BEDROCK_CONFIG['max_tokens']
+        if not OUTPUT_BUDGET_CONFIG['enabled']:
+            return OutputBudget(max_tokens=default, source='default')
+
+        limits = [(default, 'default')]
+        if user_plan:
+            limits.append((get_usage_limit(user_plan, 'max_tokens_per_request') or default, 'plan'))
+
+        engine_limit = (ENGINE_TYPES.get(engine_type) or {}).get('max_output_tokens')
+        if engine_limit:
+            limits.append((engine_limit, 'engine'))
+
+        monthly_remaining = None
+        if OUTPUT_BUDGET_CONFIG['monthly_enabled'] and user_id and user_plan:
+            monthly_remaining = self._monthly_remaining(user_id, user_plan)
+            if monthly_remaining is not None:
+                limits.append((monthly_remaining, 'monthly'))
+
+        max_tokens, source = min(limits, key=lambda limit: limit[0])
+        max_tokens = max(max_tokens, OUTPUT_BUDGET_CONFIG['min_output_tokens'])
+
+        soft_limit = None
+        if OUTPUT_BUDGET_CONFIG['soft_stop_enabled']:
+            soft_limit = int(max_tokens * OUTPUT_BUDGET_CONFIG['soft_stop_ratio'])
+
+        logger.info(
+            f"Output budget for {user_id} ({user_plan}, {engine_type}): "
+            f"max_tokens={max_tokens} ({source}), soft_limit={soft_limit}, monthly_remaining={monthly_remaining}"
+        )
+        return OutputBudget(
+            max_tokens=max_tokens,
+            source=source,
+            soft_limit=soft_limit,
+            monthly_remaining=monthly_remaining
+        )
+
+    def _monthly_remaining(self, user_id: str, user_plan: str) -> Optional[int]:
+        """월 잔여 토큰 (조회 실패 시 None - 월 한도 미적용)"""
+        try:
+            if self._usage_service is None:
+                self._usage_service = SimpleUsageService()
+            used = self._usage_service.get_monthly_tokens(user_id)
+            return max(0, get_usage_limit(user_plan, 'monthly_tokens') - used)
+        except Exception as e:
+            logger.error(f"Error resolving monthly budget for {user_id}: {str(e)}")
+            return None
+
+
+class SoftStop:
+    """
+    스트리밍 응답 soft stop
+
+    누적 추정 토큰이 soft_limit를 넘은 뒤 처음 나오는 문단 경계(빈 줄)에서 응답을 끝냅니다.
+    청크 경계에 걸친 빈 줄도 처리합니다.
+    """
+
+    def __init__(self, soft_limit: Optional[int]):
+        self.soft_limit = soft_limit
+        self.tokens = 0
+        self.stopped = False
+        self._tail = ''
+
+    def feed(self, chunk: str) -> Tuple[str, bool]:
+        """
+        청크 처리
+
+        Args:
+            chunk: 모델 응답 청크
+
+        Returns:
+            (전송할 텍스트, 이 청크에서 종료 여부)
+        """
+        if self.soft_limit is None or self.stopped:
+            return chunk, False
+
+        self.tokens += SimpleUsageService.estimate_tokens(chunk)
+
+        if self.tokens >= self.soft_limit:
+            # 이전 청크 끝부분과 이어 붙여 청크 경계에 걸친 빈 줄도 찾음
+            window = self._tail + chunk
+            index = window.find(PARAGRAPH_BREAK)
+            if index != -1:
+                self.stopped = True
+                return chunk[:max(0, index - len(self._tail))].rstrip(), True
+
+        self._tail = chunk[-(len(PARAGRAPH_BREAK) - 1):]
+        return chunk, False
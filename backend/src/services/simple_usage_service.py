@@ -24,34 +24,15 @@ class SimpleUsageService:
     def __init__(self):
         """서비스 초기화"""
         from src.config.database import get_table_name
-        import boto3
+        from ..repositories.aws_clients import get_resource
         import os
 
         region = os.environ.get('AWS_REGION', 'us-east-1')
-        dynamodb = boto3.resource('dynamodb', region_name=region)
+        dynamodb = get_resource('dynamodb', region)
 
         self.usage_table = dynamodb.Table(get_table_name('usage'))
         logger.info("SimpleUsageService initialized")
 
-    @staticmethod
-    def decimal_to_float(obj):
-        """
-        DynamoDB Decimal을 float로 변환
-
-        Args:
-            obj: 변환할 객체 (Decimal, dict, list)
-
-        Returns:
-            변환된 객체
-        """
-        if isinstance(obj, Decimal):
-            return float(obj)
-        elif isinstance(obj, dict):
-            return {k: SimpleUsageService.decimal_to_float(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [SimpleUsageService.decimal_to_float(v) for v in obj]
-        return obj
-
     @staticmethod
     def estimate_tokens(text: str) -> int:
         """
@@ -203,11 +184,13 @@ class SimpleUsageService:
                 ReturnValues='ALL_NEW'
             )
 
-            updated_item = self.decimal_to_float(response['Attributes'])
+            # Decimal 값은 응답 직렬화 시 변환 (utils.serialization)
+            updated_item = response['Attributes']
+            used_tokens = int(updated_item['totalTokens'])
 
             # 플랜별 월간 한도 가져오기 (설정값 사용)
             monthly_limit = USAGE_LIMITS.get(user_plan, USAGE_LIMITS['free'])['monthly_tokens']
-            percentage = min(100, (updated_item['totalTokens'] / monthly_limit) * 100)
+            percentage = min(100, (used_tokens / monthly_limit) * 100)
 
             logger.info(f"Usage updated for {user_id}: {total_tokens} tokens")
 
@@ -216,7 +199,7 @@ class SimpleUsageService:
                 'usage': updated_item,
                 'tokensUsed': total_tokens,
                 'percentage': round(percentage, 1),
-                'remaining': max(0, monthly_limit - updated_item['totalTokens'])
+                'remaining': max(0, monthly_limit - used_tokens)
             }
 
         except ClientError as e:
@@ -247,7 +230,7 @@ class SimpleUsageService:
             )
 
             if 'Item' in response:
-                return self.decimal_to_float(response['Item'])
+                return response['Item']
 
             # 없으면 기본값 반환
             return {
@@ -264,6 +247,38 @@ class SimpleUsageService:
             logger.error(f"Error getting usage: {e}")
             return None
 
+    def get_monthly_tokens(self, user_id: str) -> int:
+        """
+        이번 달 전체 엔진 사용 토큰 합계
+
+        Args:
+            user_id: 사용자 ID
+
+        Returns:
+            사용 토큰 수 (조회 실패 시 0)
+        """
+        try:
+            month = datetime.now(timezone.utc).strftime('%Y-%m')
+            query_params = {
+                'KeyConditionExpression': 'userId = :userId AND begins_with(#date, :month)',
+                'ProjectionExpression': 'totalTokens',
+                'ExpressionAttributeNames': {'#date': 'date'},
+                'ExpressionAttributeValues': {':userId': user_id, ':month': month}
+            }
+
+            total = 0
+            while True:
+                response = self.usage_table.query(**query_params)
+                total += sum(int(item.get('totalTokens', 0)) for item in response.get('Items', []))
+                last_evaluated_key = response.get('LastEvaluatedKey')
+                if not last_evaluated_key:
+                    return total
+                query_params['ExclusiveStartKey'] = last_evaluated_key
+
+        except ClientError as e:
+            logger.error(f"Error getting monthly tokens: {e}")
+            return 0
+
     def get_all_usage(self, user_id: str) -> Dict[str, List[Dict[str, Any]]]:
         """
         모든 엔진의 사용량 조회
@@ -281,7 +296,7 @@ class SimpleUsageService:
                 KeyConditionExpression=Key('userId').eq(user_id)
             )
 
-            items = [self.decimal_to_float(item) for item in response.get('Items', [])]
+            items = response.get('Items', [])
 
             # 엔진별로 정리
             usage_by_engine = {}
@@ -5,14 +5,18 @@ WebSocket 메시지 처리 및 Bedrock 통합 서비스
 import json
 import logging
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Generator
+from typing import List, Dict, Any, Optional, Generator, Callable
 import uuid
 
 from ..repositories import ConversationRepository
 from ..models import Conversation, Message
 from ..config.business import CONVERSATION_LIMITS, TEXT_PROCESSING
 from ..config.database import AWS_REGION
-from lib.bedrock_client_enhanced import BedrockClientEnhanced
+from ..config.aws import GUARDRAIL_CONFIG
+from .capacity_scheduler import CapacityScheduler
+from .conversation_summary_service import ConversationSummaryService
+from .output_budget_service import OutputBudgetService, SoftStop, STOP_SOFT_LIMIT
+from lib.bedrock_client_enhanced import BedrockClientEnhanced, GUARDRAIL_STOP_REASON
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +28,10 @@ class WebSocketService:
         self,
         conversation_repository: ConversationRepository = None,
         prompt_service=None,  # PromptService는 순환참조 방지를 위해 나중에 주입
-        bedrock_client: BedrockClientEnhanced = None
+        bedrock_client: BedrockClientEnhanced = None,
+        capacity_scheduler: CapacityScheduler = None,
+        summary_service: ConversationSummaryService = None,
+        output_budget_service: OutputBudgetService = None
     ):
         """
         의존성 주입을 통한 초기화
@@ -33,10 +40,18 @@ class WebSocketService:
             conversation_repository: 대화 저장소 (테스트 시 Mock 가능)
             prompt_service: 프롬프트 서비스
             bedrock_client: Bedrock 클라이언트
+            capacity_scheduler: Bedrock 용량 스케줄러
+            summary_service: 대화 요약 서비스
+            output_budget_service: 요청별 응답 토큰 예산 서비스
         """
         self.conversation_repo = conversation_repository or ConversationRepository()
         self.prompt_service = prompt_service  # PromptService를 나중에 설정
         self.bedrock_client = bedrock_client or BedrockClientEnhanced()
+        self.capacity_scheduler = capacity_scheduler or CapacityScheduler()
+        self.summary_service = summary_service or ConversationSummaryService(
+            self.conversation_repo, self.bedrock_client
+        )
+        self.output_budget_service = output_budget_service or OutputBudgetService()
         logger.info("WebSocketService initialized")
 
     def process_message(
@@ -46,7 +61,8 @@ class WebSocketService:
         conversation_id: Optional[str],
         user_id: str,
         conversation_history: List[Dict],
-        user_role: str = 'user'
+        user_role: str = 'user',
+        save_user_message: bool = True
     ) -> Dict[str, Any]:
         """
         메시지 처리 및 대화 히스토리 병합
@@ -58,9 +74,10 @@ class WebSocketService:
             user_id: 사용자 ID
             conversation_history: 클라이언트에서 전달된 대화 히스토리
             user_role: 사용자 역할
+            save_user_message: 사용자 메시지 저장 여부 (재시도 요청이 이미 저장한 경우 False)
 
         Returns:
-            Dict containing conversation_id and merged_history
+            Dict containing conversation_id, merged_history and summary (요약된 이전 대화, 없으면 None)
         """
         try:
             # 대화 ID가 없으면 생성
@@ -71,12 +88,18 @@ class WebSocketService:
             # DB에서 기존 대화 조회
             conversation = self.conversation_repo.find_by_id(conversation_id)
 
-            # DB에서 기존 대화 히스토리 조회
+            # DB에서 기존 대화 히스토리 조회 (요약된 턴은 요약 텍스트로 대체)
             db_history = []
+            summary = None
+            known_timestamps = set()
             if conversation and conversation.messages:
+                summary, pending_messages = ConversationSummaryService.split_history(conversation)
+                known_timestamps = {msg.timestamp for msg in conversation.messages if msg.timestamp}
                 # 최근 N개 메시지만 사용
                 limit = CONVERSATION_LIMITS['default_history_limit']
-                recent_messages = conversation.messages[-limit:] if len(conversation.messages) > limit else conversation.messages
+                recent_messages = pending_messages[-limit:] if len(pending_messages) > limit else pending_messages
+                # 오프로드된 본문은 컨텍스트에 포함할 메시지만 병렬 조회
+                self.conversation_repo.hydrate_messages(recent_messages)
                 db_history = [
                     {
                         'role': msg.role,
@@ -89,17 +112,22 @@ class WebSocketService:
             # 클라이언트 히스토리와 DB 히스토리 병합
             merged_history = self._merge_conversation_history(
                 client_history=conversation_history,
-                db_history=db_history
+                db_history=db_history,
+                known_timestamps=known_timestamps
             )
 
             # 사용자 메시지 저장
-            self._save_message(
-                conversation_id=conversation_id,
-                role='user',
-                content=user_message,
-                engine_type=engine_type,
-                user_id=user_id
-            )
+            if save_user_message:
+                self._save_message(
+                    conversation_id=conversation_id,
+                    role='user',
+                    content=user_message,
+                    engine_type=engine_type,
+                    user_id=user_id
+                )
+            elif merged_history and merged_history[-1].get('content') == user_message:
+                # 이미 저장된 사용자 메시지가 DB 히스토리에 포함된 경우 중복 제거
+                merged_history.pop()
 
             # 병합된 히스토리에 현재 메시지 추가
             merged_history.append({
@@ -108,12 +136,12 @@ class WebSocketService:
                 'timestamp': datetime.utcnow().isoformat() + 'Z'
             })
 
-            logger.info(f"Processed message for conversation {conversation_id}")
-            logger.info(f"Merged history length: {len(merged_history)}")
+            logger.debug("Processed message for conversation %s (history %d)", conversation_id, len(merged_history))
 
             return {
                 'conversation_id': conversation_id,
-                'merged_history': merged_history
+                'merged_history': merged_history,
+                'summary': summary
             }
 
         except Exception as e:
@@ -127,7 +155,11 @@ class WebSocketService:
         conversation_id: str,
         user_id: str,
         conversation_history: List[Dict],
-        user_role: str = 'user'
+        user_role: str = 'user',
+        user_plan: Optional[str] = None,
+        on_queued: Optional[Callable[[int], None]] = None,
+        conversation_summary: Optional[str] = None,
+        stream_info: Optional[Dict[str, Any]] = None
     ) -> Generator[str, None, None]:
         """
         Bedrock 스트리밍 응답 생성
@@ -139,34 +171,83 @@ class WebSocketService:
             user_id: 사용자 ID
             conversation_history: 대화 히스토리
             user_role: 사용자 역할
+            user_plan: 사용자 플랜 (서버 판단, None이면 플랜 미확인 - 응답 예산/용량 스케줄링 우선순위)
+            on_queued: 용량 대기열 진입 시 호출되는 콜백 (대기 순번)
+            conversation_summary: 이전 대화 요약 (process_message 결과의 summary)
+            stream_info: 전달 시 max_tokens, budget_source,
+                stop_reason(end_turn/soft_limit/max_tokens/guardrail_intervened)과
+                Bedrock 스트림 정보(first_chunk_ms, guardrail_mode, guardrail_message, guardrail_latency_ms)를 기록
 
         Yields:
             str: 응답 청크
+
+        Raises:
+            CapacityExceededError: Bedrock 여유 용량이 없어 요청이 거절된 경우
         """
         try:
             # 대화 컨텍스트를 포함한 프롬프트 생성
-            formatted_history = self._format_conversation_for_bedrock(conversation_history)
+            formatted_history = self._format_conversation_for_bedrock(conversation_history, conversation_summary)
 
             # 프롬프트 데이터 로드 (PromptService 사용)
             prompt_data = self._load_prompt_data(engine_type)
-            logger.info(f"Loaded prompt for {engine_type}: instruction={len(prompt_data.get('instruction', ''))} chars")
-
-            logger.info(f"Streaming response for engine {engine_type}")
-            logger.info(f"Conversation context: {len(formatted_history)} messages")
+            logger.debug("Loaded prompt for %s: instruction=%d chars", engine_type, len(prompt_data.get('instruction', '')))
+
+            logger.debug("Streaming response for engine %s (context %d messages)", engine_type, len(formatted_history))
+
+            # 요청별 응답 예산 (플랜/엔진/월 잔여 토큰)
+            budget = self.output_budget_service.resolve(user_id, engine_type, user_plan)
+            if stream_info is not None:
+                stream_info.update({'max_tokens': budget.max_tokens, 'budget_source': budget.source})
+
+            # 플랜 우선순위에 따라 Bedrock 용량 확보 (입력 + 응답 예산 기준 추정)
+            input_tokens = self._estimate_input_tokens(user_message, formatted_history, prompt_data)
+            ticket = self.capacity_scheduler.acquire(
+                model_id=self.bedrock_client.model_id,
+                plan=user_plan,
+                estimated_tokens=input_tokens + budget.max_tokens,
+                on_queued=on_queued
+            )
 
             # Bedrock 스트리밍 호출
             total_response = ""
-            for chunk in self.bedrock_client.stream_bedrock(
+            bedrock_info = {}
+            soft_stop = SoftStop(budget.soft_limit)
+            chunks = self.bedrock_client.stream_bedrock(
                 user_message=user_message,
                 engine_type=engine_type,
                 conversation_context=formatted_history,  # 대화 컨텍스트 전달
                 user_role=user_role,
                 guidelines=prompt_data.get('instruction'),  # DynamoDB instruction 전달
                 description=prompt_data.get('description'),  # DynamoDB description 전달
-                files=prompt_data.get('files', [])  # DynamoDB files 전달
-            ):
-                total_response += chunk
-                yield chunk
+                files=prompt_data.get('files', []),  # DynamoDB files 전달
+                max_tokens=budget.max_tokens,
+                stream_info=bedrock_info
+            )
+            try:
+                for chunk in chunks:
+                    text, stop = soft_stop.feed(chunk)
+                    if text:
+                        total_response += text
+                        yield text
+                    if stop:
+                        # 예산 근처 문단 경계 - 스트림을 닫아 생성 중단
+                        logger.info(f"Soft stop at ~{soft_stop.tokens} tokens (budget {budget.max_tokens})")
+                        break
+            finally:
+                chunks.close()
+                if stream_info is not None:
+                    stream_info.update(bedrock_info)
+                    if soft_stop.stopped:
+                        stream_info['stop_reason'] = STOP_SOFT_LIMIT
+                from .simple_usage_service import SimpleUsageService
+                self.capacity_scheduler.release(
+                    ticket,
+                    actual_tokens=input_tokens + SimpleUsageService.estimate_tokens(total_response)
+                )
+
+            # 가드레일 개입 - 이미 전송된 응답 대신 차단 메시지를 저장 (다음 턴 컨텍스트에서 제외)
+            if bedrock_info.get('stop_reason') == GUARDRAIL_STOP_REASON:
+                total_response = bedrock_info.get('guardrail_message') or GUARDRAIL_CONFIG['blocked_message']
 
             # AI 응답을 대화에 저장
             if total_response:
@@ -177,12 +258,24 @@ class WebSocketService:
                     engine_type=engine_type,
                     user_id=user_id
                 )
-                logger.info(f"AI response saved: {len(total_response)} chars")
+                logger.debug("AI response saved: %d chars", len(total_response))
 
         except Exception as e:
             logger.error(f"Error streaming response: {str(e)}")
             raise
 
+    def summarize_history(self, conversation_id: str) -> bool:
+        """
+        긴 대화의 오래된 턴을 요약에 합침 (응답 완료 후 호출, 실패해도 예외를 던지지 않음)
+
+        Args:
+            conversation_id: 대화 ID
+
+        Returns:
+            요약 갱신 여부
+        """
+        return self.summary_service.summarize_if_needed(conversation_id)
+
     def clear_history(self, conversation_id: str) -> bool:
         """
         대화 히스토리 초기화
@@ -194,15 +287,15 @@ class WebSocketService:
             성공 여부
         """
         try:
-            conversation = self.conversation_repo.find_by_id(conversation_id)
-
-            if conversation:
-                # 메시지만 비우고 대화는 유지
-                conversation.messages = []
-                conversation.title = "Cleared conversation"
-                conversation.updated_at = datetime.now().isoformat()
-                self.conversation_repo.save(conversation)
-
+            def apply(conversation: Optional[Conversation]) -> Optional[Conversation]:
+                if conversation:
+                    # 메시지만 비우고 대화는 유지
+                    conversation.messages = []
+                    conversation.title = "Cleared conversation"
+                    conversation.updated_at = datetime.now().isoformat()
+                return conversation
+
+            if self.conversation_repo.modify(conversation_id, apply):
                 logger.info(f"Cleared history for conversation {conversation_id}")
                 return True
             else:
@@ -219,7 +312,7 @@ class WebSocketService:
         engine_type: str,
         input_text: str,
         output_text: str,
-        user_plan: str = 'free'
+        user_plan: Optional[str] = None
     ) -> None:
         """
         사용량 추적 및 저장
@@ -229,7 +322,7 @@ class WebSocketService:
             engine_type: 엔진 타입
             input_text: 입력 텍스트
             output_text: 출력 텍스트
-            user_plan: 사용자 플랜 (free, basic, premium)
+            user_plan: 사용자 플랜 (free, basic, premium - None이면 free 한도로 기록)
         """
         try:
             # SimpleUsageService를 통해 사용량 저장
@@ -241,11 +334,10 @@ class WebSocketService:
                 engine_type=engine_type,
                 input_text=input_text,
                 output_text=output_text,
-                user_plan=user_plan
+                user_plan=user_plan or 'free'
             )
 
-            logger.info(f"Usage tracked and saved - User: {user_id}, Engine: {engine_type}")
-            logger.info(f"Result: {result}")
+            logger.debug("Usage tracked for engine %s: %s", engine_type, result)
 
         except Exception as e:
             logger.error(f"Error tracking usage: {str(e)}", exc_info=True)
@@ -275,56 +367,89 @@ class WebSocketService:
             timestamp = datetime.utcnow().isoformat() + 'Z'
             message_id = str(uuid.uuid4())
 
-            # 기존 대화 조회
-            conversation = self.conversation_repo.find_by_id(conversation_id)
-
-            if conversation:
-                # 기존 대화에 메시지 추가
-                new_message = Message(
-                    role=role,
-                    content=content,
-                    timestamp=timestamp,
-                    type=role
-                )
-                conversation.messages.append(new_message)
-
-                # 최근 N개 메시지만 유지 (메모리 관리)
-                max_messages = CONVERSATION_LIMITS['max_messages_in_conversation']
-                if len(conversation.messages) > max_messages:
-                    conversation.messages = conversation.messages[-max_messages:]
+            def apply(conversation: Optional[Conversation]) -> Conversation:
+                if conversation:
+                    # 기존 대화에 메시지 추가
+                    new_message = Message(
+                        role=role,
+                        content=content,
+                        timestamp=timestamp,
+                        type=role
+                    )
+                    conversation.messages.append(new_message)
+
+                    # 최근 N개 메시지만 유지 (메모리 관리)
+                    max_messages = CONVERSATION_LIMITS['max_messages_in_conversation']
+                    if len(conversation.messages) > max_messages:
+                        # 정리된 메시지 수만큼 순번 기준 이동 (델타 동기화 순번 유지)
+                        trimmed = len(conversation.messages) - max_messages
+                        conversation.metadata = conversation.metadata or {}
+                        conversation.metadata['messageSeqBase'] = int(conversation.metadata.get('messageSeqBase', 0)) + trimmed
+                        conversation.messages = conversation.messages[-max_messages:]
+
+                    conversation.updated_at = timestamp
+
+                else:
+                    # 새 대화 생성
+                    title_length = TEXT_PROCESSING['max_conversation_title_length']
+                    default_title = TEXT_PROCESSING['default_conversation_title']
+                    conversation = Conversation(
+                        conversation_id=conversation_id,
+                        user_id=user_id,
+                        engine_type=engine_type,
+                        title=content[:title_length] if role == 'user' else default_title,
+                        messages=[
+                            Message(
+                                role=role,
+                                content=content,
+                                timestamp=timestamp,
+                                type=role
+                            )
+                        ],
+                        created_at=timestamp,
+                        updated_at=timestamp
+                    )
 
-                conversation.updated_at = timestamp
+                return conversation
 
-            else:
-                # 새 대화 생성
-                title_length = TEXT_PROCESSING['max_conversation_title_length']
-                default_title = TEXT_PROCESSING['default_conversation_title']
-                conversation = Conversation(
-                    conversation_id=conversation_id,
-                    user_id=user_id,
-                    engine_type=engine_type,
-                    title=content[:title_length] if role == 'user' else default_title,
-                    messages=[
-                        Message(
-                            role=role,
-                            content=content,
-                            timestamp=timestamp,
-                            type=role
-                        )
-                    ],
-                    created_at=timestamp,
-                    updated_at=timestamp
-                )
-
-            # 저장
-            self.conversation_repo.save(conversation)
-            logger.info(f"Message saved: {conversation_id} - {role}")
+            # 조회 -> 메시지 추가 -> 조건부 저장 (다른 요청이 먼저 저장했으면 최신 대화에 다시 추가)
+            self.conversation_repo.modify(conversation_id, apply)
+            logger.debug("Message saved: %s - %s", conversation_id, role)
             return True
 
         except Exception as e:
             logger.error(f"Error saving message: {str(e)}")
             return False
 
+    def _estimate_input_tokens(
+        self,
+        user_message: str,
+        formatted_history: str,
+        prompt_data: Dict[str, Any]
+    ) -> int:
+        """
+        Bedrock 입력 토큰 추정 (메시지 + 대화 컨텍스트 + 지침 + 지식베이스)
+
+        Args:
+            user_message: 사용자 메시지
+            formatted_history: 포맷팅된 대화 컨텍스트
+            prompt_data: 프롬프트 데이터
+
+        Returns:
+            추정 입력 토큰 수
+        """
+        from .simple_usage_service import SimpleUsageService
+
+        texts = [
+            user_message,
+            formatted_history,
+            prompt_data.get('instruction') or '',
+            prompt_data.get('description') or ''
+        ]
+        texts.extend(f.get('fileContent', '') for f in prompt_data.get('files', []))
+
+        return sum(SimpleUsageService.estimate_tokens(text) for text in texts if text)
+
     def _load_prompt_data(self, engine_type: str) -> Dict[str, Any]:
         """
         프롬프트 데이터 로드
@@ -343,9 +468,9 @@ class WebSocketService:
             # Fallback: 직접 DynamoDB에서 로드 (레거시 호환성)
             from ..config.aws import DYNAMODB_TABLES
             from ..config.database import get_table_name
-            import boto3
+            from ..repositories.aws_clients import get_resource
 
-            dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+            dynamodb = get_resource('dynamodb', AWS_REGION)
             prompts_table = dynamodb.Table(get_table_name('prompts'))
             files_table = dynamodb.Table(get_table_name('files'))
 
@@ -370,7 +495,8 @@ class WebSocketService:
                         for file_item in files_response['Items']:
                             prompt_data['files'].append({
                                 'fileName': file_item.get('fileName', ''),
-                                'fileContent': file_item.get('fileContent', ''),
+                                # 업로드 시 정규화한 정리본 우선 (없으면 원문)
+                                'fileContent': file_item.get('compactContent', file_item.get('fileContent', '')),
                                 'fileType': 'text'  # 기본값
                             })
                         logger.info(f"Loaded {len(prompt_data['files'])} files for {engine_type}")
@@ -389,7 +515,8 @@ class WebSocketService:
     def _merge_conversation_history(
         self,
         client_history: List[Dict],
-        db_history: List[Dict]
+        db_history: List[Dict],
+        known_timestamps: Optional[set] = None
     ) -> List[Dict]:
         """
         클라이언트와 DB의 대화 히스토리 병합
@@ -399,6 +526,7 @@ class WebSocketService:
         Args:
             client_history: 클라이언트 대화 히스토리
             db_history: DB 대화 히스토리
+            known_timestamps: DB에 저장된 전체 메시지 타임스탬프 (요약된 메시지 포함 - 다시 추가하지 않음)
 
         Returns:
             병합된 대화 히스토리
@@ -415,6 +543,8 @@ class WebSocketService:
 
         # 클라이언트 히스토리에만 있는 메시지 확인 및 추가
         db_timestamps = {msg.get('timestamp') for msg in db_history if msg.get('timestamp')}
+        if known_timestamps:
+            db_timestamps |= known_timestamps
 
         for msg in client_history:
             timestamp = msg.get('timestamp')
@@ -436,19 +566,26 @@ class WebSocketService:
 
         return merged
 
-    def _format_conversation_for_bedrock(self, conversation_history: List[Dict]) -> str:
+    def _format_conversation_for_bedrock(
+        self,
+        conversation_history: List[Dict],
+        summary: Optional[str] = None
+    ) -> str:
         """
         Bedrock에 전달할 대화 컨텍스트 포맷팅
 
         Args:
             conversation_history: 대화 히스토리
+            summary: 이전 대화 요약 (있으면 최근 대화 앞에 추가)
 
         Returns:
             포맷팅된 대화 컨텍스트 문자열
         """
-        if not conversation_history:
+        if not conversation_history and not summary:
             return ""
 
+        summary_section = f"\n\n=== 이전 대화 요약 ===\n{summary}" if summary else ""
+
         formatted_messages = []
         # 최근 N개 메시지만 사용
         max_context = CONVERSATION_LIMITS['max_bedrock_context_messages']
@@ -463,6 +600,12 @@ class WebSocketService:
                     formatted_messages.append(f"AI: {content}")
 
         if formatted_messages:
-            return "\n\n=== 이전 대화 내용 ===\n" + "\n\n".join(formatted_messages) + "\n\n=== 현재 질문 ==="
+            return (
+                summary_section + "\n\n=== 이전 대화 내용 ===\n" + "\n\n".join(formatted_messages)
+                + "\n\n=== 현재 질문 ==="
+            )
+
+        if summary_section:
+            return summary_section + "\n\n=== 현재 질문 ==="
 
         return ""
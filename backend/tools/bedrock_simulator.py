@@ -0,0 +1,386 @@
+"""
+Bedrock Stream Simulator
+bedrock-runtime invoke_model_with_response_stream / invoke_model 로컬 대체
+
+실제 Bedrock과 같은 이벤트 순서(message_start, content_block_start, content_block_delta...,
+content_block_stop, message_delta(usage), message_stop(amazon-bedrock-invocationMetrics))를
+설정한 첫 토큰 지연(TTFT), 초당 토큰 수, 지터로 생성하고, 호출 시 스로틀링
+(ThrottlingException)과 스트리밍 중 실패(modelStreamErrorException)를 확률로 발생시킵니다.
+실제 스트림을 기록(StreamRecorder)해 두었다가 같은 타이밍으로 재생할 수도 있습니다.
+
+BedrockClientEnhanced(runtime_client=BedrockStreamSimulator(...))로 주입하면
+WebSocketService/핸들러 전체 경로를 AWS 없이 실행할 수 있습니다.
+
+실행 (backend 디렉토리에서):
+    python tools/bedrock_simulator.py [--ttft 0.6] [--tps 60] [--tokens 400] [--streams 3]
+    python tools/bedrock_simulator.py --record streams.jsonl --prompt "기사 써줘"   # 실제 Bedrock 필요
+    python tools/bedrock_simulator.py --replay streams.jsonl
+"""
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from botocore.exceptions import ClientError, EventStreamError  # noqa: E402
+
+from src.services.simple_usage_service import SimpleUsageService  # noqa: E402
+
+SENTENCES = [
+    '한국은행 금융통화위원회는 이날 기준금리를 연 3.50%로 동결했다.',
+    '시장에서는 하반기 물가 흐름과 가계부채 증가세를 변수로 꼽았다.',
+    '코스피는 외국인 순매수에 힘입어 전 거래일보다 1.2% 오른 2,650선에서 마감했다.',
+    '반도체 수출은 12개월 연속 증가세를 이어가며 전체 수출 회복을 이끌었다.',
+    '정부는 다음 달 중 소상공인 지원 방안을 추가로 발표할 예정이다.',
+    '전문가들은 원·달러 환율 변동성이 당분간 이어질 것으로 내다봤다.',
+]
+
+
+@dataclass
+class SimulatorProfile:
+    """시뮬레이션 설정"""
+    ttft: float = 0.6               # 첫 토큰까지 지연 (초)
+    tokens_per_second: float = 60.0  # 생성 속도
+    jitter: float = 0.2             # 지연마다 적용할 ±비율
+    tokens_per_delta: int = 3       # content_block_delta당 토큰 수
+    output_tokens: int = 400        # 응답 길이 (요청 max_tokens로 제한)
+    throttle_rate: float = 0.0      # 호출 시 ThrottlingException 확률
+    failure_rate: float = 0.0       # 스트리밍 중 modelStreamErrorException 확률
+    failure_after: float = 0.5      # 실패 시점 (응답 진행 비율)
+    time_scale: float = 1.0         # 지연 배율 (0이면 대기 없이 즉시 생성)
+    seed: Optional[int] = None
+
+
+class SimulatedEventStream:
+    """botocore EventStream 대체 - 반복과 close()만 지원"""
+
+    def __init__(self, events: Iterator[Dict[str, Any]]):
+        self._events = events
+        self.closed = False
+
+    def __iter__(self):
+        return self._events
+
+    def close(self):
+        self.closed = True
+        self._events.close()
+
+
+def _chunk(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {'chunk': {'bytes': json.dumps(payload, ensure_ascii=False).encode('utf-8')}}
+
+
+class BedrockStreamSimulator:
+    """bedrock-runtime 클라이언트 대체 (스레드 안전 - 동시 사용자 부하 테스트용)"""
+
+    def __init__(
+        self,
+        profile: Optional[SimulatorProfile] = None,
+        response_text: Union[str, Callable[[Dict[str, Any]], str], None] = None,
+        recordings: Optional[List[Dict[str, Any]]] = None,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Args:
+            profile: 지연/실패 설정
+            response_text: 응답 본문 (문자열 또는 요청 body를 받는 함수, 없으면 기사 형태 문장 생성)
+            recordings: 재생할 기록 스트림 목록 (load_recordings 결과, 있으면 호출마다 순서대로 재생)
+            sleep: 대기 함수 (테스트에서 가짜 시계 주입)
+        """
+        self.profile = profile or SimulatorProfile()
+        self.response_text = response_text
+        self.recordings = recordings or []
+        self.sleep = sleep
+        self._rng = random.Random(self.profile.seed)
+        self._lock = threading.Lock()
+        self.stats = {'calls': 0, 'throttled': 0, 'failed': 0, 'completed': 0, 'closed_early': 0}
+
+    # bedrock-runtime API
+
+    def invoke_model_with_response_stream(self, body: str, modelId: str, **kwargs: Any) -> Dict[str, Any]:
+        request = json.loads(body)
+        self._count('calls')
+        self._maybe_throttle('InvokeModelWithResponseStream')
+
+        if self.recordings:
+            with self._lock:
+                recording = self.recordings[(self.stats['calls'] - 1) % len(self.recordings)]
+            return {'body': SimulatedEventStream(self._replay(recording))}
+
+        with self._lock:
+            fail = self._rng.random() < self.profile.failure_rate
+        return {'body': SimulatedEventStream(self._generate(request, modelId, fail))}
+
+    def invoke_model(self, body: str, modelId: str, **kwargs: Any) -> Dict[str, Any]:
+        request = json.loads(body)
+        self._count('calls')
+        self._maybe_throttle('InvokeModel')
+
+        text, input_tokens, output_tokens, stop_reason = self._response(request)
+        self._wait(self.profile.ttft + output_tokens / self.profile.tokens_per_second)
+        self._count('completed')
+        payload = {
+            'id': 'msg_simulated',
+            'type': 'message',
+            'role': 'assistant',
+            'model': modelId,
+            'content': [{'type': 'text', 'text': text}],
+            'stop_reason': stop_reason,
+            'usage': {'input_tokens': input_tokens, 'output_tokens': output_tokens}
+        }
+        return {'body': io.BytesIO(json.dumps(payload, ensure_ascii=False).encode('utf-8'))}
+
+    # 생성
+
+    def _generate(self, request: Dict[str, Any], model_id: str, fail: bool) -> Iterator[Dict[str, Any]]:
+        text, input_tokens, output_tokens, stop_reason = self._response(request)
+        started = time.monotonic()
+        finished = failed = False
+        try:
+            yield _chunk({
+                'type': 'message_start',
+                'message': {
+                    'id': 'msg_simulated', 'type': 'message', 'role': 'assistant', 'model': model_id,
+                    'content': [], 'stop_reason': None, 'usage': {'input_tokens': input_tokens, 'output_tokens': 1}
+                }
+            })
+            yield _chunk({'type': 'content_block_start', 'index': 0, 'content_block': {'type': 'text', 'text': ''}})
+
+            self._wait(self.profile.ttft)
+            first_byte = time.monotonic()
+
+            deltas = self._split(text, output_tokens)
+            fail_at = int(len(deltas) * self.profile.failure_after) if fail else None
+            for index, delta in enumerate(deltas):
+                if index == fail_at:
+                    failed = True
+                    self._count('failed')
+                    raise EventStreamError({'Error': {
+                        'Code': 'modelStreamErrorException',
+                        'Message': 'Simulated model stream error'
+                    }}, 'InvokeModelWithResponseStream')
+                if index:
+                    self._wait(self.profile.tokens_per_delta / self.profile.tokens_per_second)
+                yield _chunk({'type': 'content_block_delta', 'index': 0, 'delta': {'type': 'text_delta', 'text': delta}})
+
+            yield _chunk({'type': 'content_block_stop', 'index': 0})
+            yield _chunk({
+                'type': 'message_delta',
+                'delta': {'stop_reason': stop_reason, 'stop_sequence': None},
+                'usage': {'output_tokens': output_tokens}
+            })
+            # 호출자는 message_stop을 받으면 바로 스트림을 닫으므로 전송 전에 완료 처리
+            finished = True
+            self._count('completed')
+            yield _chunk({
+                'type': 'message_stop',
+                'amazon-bedrock-invocationMetrics': {
+                    'inputTokenCount': input_tokens,
+                    'outputTokenCount': output_tokens,
+                    'invocationLatency': round((time.monotonic() - started) * 1000),
+                    'firstByteLatency': round((first_byte - started) * 1000)
+                }
+            })
+        finally:
+            # 호출자가 스트림을 닫아 중단한 경우 (soft stop, 클라이언트 연결 종료 등)
+            if not finished and not failed:
+                self._count('closed_early')
+
+    def _replay(self, recording: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        previous = 0.0
+        self._count('completed')
+        for event in recording['events']:
+            self._wait(event['t'] - previous, jitter=False)
+            previous = event['t']
+            yield _chunk(event['chunk'])
+
+    def _response(self, request: Dict[str, Any]):
+        """(본문, 입력 토큰, 출력 토큰, stop_reason)"""
+        prompt = [request.get('system') or '']
+        for message in request.get('messages', []):
+            content = message.get('content')
+            prompt.append(content if isinstance(content, str) else json.dumps(content, ensure_ascii=False))
+        input_tokens = sum(SimpleUsageService.estimate_tokens(text) for text in prompt)
+
+        if callable(self.response_text):
+            text = self.response_text(request)
+        elif self.response_text is not None:
+            text = self.response_text
+        else:
+            text = self._article(self.profile.output_tokens)
+
+        max_tokens = request.get('max_tokens') or self.profile.output_tokens
+        tokens = SimpleUsageService.estimate_tokens(text)
+        stop_reason = 'end_turn'
+        if tokens > max_tokens:
+            text = text[:int(len(text) * max_tokens / tokens)]
+            tokens = max_tokens
+            stop_reason = 'max_tokens'
+        return text, input_tokens, tokens, stop_reason
+
+    def _article(self, target_tokens: int) -> str:
+        """목표 토큰 수만큼 기사 형태 문장 생성 (문단 구분 포함)"""
+        with self._lock:
+            rng = random.Random(self._rng.random())
+        sentences = []
+        tokens = 0
+        while tokens < target_tokens:
+            sentence = rng.choice(SENTENCES)
+            if len(sentences) % 4 == 3:
+                sentence += '\n\n'
+            sentences.append(sentence)
+            tokens += SimpleUsageService.estimate_tokens(sentence) + 1
+        return ' '.join(sentences).strip()
+
+    def _split(self, text: str, output_tokens: int) -> List[str]:
+        """tokens_per_delta 토큰 분량씩 나눈 델타 목록"""
+        if not text:
+            return []
+        size = max(1, round(len(text) / max(1, output_tokens) * self.profile.tokens_per_delta))
+        return [text[i:i + size] for i in range(0, len(text), size)]
+
+    # 보조
+
+    def _wait(self, seconds: float, jitter: bool = True) -> None:
+        if self.profile.time_scale <= 0 or seconds <= 0:
+            return
+        if jitter and self.profile.jitter:
+            with self._lock:
+                seconds *= 1 + self._rng.uniform(-self.profile.jitter, self.profile.jitter)
+        self.sleep(seconds * self.profile.time_scale)
+
+    def _maybe_throttle(self, operation: str) -> None:
+        with self._lock:
+            throttled = self._rng.random() < self.profile.throttle_rate
+        if throttled:
+            self._count('throttled')
+            raise ClientError({
+                'Error': {'Code': 'ThrottlingException', 'Message': 'Too many requests, please wait before trying again.'},
+                'ResponseMetadata': {'HTTPStatusCode': 429}
+            }, operation)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+
+class StreamRecorder:
+    """실제 bedrock-runtime 클라이언트를 감싸 스트림 이벤트와 도착 시각을 JSON Lines로 기록"""
+
+    def __init__(self, client, path: str):
+        self.client = client
+        self.path = path
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    def invoke_model_with_response_stream(self, body: str, modelId: str, **kwargs: Any) -> Dict[str, Any]:
+        started = time.monotonic()
+        response = self.client.invoke_model_with_response_stream(body=body, modelId=modelId, **kwargs)
+        stream = response['body']
+
+        def events():
+            recorded = []
+            try:
+                for event in stream:
+                    chunk = event.get('chunk')
+                    if chunk:
+                        recorded.append({
+                            't': round(time.monotonic() - started, 4),
+                            'chunk': json.loads(chunk['bytes'].decode('utf-8'))
+                        })
+                    yield event
+            finally:
+                stream.close()
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({'modelId': modelId, 'events': recorded}, ensure_ascii=False) + '\n')
+
+        return {**response, 'body': SimulatedEventStream(events())}
+
+
+def load_recordings(path: str) -> List[Dict[str, Any]]:
+    """StreamRecorder가 기록한 스트림 목록 로드"""
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def run_streams(client, streams: int) -> List[Dict[str, Any]]:
+    """BedrockClientEnhanced로 스트림을 실행하고 TTFT/처리량 측정"""
+    results = []
+    for i in range(streams):
+        info: Dict[str, Any] = {}
+        started = time.monotonic()
+        first = None
+        text = ''
+        for chunk in client.stream_bedrock(
+            user_message=f'기준금리 동결 기사 작성 {i}',
+            engine_type='11',
+            stream_info=info
+        ):
+            if first is None:
+                first = time.monotonic() - started
+            text += chunk
+        elapsed = time.monotonic() - started
+        tokens = info.get('output_tokens') or SimpleUsageService.estimate_tokens(text)
+        results.append({
+            'ttft_ms': round((first or elapsed) * 1000),
+            'total_ms': round(elapsed * 1000),
+            'output_tokens': tokens,
+            'tokens_per_second': round(tokens / max(elapsed - (first or 0), 1e-6), 1),
+            'stop_reason': info.get('stop_reason'),
+            'error': '[오류]' in text
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--ttft', type=float, default=0.6)
+    parser.add_argument('--tps', type=float, default=60.0)
+    parser.add_argument('--jitter', type=float, default=0.2)
+    parser.add_argument('--tokens', type=int, default=400)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--time-scale', type=float, default=1.0)
+    parser.add_argument('--streams', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--record', help='실제 Bedrock 스트림을 기록할 JSON Lines 경로')
+    parser.add_argument('--replay', help='기록한 스트림 재생')
+    parser.add_argument('--prompt', default='한국은행 기준금리 동결 기사를 작성해줘')
+    args = parser.parse_args()
+
+    from lib.bedrock_client_enhanced import BedrockClientEnhanced
+
+    if args.record:
+        import boto3
+        from src.config.aws import AWS_REGION
+        recorder = StreamRecorder(boto3.client('bedrock-runtime', region_name=AWS_REGION), args.record)
+        results = run_streams(BedrockClientEnhanced(runtime_client=recorder), args.streams)
+        print(json.dumps({'recorded': args.record, 'streams': results}, indent=2, ensure_ascii=False))
+        return
+
+    profile = SimulatorProfile(
+        ttft=args.ttft,
+        tokens_per_second=args.tps,
+        jitter=args.jitter,
+        output_tokens=args.tokens,
+        throttle_rate=args.throttle_rate,
+        failure_rate=args.failure_rate,
+        time_scale=args.time_scale,
+        seed=args.seed
+    )
+    recordings = load_recordings(args.replay) if args.replay else None
+    simulator = BedrockStreamSimulator(profile, recordings=recordings)
+    results = run_streams(BedrockClientEnhanced(runtime_client=simulator), args.streams)
+    print(json.dumps({'profile': vars(profile), 'streams': results, 'stats': simulator.stats}, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""
+Response Compression Benchmark
+REST 응답 압축의 CPU 시간 대비 전송 바이트 비교 (한국어 기사/대화 fixture)
+
+gzip 레벨별, brotli 품질별(설치된 경우) 압축 크기, 압축/해제 시간,
+base64 인코딩 후 실제 응답 크기를 출력합니다.
+
+실행 (backend 디렉토리에서):
+    python tools/bench_compression.py [--repeat 20]
+"""
+import argparse
+import base64
+import gzip
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SENTENCES = [
+    '한국은행이 기준금리를 연 3.25%로 동결했다.',
+    '코스피는 외국인 순매수에 힘입어 전 거래일보다 1.2% 오른 2,650선에서 마감했다.',
+    '정부는 반도체 산업 경쟁력 강화를 위해 33조 원 규모의 지원 방안을 발표했다.',
+    '서울 아파트 매매가격은 7주 연속 상승세를 이어갔다.',
+    '전문가들은 하반기 수출 회복세가 내수로 이어질지 주목하고 있다.',
+    '삼성전자와 SK하이닉스는 고대역폭메모리(HBM) 수요 증가로 실적 개선이 기대된다.',
+    '금융위원회는 가계부채 관리를 위해 스트레스 DSR 2단계를 시행한다고 밝혔다.',
+    '원·달러 환율은 전날보다 4.5원 내린 1,372.3원에 거래를 마쳤다.',
+    '중소기업중앙회는 최저임금 인상에 따른 부담을 호소했다.',
+    '기획재정부는 내년 경제성장률 전망치를 2.2%로 제시했다.',
+]
+
+
+def korean_text(rng: random.Random, sentences: int) -> str:
+    return ' '.join(rng.choice(SENTENCES) for _ in range(sentences))
+
+
+def build_fixtures(seed: int = 7):
+    rng = random.Random(seed)
+
+    conversation_list = {
+        'conversations': [
+            {
+                'conversationId': f'{rng.getrandbits(128):032x}',
+                'userId': 'reporter@sedaily.com',
+                'engineType': rng.choice(['11', '22', '33']),
+                'title': korean_text(rng, 1)[:50],
+                'createdAt': f'2025-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}T09:{rng.randint(10, 59)}:00',
+                'updatedAt': f'2025-0{rng.randint(1, 9)}-2{rng.randint(0, 8)}T18:{rng.randint(10, 59)}:00'
+            }
+            for _ in range(1000)
+        ],
+        'count': 1000,
+        'nextCursor': None
+    }
+
+    conversation_detail = {
+        'conversationId': 'bench',
+        'userId': 'reporter@sedaily.com',
+        'engineType': '11',
+        'title': '금리 동결 기사 작성',
+        'messages': [
+            {
+                'role': role,
+                'type': role,
+                'content': korean_text(rng, 40 if role == 'assistant' else 3),
+                'timestamp': f'2025-06-01T10:{i:02d}:00Z',
+                'metadata': {},
+                'seq': i
+            }
+            for i in range(50)
+            for role in ['user' if i % 2 == 0 else 'assistant']
+        ]
+    }
+
+    prompt_bundle = {
+        'prompt': {
+            'promptId': '11',
+            'description': korean_text(rng, 5),
+            'instruction': korean_text(rng, 60)
+        },
+        'files': [
+            {'fileId': str(i), 'fileName': f'기사_스타일_가이드_{i}.txt', 'fileContent': korean_text(rng, 400)}
+            for i in range(3)
+        ]
+    }
+
+    usage = {'success': True, 'data': {'userId': 'reporter@sedaily.com', 'totalTokens': 12345}}
+
+    return {
+        'conversation_list_1000': conversation_list,
+        'conversation_detail_50': conversation_detail,
+        'prompt_bundle_3_files': prompt_bundle,
+        'usage_small': usage
+    }
+
+
+def encoders():
+    result = [(f'gzip-{level}', lambda raw, level=level: gzip.compress(raw, compresslevel=level, mtime=0),
+               gzip.decompress) for level in (1, 6, 9)]
+    if brotli is not None:
+        result += [(f'br-{quality}', lambda raw, quality=quality: brotli.compress(raw, quality=quality),
+                    brotli.decompress) for quality in (1, 5, 11)]
+    return result
+
+
+def median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    from utils.response import APIResponse, compress_response
+
+    report = {'brotli_available': brotli is not None, 'fixtures': {}}
+
+    for name, data in build_fixtures().items():
+        raw = json.dumps(data, default=str, ensure_ascii=False).encode('utf-8')
+        rows = {'identity': {'bytes': len(raw)}}
+
+        for label, compress, decompress in encoders():
+            packed = compress(raw)
+            assert decompress(packed) == raw
+            rows[label] = {
+                'bytes': len(packed),
+                'base64_bytes': len(base64.b64encode(packed)),
+                'ratio': round(len(raw) / len(packed), 2),
+                'compress_ms': round(median_ms(lambda: compress(raw), args.repeat), 3),
+                'decompress_ms': round(median_ms(lambda: decompress(packed), args.repeat), 3)
+            }
+
+        # 실제 응답 경로 (임계값/협상 포함)
+        response = compress_response(APIResponse.success(data), {'headers': {'Accept-Encoding': 'gzip, br'}})
+        rows['api_response'] = {
+            'content_encoding': response['headers'].get('Content-Encoding', 'identity'),
+            'body_bytes': len(response['body'].encode('utf-8')),
+            'ms': round(median_ms(
+                lambda: compress_response(APIResponse.success(data), {'headers': {'Accept-Encoding': 'gzip, br'}}),
+                args.repeat
+            ), 3)
+        }
+        report['fixtures'][name] = rows
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+Conversation List Benchmark
+GET /conversations 응답 크기/지연 비교 - 기존 전체 조회 vs 요약 커서 페이지
+
+로컬 DynamoDB(moto)에 대화 N개(메시지 포함)를 넣고 핸들러를 직접 호출합니다.
+지연 시간은 moto 기준이므로 절대값보다 상대 비교용으로 사용하세요.
+
+실행 (backend 디렉토리에서):
+    python tools/bench_conversation_list.py --conversations 1200 --messages 12
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.local_aws import configure_environment, create_conversations_table  # noqa: E402
+
+configure_environment()
+
+from moto import mock_aws  # noqa: E402
+
+USER_ID = 'bench@sedaily.com'
+ANSWER = '서울경제신문 기사 초안입니다. 금리 인하 기대감에 코스피가 상승 마감했습니다. ' * 40
+
+
+def seed(table, conversations: int, messages: int) -> None:
+    base = datetime(2025, 1, 1)
+    with table.batch_writer() as batch:
+        for i in range(conversations):
+            created = base + timedelta(minutes=i)
+            updated = created + timedelta(days=(i * 7919) % 300)  # 생성 순서와 다른 활동 순서
+            engine = ('11', '22', '33')[i % 3]
+            batch.put_item(Item={
+                'conversationId': str(uuid.uuid4()),
+                'userId': USER_ID,
+                'engineType': engine,
+                'userEngineType': f'{USER_ID}#{engine}',
+                'title': f'기사 작성 요청 {i}',
+                'messages': [
+                    {
+                        'role': role,
+                        'type': role,
+                        'content': ANSWER if role == 'assistant' else f'질문 {j}',
+                        'timestamp': (created + timedelta(seconds=j)).isoformat(),
+                        'metadata': {}
+                    }
+                    for j in range(messages)
+                    for role in ['user' if j % 2 == 0 else 'assistant']
+                ],
+                'createdAt': created.isoformat(),
+                'updatedAt': updated.isoformat(),
+                'metadata': {}
+            })
+
+
+def legacy_list(service) -> bytes:
+    """변경 전 목록 로직: 최대 1000개 전체 조회 + 메모리 정렬 + 전체 직렬화"""
+    conversations = service.get_user_conversations(USER_ID, limit=1000)
+    conversations.sort(key=lambda x: x.updated_at or x.created_at or '', reverse=True)
+    body = [conv.to_dict() for conv in conversations]
+    return json.dumps({'conversations': body, 'count': len(body)}, default=str).encode('utf-8')
+
+
+def list_via_handler(handler, cursor=None, limit=50):
+    params = {'userId': USER_ID, 'limit': str(limit)}
+    if cursor:
+        params['cursor'] = cursor
+    response = handler({'httpMethod': 'GET', 'pathParameters': None, 'queryStringParameters': params}, None)
+    assert response['statusCode'] == 200, response
+    return response['body'].encode('utf-8'), json.loads(response['body'])
+
+
+def timed(fn, repeat=3):
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--conversations', type=int, default=1200)
+    parser.add_argument('--messages', type=int, default=12)
+    parser.add_argument('--page-size', type=int, default=50)
+    args = parser.parse_args()
+
+    with mock_aws():
+        table = create_conversations_table()
+        seed(table, args.conversations, args.messages)
+
+        from src.services.conversation_service import ConversationService
+        from handlers.api.conversation import handler
+
+        service = ConversationService()
+
+        legacy_ms, legacy_body = timed(lambda: legacy_list(service))
+        page_ms, (page_body, page) = timed(lambda: list_via_handler(handler, limit=args.page_size))
+
+        def walk():
+            total, cursor, pages, previous = 0, None, 0, None
+            while True:
+                body, data = list_via_handler(handler, cursor, args.page_size)
+                total += len(body)
+                pages += 1
+                stamps = [c['updatedAt'] for c in data['conversations']]
+                assert stamps == sorted(stamps, reverse=True)
+                assert previous is None or not stamps or stamps[0] <= previous
+                previous = stamps[-1] if stamps else previous
+                cursor = data['nextCursor']
+                if not cursor:
+                    return total, pages
+
+        walk_ms, (walk_bytes, pages) = timed(walk, repeat=1)
+
+    results = {
+        'conversations': args.conversations,
+        'messages_per_conversation': args.messages,
+        'legacy_full_list': {'bytes': len(legacy_body), 'ms': round(legacy_ms, 1)},
+        'first_page': {'page_size': args.page_size, 'bytes': len(page_body), 'ms': round(page_ms, 1)},
+        'all_pages': {'pages': pages, 'bytes': walk_bytes, 'ms': round(walk_ms, 1)},
+        'first_page_reduction': f'{len(legacy_body) / max(len(page_body), 1):.0f}x'
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+Fast Read Benchmark
+50개 메시지 대화 조회: resource 계층(TypeDeserializer + from_dict) vs 저수준 client + 전용 디코더
+
+- decode: 같은 와이어 응답을 변환하는 CPU 시간만 비교 (네트워크 제외)
+- find_by_id: moto 위에서 리포지토리 전체 경로 비교 (캐시 비활성화)
+
+실행 (backend 디렉토리에서):
+    python tools/bench_fast_read.py [--conversations 200] [--repeat 5]
+"""
+import argparse
+import base64
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.local_aws import configure_environment, create_conversations_table  # noqa: E402
+
+configure_environment()
+
+from moto import mock_aws  # noqa: E402
+
+PARAGRAPH = '한국은행이 기준금리를 연 3.25%로 동결했다. 시장에서는 하반기 인하 가능성에 주목하고 있다. '
+
+
+def build_conversation(Conversation, Message, rng, index):
+    return Conversation(
+        conversation_id=f'bench-{index}',
+        user_id='reporter@sedaily.com',
+        engine_type='11',
+        title=f'기사 초안 {index}',
+        messages=[
+            Message(
+                role='user' if i % 2 == 0 else 'assistant',
+                content=PARAGRAPH * (rng.randint(1, 3) if i % 2 == 0 else rng.randint(15, 40)),
+                timestamp=f'2025-06-01T10:{i:02d}:00Z',
+                metadata={'tokens': rng.randint(10, 4000)}
+            )
+            for i in range(50)
+        ],
+        metadata={'messageSeqBase': 0}
+    )
+
+
+def median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--conversations', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with mock_aws():
+        create_conversations_table()
+
+        from boto3.dynamodb.types import TypeDeserializer
+        from src.config.business import CONVERSATION_CACHE_CONFIG
+        from src.models import Conversation, Message
+        from src.repositories import ConversationRepository
+        from src.repositories.fast_read import decode_conversation
+
+        CONVERSATION_CACHE_CONFIG['enabled'] = False
+        rng = random.Random(7)
+        repository = ConversationRepository()
+        ids = []
+        for index in range(args.conversations):
+            ids.append(repository.save(build_conversation(Conversation, Message, rng, index)).conversation_id)
+
+        wire_items = [
+            repository.client.get_item(TableName=repository.table.name, Key={'conversationId': {'S': cid}})['Item']
+            for cid in ids
+        ]
+        deserializer = TypeDeserializer()
+
+        def resource_decode():
+            for item in wire_items:
+                Conversation.from_dict({key: deserializer.deserialize(value) for key, value in item.items()})
+
+        def fast_decode():
+            for item in wire_items:
+                decode_conversation(item)
+
+        assert all(
+            decode_conversation(item) == Conversation.from_dict(
+                {key: deserializer.deserialize(value) for key, value in item.items()}
+            )
+            for item in wire_items
+        )
+
+        resource_repository = ConversationRepository()
+        resource_repository.client = None
+
+        def find_all(repo):
+            return lambda: [repo.find_by_id(cid) for cid in ids]
+
+        # 와이어 크기 - B(바이너리) 값은 전송 시와 같이 base64로 계산 (압축 본문 contentBin)
+        item_bytes = statistics.mean(
+            len(json.dumps(
+                item, ensure_ascii=False, default=lambda value: base64.b64encode(value).decode('ascii')
+            ).encode('utf-8'))
+            for item in wire_items
+        )
+        decode_resource = median_ms(resource_decode, args.repeat)
+        decode_fast = median_ms(fast_decode, args.repeat)
+        report = {
+            'conversations': len(ids),
+            'messages_per_conversation': 50,
+            'avg_wire_item_kb': round(item_bytes / 1024, 1),
+            'decode_ms_per_item': {
+                'resource_typedeserializer_from_dict': round(decode_resource / len(ids), 4),
+                'client_decode_conversation': round(decode_fast / len(ids), 4),
+                'speedup': round(decode_resource / decode_fast, 2)
+            },
+            'find_by_id_total_ms_moto': {
+                'resource': median_ms(find_all(resource_repository), args.repeat),
+                'client': median_ms(find_all(repository), args.repeat)
+            }
+        }
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
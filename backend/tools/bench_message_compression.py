@@ -0,0 +1,148 @@
+"""
+Message Compression Benchmark
+메시지 본문 압축 저장 시 아이템 크기/용량 단위/CPU 비용 비교
+
+- item_kb, rcu_per_strong_read, wcu_per_write: 50개 메시지 대화 아이템 (DynamoDB 크기 규칙 근사)
+- max_messages_in_400kb: 아이템 한도 내 보관 가능한 메시지 수
+- compress/decompress: 메시지당 CPU 시간
+
+실행 (backend 디렉토리에서):
+    python tools/bench_message_compression.py [--messages 50] [--level 6]
+"""
+import argparse
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import Conversation, Message  # noqa: E402
+from src.models.content_codec import encode_message, read_content  # noqa: E402
+
+SUBJECTS = ['한국은행', '금융위원회', '기획재정부', '삼성전자', 'SK하이닉스', '현대차', '코스피', '원·달러 환율', '서울 아파트값', '수출']
+VERBS = ['상승했다', '하락했다', '동결했다', '발표했다', '전망했다', '밝혔다', '강조했다', '우려를 나타냈다']
+CONTEXTS = ['전 거래일 대비', '지난해 같은 기간보다', '시장 예상과 달리', '외국인 순매수에 힘입어', '금리 인하 기대감 속에',
+            '하반기 경기 회복 흐름에 따라', '정부 지원 방안 발표 이후', '반도체 업황 개선으로']
+
+ITEM_LIMIT = 400 * 1024
+
+
+def article(rng: random.Random, target_bytes: int) -> str:
+    """기사 형태의 한국어 본문 (문장 조합 + 수치 - 단순 반복보다 압축률이 현실적)"""
+    sentences = []
+    size = 0
+    while size < target_bytes:
+        sentence = (
+            f"{rng.choice(SUBJECTS)}은(는) {rng.choice(CONTEXTS)} {rng.randint(1, 999)}.{rng.randint(0, 99)}% "
+            f"{rng.choice(VERBS)}. {rng.choice(SUBJECTS)} 관계자는 \"{rng.choice(CONTEXTS)} {rng.randint(2, 40)}조 원 규모\"라고 "
+            f"{rng.choice(VERBS)}."
+        )
+        if rng.random() < 0.1:
+            sentence += '\n\n## ' + rng.choice(SUBJECTS) + ' 동향\n'
+        sentences.append(sentence)
+        size += len(sentence.encode('utf-8')) + 1
+    return ' '.join(sentences)
+
+
+def attribute_size(value) -> int:
+    """DynamoDB 속성 값 크기 근사 (문자열 UTF-8, 숫자 ~21바이트 이하, 리스트/맵 3바이트 + 원소당 1바이트)"""
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, bool) or value is None:
+        return 1
+    if isinstance(value, (int, float, Decimal)):
+        return min(21, len(str(value)) // 2 + 1)
+    if isinstance(value, dict):
+        return 3 + sum(len(k.encode('utf-8')) + attribute_size(v) + 1 for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return 3 + sum(attribute_size(v) + 1 for v in value)
+    return len(str(value))
+
+
+def item_size(item) -> int:
+    return sum(len(k.encode('utf-8')) + attribute_size(v) for k, v in item.items())
+
+
+def build_item(messages, min_bytes, level):
+    conversation = Conversation(
+        conversation_id='bench', user_id='reporter@sedaily.com', engine_type='11', title='기사 초안',
+        messages=messages, created_at='2025-06-01T10:00:00', updated_at='2025-06-01T11:00:00'
+    )
+    item = conversation.to_dict()
+    if min_bytes is not None:
+        item['messages'] = [encode_message(m, min_bytes, level) for m in item['messages']]
+    return item
+
+
+def median_ms(fn, repeat=5):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--messages', type=int, default=50)
+    parser.add_argument('--level', type=int, default=6)
+    parser.add_argument('--min-bytes', type=int, default=2048)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    messages = []
+    for i in range(args.messages):
+        if i % 2 == 0:
+            messages.append(Message(role='user', content=article(rng, rng.randint(100, 600)), timestamp='t'))
+        else:
+            messages.append(Message(role='assistant', content=article(rng, rng.randint(10_000, 40_000)), timestamp='t'))
+
+    plain = build_item(messages, None, args.level)
+    packed = build_item(messages, args.min_bytes, args.level)
+    assert [read_content(m) for m in packed['messages']] == [m.content for m in messages]
+
+    def per_message_size(item):
+        return (item_size(item) - item_size({**item, 'messages': []})) / len(item['messages'])
+
+    def summary(item):
+        size = item_size(item)
+        base = item_size({**item, 'messages': []})
+        return {
+            'item_kb': round(size / 1024, 1),
+            'fits_400kb': size <= ITEM_LIMIT,
+            'rcu_per_strong_read': math.ceil(size / 4096),
+            'wcu_per_write': math.ceil(size / 1024),
+            'max_messages_in_400kb': int((ITEM_LIMIT - base) / per_message_size(item))
+        }
+
+    assistant = [m.to_dict() for m in messages if m.role == 'assistant']
+    encoded = [encode_message(m, args.min_bytes, args.level) for m in assistant]
+
+    report = {
+        'messages': args.messages,
+        'avg_assistant_kb': round(statistics.mean(len(m['content'].encode('utf-8')) for m in assistant) / 1024, 1),
+        'plain': summary(plain),
+        'compressed': summary(packed),
+        'compression_ratio': round(
+            sum(len(m['content'].encode('utf-8')) for m in assistant) / sum(len(m['contentBin']) for m in encoded), 2
+        ),
+        'cpu_ms_per_assistant_message': {
+            'compress': round(median_ms(
+                lambda: [encode_message(m, args.min_bytes, args.level) for m in assistant]
+            ) / len(assistant), 3),
+            'decompress': round(median_ms(lambda: [read_content(m) for m in encoded]) / len(assistant), 3)
+        }
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+"""
+Domain Model Benchmark
+기존 dataclass 모델과 __slots__ 모델의 메모리/변환 시간 비교
+
+- memory: 메시지 1000개 모델 생성 시 할당 바이트 (tracemalloc, 원본 dict 제외)
+- from_dict/to_dict: 50개 메시지 대화 변환 시간
+- append_save: 조회 -> 메시지 추가 -> to_dict (WebSocket 메시지 저장 경로)
+
+실행 (backend 디렉토리에서):
+    python tools/bench_models.py [--repeat 2000]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import Conversation, Message  # noqa: E402
+
+
+@dataclass
+class LegacyMessage:
+    """기존 Message (dataclass)"""
+    role: str
+    content: str
+    timestamp: Optional[str] = None
+    type: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = field(default_factory=dict)
+
+
+@dataclass
+class LegacyConversation:
+    """기존 Conversation (dataclass, 즉시 변환)"""
+    conversation_id: str
+    user_id: str
+    engine_type: str
+    title: Optional[str] = None
+    messages: List[LegacyMessage] = field(default_factory=list)
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'conversationId': self.conversation_id,
+            'userId': self.user_id,
+            'engineType': self.engine_type,
+            'title': self.title,
+            'messages': [
+                {
+                    'role': msg.role,
+                    'type': msg.type or msg.role,
+                    'content': msg.content,
+                    'timestamp': msg.timestamp,
+                    'metadata': msg.metadata
+                }
+                for msg in self.messages
+            ],
+            'createdAt': self.created_at or datetime.now().isoformat(),
+            'updatedAt': self.updated_at or datetime.now().isoformat(),
+            'metadata': self.metadata
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LegacyConversation':
+        messages = [
+            LegacyMessage(
+                role=msg['role'],
+                content=msg['content'],
+                timestamp=msg.get('timestamp'),
+                type=msg.get('type', msg['role']),
+                metadata=msg.get('metadata', {})
+            )
+            for msg in data.get('messages', [])
+        ]
+        return cls(
+            conversation_id=data['conversationId'],
+            user_id=data['userId'],
+            engine_type=data['engineType'],
+            title=data.get('title'),
+            messages=messages,
+            created_at=data.get('createdAt'),
+            updated_at=data.get('updatedAt'),
+            metadata=data.get('metadata', {})
+        )
+
+
+def stored_item(messages: int) -> Dict[str, Any]:
+    """DynamoDB에서 읽은 형태의 대화 아이템 (role/type 문자열은 메시지마다 별도 객체)"""
+    return {
+        'conversationId': 'bench',
+        'userId': 'reporter@sedaily.com',
+        'engineType': '11',
+        'title': '금리 동결 기사 작성',
+        'messages': [
+            {
+                'role': ''.join(['user' if i % 2 == 0 else 'assistant']),
+                'type': ''.join(['user' if i % 2 == 0 else 'assistant']),
+                'content': f'메시지 {i} ' + '한국은행이 기준금리를 동결했다. ' * 5,
+                'timestamp': f'2025-06-01T10:{i % 60:02d}:00Z',
+                'metadata': {}
+            }
+            for i in range(messages)
+        ],
+        'createdAt': '2025-06-01T10:00:00',
+        'updatedAt': '2025-06-01T11:00:00',
+        'metadata': {}
+    }
+
+
+def measure_memory(model, item) -> int:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    conversation = model.from_dict(item)
+    _ = conversation.messages[-1].metadata  # 메시지 변환 강제 (lazy 모델 포함)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del conversation
+    return allocated
+
+
+def median_us(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1_000_000)
+    return round(statistics.median(samples), 1)
+
+
+def append_save(model, message_cls, item):
+    def run():
+        conversation = model.from_dict(item)
+        conversation.messages.append(message_cls(role='user', content='새 메시지', timestamp='t'))
+        conversation.to_dict()
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    thousand = stored_item(1000)
+    fifty = stored_item(50)
+
+    assert Conversation.from_dict(fifty).to_dict() == LegacyConversation.from_dict(fifty).to_dict()
+
+    legacy_memory = measure_memory(LegacyConversation, thousand)
+    slotted_memory = measure_memory(Conversation, thousand)
+
+    report = {
+        'memory_bytes_per_1000_messages': {
+            'legacy_dataclass': legacy_memory,
+            'slotted': slotted_memory,
+            'reduction_pct': round(100 * (1 - slotted_memory / legacy_memory), 1)
+        },
+        'conversion_us_50_messages': {
+            'legacy_from_dict': median_us(lambda: LegacyConversation.from_dict(fifty), args.repeat),
+            'slotted_from_dict_lazy': median_us(lambda: Conversation.from_dict(fifty), args.repeat),
+            'slotted_from_dict_materialized': median_us(
+                lambda: Conversation.from_dict(fifty).messages, args.repeat
+            ),
+            'legacy_round_trip': median_us(lambda: LegacyConversation.from_dict(fifty).to_dict(), args.repeat),
+            'slotted_round_trip': median_us(lambda: Conversation.from_dict(fifty).to_dict(), args.repeat),
+            'slotted_messages_only': median_us(
+                lambda: Conversation.from_dict(fifty).to_dict(fields=('messages',)), args.repeat
+            ),
+            'legacy_append_save': median_us(append_save(LegacyConversation, LegacyMessage, fifty), args.repeat),
+            'slotted_append_save': median_us(append_save(Conversation, Message, fifty), args.repeat)
+        }
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
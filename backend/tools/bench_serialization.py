@@ -0,0 +1,154 @@
+"""
+Serialization Benchmark
+DynamoDB 항목 JSON 직렬화 경로 비교
+
+- legacy: decimal_to_float 재귀 변환 + json.dumps(default=str)
+- stdlib: utils.serialization (표준 json + Decimal default)
+- orjson: utils.serialization (orjson 설치 시)
+- ai_chunk: dict + json.dumps 대비 encode_ai_chunk
+
+실행 (backend 디렉토리에서):
+    python tools/bench_serialization.py [--repeat 30]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import serialization  # noqa: E402
+
+
+def legacy_decimal_to_float(obj):
+    """기존 SimpleUsageService.decimal_to_float"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    elif isinstance(obj, dict):
+        return {k: legacy_decimal_to_float(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [legacy_decimal_to_float(v) for v in obj]
+    return obj
+
+
+def legacy_dumps(obj) -> str:
+    return json.dumps(legacy_decimal_to_float(obj), default=str, ensure_ascii=False)
+
+
+def build_usage_payload(rng: random.Random):
+    """get_all_usage 형태 - 엔진 5개 x 365일 사용량 레코드"""
+    usage = {}
+    for engine in ('11', '22', '33', 'T5', 'H8'):
+        usage[engine] = [
+            {
+                'userId': 'reporter@sedaily.com',
+                'date': f'2025-{1 + day // 31:02d}-{1 + day % 28:02d}#{engine}',
+                'engineType': engine,
+                'usageDate': f'2025-{1 + day // 31:02d}-{1 + day % 28:02d}',
+                'totalTokens': Decimal(rng.randint(1_000, 200_000)),
+                'inputTokens': Decimal(rng.randint(500, 100_000)),
+                'outputTokens': Decimal(rng.randint(500, 100_000)),
+                'messageCount': Decimal(rng.randint(1, 300)),
+                'estimatedCost': Decimal(f'{rng.random() * 10:.4f}'),
+                'updatedAt': '2025-06-01T10:00:00+00:00'
+            }
+            for day in range(365)
+        ]
+    return {'success': True, 'data': usage}
+
+
+def build_conversation_payload(rng: random.Random):
+    """대화 상세 - 메시지 200개 (메타데이터에 Decimal 포함)"""
+    return {
+        'conversationId': 'bench',
+        'userId': 'reporter@sedaily.com',
+        'title': '금리 동결 기사 작성',
+        'messageCount': Decimal(200),
+        'messages': [
+            {
+                'role': 'user' if i % 2 == 0 else 'assistant',
+                'content': '한국은행이 기준금리를 연 3.25%로 동결했다. ' * rng.randint(2, 40),
+                'timestamp': f'2025-06-01T10:{i % 60:02d}:00Z',
+                'metadata': {'tokens': Decimal(rng.randint(10, 4000)), 'latency': Decimal(f'{rng.random():.3f}')},
+                'seq': i
+            }
+            for i in range(200)
+        ]
+    }
+
+
+def median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def bench_payload(payload, repeat: int):
+    accelerated = serialization.orjson
+    result = {
+        'bytes': len(serialization.dumps(payload).encode('utf-8')),
+        'legacy_ms': median_ms(lambda: legacy_dumps(payload), repeat)
+    }
+    try:
+        serialization.orjson = None
+        result['stdlib_ms'] = median_ms(lambda: serialization.dumps(payload), repeat)
+    finally:
+        serialization.orjson = accelerated
+    if accelerated is not None:
+        result['orjson_ms'] = median_ms(lambda: serialization.dumps(payload), repeat)
+    return result
+
+
+def bench_ai_chunk(repeat: int, chunks: int = 2000):
+    chunk = '코스피는 외국인 순매수에 힘입어 '
+    timestamp = '2025-06-01T10:00:00.123456Z'
+
+    def legacy():
+        for index in range(chunks):
+            json.dumps({'type': 'ai_chunk', 'chunk': chunk, 'chunk_index': index, 'timestamp': timestamp},
+                       ensure_ascii=False, default=str)
+
+    def precomputed():
+        for index in range(chunks):
+            serialization.encode_ai_chunk(chunk, index, timestamp)
+
+    assert json.loads(serialization.encode_ai_chunk(chunk, 3, timestamp)) == {
+        'type': 'ai_chunk', 'chunk': chunk, 'chunk_index': 3, 'timestamp': timestamp
+    }
+    return {
+        'chunks': chunks,
+        'dict_json_dumps_ms': median_ms(legacy, repeat),
+        'encode_ai_chunk_ms': median_ms(precomputed, repeat)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=30)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    usage = build_usage_payload(rng)
+    conversation = build_conversation_payload(rng)
+
+    # 새 경로는 정수 Decimal을 int로 유지 - 값 자체는 기존 경로와 동일해야 함
+    assert json.loads(serialization.dumps(usage)) == json.loads(legacy_dumps(usage))
+
+    report = {
+        'accelerated_backend': serialization.accelerated_backend(),
+        'usage_all_engines_365d': bench_payload(usage, args.repeat),
+        'conversation_detail_200': bench_payload(conversation, args.repeat),
+        'ai_chunk_frames': bench_ai_chunk(args.repeat)
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
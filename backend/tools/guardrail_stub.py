@@ -0,0 +1,205 @@
+"""
+Guardrail Stub
+Bedrock 가드레일 스트리밍 평가를 흉내 내는 로컬 스텁과 모드별 지연 비교 스크립트
+
+StubGuardrailRuntime은 bedrock-runtime 클라이언트의 invoke_model_with_response_stream을
+대체해 Bedrock과 같은 이벤트(content_block_delta, message_delta, message_stop,
+amazon-bedrock-guardrailAction, amazon-bedrock-trace)를 생성합니다.
+
+- 가드레일 없음: 청크를 생성 간격대로 전송
+- SYNCHRONOUS: 청크마다 평가가 끝난 뒤 전송 (평가 시간만큼 첫 청크 지연)
+- ASYNCHRONOUS: 청크를 바로 전송하고 평가는 병렬 진행 - 차단어가 포함된 청크의
+  평가가 끝나는 시점(eval_delay 후)에 개입 이벤트 전송
+
+실행 (backend 디렉토리에서):
+    python tools/guardrail_stub.py [--eval-ms 120] [--chunk-ms 30]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config.aws import GUARDRAIL_CONFIG  # noqa: E402
+import lib.bedrock_client_enhanced as bedrock_module  # noqa: E402
+from lib.bedrock_client_enhanced import GUARDRAIL_STOP_REASON, stream_claude_response_enhanced  # noqa: E402
+
+BLOCKED_MESSAGE = '[스텁] 가드레일 정책에 따라 차단된 응답입니다.'
+
+
+def _event(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {'chunk': {'bytes': json.dumps(payload, ensure_ascii=False).encode('utf-8')}}
+
+
+def _text_event(text: str, **extra: Any) -> Dict[str, Any]:
+    return _event({
+        'type': 'content_block_delta',
+        'index': 0,
+        'delta': {'type': 'text_delta', 'text': text},
+        **extra
+    })
+
+
+class StubGuardrailRuntime:
+    """가드레일 스트리밍 평가를 흉내 내는 bedrock-runtime 스텁"""
+
+    def __init__(
+        self,
+        chunks: Sequence[str],
+        blocked_terms: Sequence[str] = ('차단어',),
+        chunk_delay: float = 0.03,
+        eval_delay: float = 0.12,
+        blocked_message: str = BLOCKED_MESSAGE
+    ):
+        """
+        Args:
+            chunks: 모델이 생성할 응답 청크
+            blocked_terms: 포함되면 가드레일이 개입하는 단어
+            chunk_delay: 청크 생성 간격 (초)
+            eval_delay: 청크당 가드레일 평가 시간 (초)
+            blocked_message: 개입 시 전송할 차단 메시지
+        """
+        self.chunks = list(chunks)
+        self.blocked_terms = list(blocked_terms)
+        self.chunk_delay = chunk_delay
+        self.eval_delay = eval_delay
+        self.blocked_message = blocked_message
+        self.requests: List[Dict[str, Any]] = []
+
+    def invoke_model_with_response_stream(self, body: str, modelId: str, **kwargs: Any) -> Dict[str, Any]:
+        request = json.loads(body)
+        self.requests.append({'modelId': modelId, 'body': request, **kwargs})
+
+        mode = None
+        if kwargs.get('guardrailIdentifier'):
+            mode = request.get('amazon-bedrock-guardrailConfig', {}).get('streamProcessingMode', 'SYNCHRONOUS')
+        return {'body': self._events(mode)}
+
+    def _blocked(self, chunk: str) -> bool:
+        return any(term in chunk for term in self.blocked_terms)
+
+    def _events(self, mode: Optional[str]) -> Iterator[Dict[str, Any]]:
+        yield _event({'type': 'message_start', 'message': {'role': 'assistant'}})
+
+        evaluations = 0
+        pending_block_at = None  # 비동기 모드: 차단 청크 평가가 끝나는 시각
+        for chunk in self.chunks:
+            time.sleep(self.chunk_delay)
+
+            if mode == 'SYNCHRONOUS':
+                # 평가가 끝날 때까지 청크를 보류
+                time.sleep(self.eval_delay)
+                evaluations += 1
+                if self._blocked(chunk):
+                    yield from self._intervene(evaluations)
+                    return
+
+            elif mode == 'ASYNCHRONOUS':
+                if pending_block_at is not None and time.monotonic() >= pending_block_at:
+                    yield from self._intervene(evaluations)
+                    return
+                evaluations += 1
+                if pending_block_at is None and self._blocked(chunk):
+                    pending_block_at = time.monotonic() + self.eval_delay
+
+            yield _text_event(chunk)
+
+        if pending_block_at is not None:
+            time.sleep(max(0.0, pending_block_at - time.monotonic()))
+            yield from self._intervene(evaluations)
+            return
+
+        yield _event({'type': 'message_delta', 'delta': {'stop_reason': 'end_turn'}, 'usage': {'output_tokens': len(self.chunks)}})
+        yield _event({'type': 'message_stop', **self._trace(mode, evaluations)})
+
+    def _intervene(self, evaluations: int) -> Iterator[Dict[str, Any]]:
+        yield _text_event(self.blocked_message, **{'amazon-bedrock-guardrailAction': 'INTERVENED'})
+        yield _event({'type': 'message_delta', 'delta': {'stop_reason': 'end_turn'}, 'usage': {'output_tokens': evaluations}})
+        yield _event({'type': 'message_stop', **self._trace('INTERVENED', evaluations)})
+
+    def _trace(self, mode: Optional[str], evaluations: int) -> Dict[str, Any]:
+        if mode is None:
+            return {}
+        latency = round(self.eval_delay * 1000)
+        return {'amazon-bedrock-trace': {'guardrail': {'outputs': [
+            {'stub': {'invocationMetrics': {'guardrailProcessingLatency': latency}}} for _ in range(evaluations)
+        ]}}}
+
+
+@contextmanager
+def install(runtime: StubGuardrailRuntime, mode: Optional[str] = 'ASYNCHRONOUS'):
+    """
+    스텁 런타임과 가드레일 모드를 임시로 적용
+
+    Args:
+        runtime: 스텁 런타임
+        mode: ASYNCHRONOUS, SYNCHRONOUS 또는 None(가드레일 미적용)
+    """
+    original_runtime = bedrock_module.bedrock_runtime
+    original_config = dict(GUARDRAIL_CONFIG)
+    bedrock_module.bedrock_runtime = runtime
+    GUARDRAIL_CONFIG['enabled'] = mode is not None
+    if mode:
+        GUARDRAIL_CONFIG['stream_processing_mode'] = mode
+    try:
+        yield runtime
+    finally:
+        bedrock_module.bedrock_runtime = original_runtime
+        GUARDRAIL_CONFIG.clear()
+        GUARDRAIL_CONFIG.update(original_config)
+
+
+def run(chunks: Sequence[str], mode: Optional[str], chunk_delay: float, eval_delay: float) -> Dict[str, Any]:
+    """스텁으로 스트리밍을 실행하고 지연/개입 결과 반환"""
+    runtime = StubGuardrailRuntime(chunks, chunk_delay=chunk_delay, eval_delay=eval_delay)
+    info: Dict[str, Any] = {}
+    with install(runtime, mode):
+        started = time.monotonic()
+        delivered = list(stream_claude_response_enhanced('질문', '시스템 프롬프트', stream_info=info))
+        total_ms = round((time.monotonic() - started) * 1000)
+
+    return {
+        'first_chunk_ms': info.get('first_chunk_ms'),
+        'total_ms': total_ms,
+        'chunks_delivered': len(delivered),
+        'intervened': info.get('stop_reason') == GUARDRAIL_STOP_REASON,
+        'guardrail_latency_ms': info.get('guardrail_latency_ms'),
+        'guardrail_message': info.get('guardrail_message')
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--eval-ms', type=int, default=120)
+    parser.add_argument('--chunk-ms', type=int, default=30)
+    args = parser.parse_args()
+    chunk_delay, eval_delay = args.chunk_ms / 1000, args.eval_ms / 1000
+
+    clean = [f'문단 {i}의 기사 내용입니다. ' for i in range(12)]
+    blocked = clean[:4] + ['여기에 차단어가 포함됩니다. '] + clean[5:]
+
+    report = {}
+    for label, mode in (('off', None), ('sync', 'SYNCHRONOUS'), ('async', 'ASYNCHRONOUS')):
+        report[label] = {
+            'clean': run(clean, mode, chunk_delay, eval_delay),
+            'blocked': run(blocked, mode, chunk_delay, eval_delay)
+        }
+
+    # 비동기 모드: 첫 청크 지연이 가드레일 미적용과 비슷하고, 개입은 평가 시간 내에 도착
+    assert not report['async']['clean']['intervened']
+    assert report['async']['blocked']['intervened']
+    assert report['async']['blocked']['guardrail_message'] == BLOCKED_MESSAGE
+    assert report['sync']['blocked']['intervened']
+    assert report['sync']['blocked']['chunks_delivered'] == 4
+    assert not report['off']['blocked']['intervened']
+    assert report['async']['clean']['first_chunk_ms'] < report['sync']['clean']['first_chunk_ms']
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Knowledge Base Normalization Report
+지식베이스 파일 정규화 절감량 리포트 / 저장된 파일 정리본 백필
+
+- 로컬 파일: 정규화 결과와 파일별 토큰 절감량 출력 (AWS 불필요)
+- --engine: files 테이블의 해당 엔진 파일 compactContent 재생성 후 리포트 출력
+- 파일/엔진을 지정하지 않으면 PDF 추출 형태의 샘플 문서로 실행
+
+실행 (backend 디렉토리에서):
+    python tools/kb_normalize.py guide.txt style.txt [--show]
+    python tools/kb_normalize.py --engine 11
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.knowledge_base_normalizer import normalize_document  # noqa: E402
+
+
+def sample_document(pages: int = 8) -> str:
+    """브라우저 PDF 추출 형태의 샘플 (머리말/꼬리말, 쪽 번호, 하이픈 줄바꿈, 공백 정렬 표)"""
+    body = []
+    for page in range(1, pages + 1):
+        body.append(
+            f"서울경제신문 기사 작성 가이드라인 {page}\n"
+            "대외비 · 사내 교육용\n\n"
+            f"{page}. 기사 제목은   30자 이내로   핵심 수치를 앞에 배치한다.  "
+            "리드는 육하원칙을 한 문장에 담는다.\n"
+            "Reuters and Bloomberg copy is trans-\n"
+            "lated and re-verified before publication.\n"
+            "구분        기준            비고\n"
+            f"제목        30자 이내        필수\n"
+            f"부제        {40 + page}자 이내        선택\n"
+            "────────────────────────────\n"
+            "본 자료의 무단 전재 및 재배포를 금지하며, 외부 공개 시 관련 규정에 따라 책임을 물을 수 있습니다.\n\n"
+            f"- {page} -\n\f"
+        )
+    return ''.join(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('paths', nargs='*', help='정규화할 로컬 텍스트 파일')
+    parser.add_argument('--engine', help='files 테이블의 엔진 파일 정리본 재생성')
+    parser.add_argument('--show', action='store_true', help='정규화 결과 본문 출력')
+    args = parser.parse_args()
+
+    if args.engine:
+        from src.services import EnginePromptService
+        reports = EnginePromptService().normalize_files(args.engine)
+        print(json.dumps(reports, indent=2, ensure_ascii=False))
+        return
+
+    documents = {}
+    for path in args.paths:
+        with open(path, encoding='utf-8') as f:
+            documents[os.path.basename(path)] = f.read()
+    if not documents:
+        documents['sample.txt'] = sample_document()
+
+    reports = []
+    for name, text in documents.items():
+        result = normalize_document(text)
+        reports.append({'fileName': name, **result.to_report()})
+        if args.show:
+            print(f"===== {name} =====\n{result.content}\n")
+
+    print(json.dumps(reports, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,363 @@
+"""
+WebSocket Chat Load Generator
+handlers/websocket/message.handler 부하 테스트 (AWS 없이 로컬 실행)
+
+N명의 가상 사용자가 동시에 sendMessage 이벤트로 대화를 이어가며 핸들러를 직접 호출합니다.
+- DynamoDB/S3: moto (tools/local_aws.py - 배포 스크립트와 같은 키/인덱스)
+- Bedrock: tools/bedrock_simulator.py (TTFT/속도/스로틀링 설정)
+- API Gateway Management API: 프레임 도착 시각을 기록하는 스텁
+
+리포트 (JSON - 커밋 간 비교용):
+- ttft_ms / turn_ms: 첫 ai_chunk 프레임까지 / 핸들러 완료까지 p50/p95/p99
+- frames_per_second: 전체 실행 동안 전송된 프레임 처리량
+- aws_calls_per_turn: 턴당 서비스/오퍼레이션별 평균 호출 수 (botocore before-call 훅 + 스텁)
+- memory: 부하 실행 후 순차 실행한 턴의 호출당 최대 할당(tracemalloc)과 프로세스 최대 RSS
+
+실행 (backend 디렉토리에서):
+    python tools/load_websocket_chat.py --users 20 --turns 3 [--ttft 0.6 --tps 60 --tokens 400]
+                                        [--time-scale 0.1] [--output results.json]
+
+Note: moto가 필요합니다 (pip install "moto[dynamodb,s3]").
+"""
+import argparse
+import functools
+import json
+import logging
+import os
+import re
+import resource
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import local_aws  # noqa: E402
+
+DOMAIN = 'load.local'
+STAGE = 'load'
+
+_FRAME_TYPE = re.compile(r'"type":\s*"([a-z_]+)"')
+
+# 현재 스레드에서 실행 중인 턴의 AWS 호출 카운터
+_turn = threading.local()
+_unattributed = Counter()
+_unattributed_lock = threading.Lock()
+
+
+def record_call(name: str) -> None:
+    """현재 턴에 AWS 호출 기록 (턴 밖의 호출은 unattributed로 집계)"""
+    calls = getattr(_turn, 'calls', None)
+    if calls is not None:
+        calls[name] += 1
+    else:
+        with _unattributed_lock:
+            _unattributed[name] += 1
+
+
+def _count_botocore_call(model, **kwargs) -> None:
+    record_call(f"{model.service_model.service_name}.{model.name}")
+
+
+class GoneException(Exception):
+    """apigatewaymanagementapi GoneException 대체"""
+
+
+class StubApiGateway:
+    """API Gateway Management API 스텁 - 연결별 프레임 도착 시각/크기/타입 기록"""
+
+    class exceptions:
+        GoneException = GoneException
+
+    def __init__(self):
+        self.frames: Dict[str, List[Any]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def post_to_connection(self, ConnectionId: str, Data) -> Dict[str, Any]:
+        received = time.monotonic()
+        record_call('apigatewaymanagementapi.PostToConnection')
+        text = Data.decode('utf-8') if isinstance(Data, (bytes, bytearray)) else Data
+        match = _FRAME_TYPE.search(text[:64])
+        with self._lock:
+            self.frames[ConnectionId].append((received, match.group(1) if match else 'unknown', len(text), text))
+        return {}
+
+    def take(self, connection_id: str) -> List[Any]:
+        with self._lock:
+            return self.frames.pop(connection_id, [])
+
+
+class CountingRuntime:
+    """Bedrock 런타임 호출 수 집계 프록시"""
+
+    def __init__(self, runtime):
+        self.runtime = runtime
+
+    def invoke_model_with_response_stream(self, **kwargs):
+        record_call('bedrock-runtime.InvokeModelWithResponseStream')
+        return self.runtime.invoke_model_with_response_stream(**kwargs)
+
+    def invoke_model(self, **kwargs):
+        record_call('bedrock-runtime.InvokeModel')
+        return self.runtime.invoke_model(**kwargs)
+
+
+class LambdaContext:
+    """핸들러에 전달할 최소 Lambda 컨텍스트"""
+
+    function_name = 'load-websocket-message'
+    memory_limit_in_mb = 1024
+
+    def __init__(self):
+        self.aws_request_id = str(uuid.uuid4())
+        self._deadline = time.monotonic() + 900
+
+    def get_remaining_time_in_millis(self) -> int:
+        return int((self._deadline - time.monotonic()) * 1000)
+
+
+def percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {'p50': None, 'p95': None, 'p99': None, 'max': None}
+    ordered = sorted(values)
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))], 1)
+
+    return {'p50': pick(0.50), 'p95': pick(0.95), 'p99': pick(0.99), 'max': round(ordered[-1], 1)}
+
+
+class ChatUser:
+    """가상 사용자 - 한 대화에서 여러 턴 전송 (프론트엔드처럼 최근 히스토리 동봉)"""
+
+    def __init__(self, index: int, handler, gateway: StubApiGateway, args):
+        self.index = index
+        self.handler = handler
+        self.gateway = gateway
+        self.args = args
+        self.user_id = f"load-user-{index}@sedaily.com"
+        self.connection_id = f"conn-{index}-{uuid.uuid4().hex[:8]}"
+        self.conversation_id = None
+        self.history: List[Dict[str, str]] = []
+
+    def event(self, turn: int) -> Dict[str, Any]:
+        message = f"[{self.index}-{turn}] 한국은행 기준금리 동결 관련 기사를 {turn + 1}번째 버전으로 작성해줘"
+        body = {
+            'action': 'sendMessage',
+            'message': message,
+            'engineType': self.args.engine,
+            'userId': self.user_id,
+            'conversationId': self.conversation_id,
+            'conversationHistory': self.history[-self.args.history:],
+            'idempotencyKey': str(uuid.uuid4())
+        }
+        self.history.append({'role': 'user', 'content': message})
+        return {
+            'requestContext': {
+                'connectionId': self.connection_id,
+                'domainName': DOMAIN,
+                'stage': STAGE,
+                'routeKey': 'sendMessage',
+                'eventType': 'MESSAGE'
+            },
+            'body': json.dumps(body, ensure_ascii=False)
+        }
+
+    def run_turn(self, turn: int) -> Dict[str, Any]:
+        event = self.event(turn)
+        _turn.calls = Counter()
+        started = time.monotonic()
+        try:
+            response = self.handler(event, LambdaContext())
+            status = response.get('statusCode')
+        except Exception as e:
+            status = f"exception: {type(e).__name__}"
+        finished = time.monotonic()
+        calls, _turn.calls = _turn.calls, None
+
+        frames = self.gateway.take(self.connection_id)
+        chunks = [f for f in frames if f[1] == 'ai_chunk']
+        response_text = ''
+        for frame in frames:
+            if frame[1] == 'chat_end':
+                end = json.loads(frame[3])
+                self.conversation_id = end.get('conversationId') or self.conversation_id
+        for frame in chunks:
+            response_text += json.loads(frame[3]).get('chunk', '')
+        if response_text:
+            self.history.append({'role': 'assistant', 'content': response_text})
+
+        return {
+            'status': status,
+            'ttft_ms': (chunks[0][0] - started) * 1000 if chunks else None,
+            'turn_ms': (finished - started) * 1000,
+            'frames': len(frames),
+            'frame_bytes': sum(f[2] for f in frames),
+            'frame_types': Counter(f[1] for f in frames),
+            'calls': calls
+        }
+
+    def run(self) -> List[Dict[str, Any]]:
+        results = []
+        for turn in range(self.args.turns):
+            results.append(self.run_turn(turn))
+            if self.args.think_time:
+                time.sleep(self.args.think_time)
+        return results
+
+
+def measure_memory(handler, gateway, args, turns: int) -> Dict[str, Any]:
+    """호출당 최대 할당량 (부하 실행과 분리해 순차 실행 - tracemalloc은 스레드별 구분 불가)"""
+    if turns <= 0:
+        return {}
+    user = ChatUser(10_000, handler, gateway, args)
+    peaks = []
+    tracemalloc.start()
+    try:
+        for turn in range(turns):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            user.run_turn(turn)
+            peaks.append((tracemalloc.get_traced_memory()[1] - baseline) / 1024)
+    finally:
+        tracemalloc.stop()
+    return {
+        'invocations': turns,
+        'peak_alloc_kb': percentiles(peaks),
+        'process_max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def build_report(args, results: List[Dict[str, Any]], wall: float, memory: Dict[str, Any], simulator) -> Dict[str, Any]:
+    turns = len(results)
+    calls = Counter()
+    for result in results:
+        calls.update(result['calls'])
+    frame_types = Counter()
+    for result in results:
+        frame_types.update(result['frame_types'])
+    frames = sum(r['frames'] for r in results)
+
+    return {
+        'revision': git_revision(),
+        'config': {
+            'users': args.users, 'turns': args.turns, 'engine': args.engine, 'history': args.history,
+            'ttft': args.ttft, 'tps': args.tps, 'tokens': args.tokens, 'time_scale': args.time_scale,
+            'throttle_rate': args.throttle_rate, 'capacity': not args.no_capacity
+        },
+        'turns': turns,
+        'errors': sum(1 for r in results if r['status'] != 200),
+        'wall_seconds': round(wall, 2),
+        'ttft_ms': percentiles([r['ttft_ms'] for r in results if r['ttft_ms'] is not None]),
+        'turn_ms': percentiles([r['turn_ms'] for r in results]),
+        'frames_per_second': round(frames / wall, 1) if wall else None,
+        'frames_per_turn': round(frames / turns, 1) if turns else None,
+        'frame_bytes_per_turn': round(sum(r['frame_bytes'] for r in results) / turns) if turns else None,
+        'frame_types': dict(sorted(frame_types.items())),
+        'aws_calls_per_turn': {
+            'total': round(sum(calls.values()) / turns, 2) if turns else None,
+            **{name: round(count / turns, 2) for name, count in sorted(calls.items())}
+        },
+        'aws_calls_unattributed': dict(_unattributed),
+        'bedrock_simulator': simulator.stats,
+        'memory': memory
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--users', type=int, default=10, help='동시 사용자 수')
+    parser.add_argument('--turns', type=int, default=3, help='사용자당 턴 수')
+    parser.add_argument('--engine', default='11')
+    parser.add_argument('--history', type=int, default=10, help='요청에 동봉할 클라이언트 히스토리 메시지 수')
+    parser.add_argument('--think-time', type=float, default=0.0, help='턴 사이 대기 (초)')
+    parser.add_argument('--ttft', type=float, default=0.6)
+    parser.add_argument('--tps', type=float, default=60.0)
+    parser.add_argument('--tokens', type=int, default=400)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--time-scale', type=float, default=1.0, help='Bedrock 지연 배율 (0이면 대기 없음)')
+    parser.add_argument('--memory-turns', type=int, default=3, help='호출당 메모리 측정용 순차 턴 수')
+    parser.add_argument('--no-capacity', action='store_true', help='용량 스케줄러 비활성화')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--output', help='결과 JSON 파일 경로')
+    parser.add_argument('--verbose', action='store_true', help='핸들러 INFO 로그 출력')
+    args = parser.parse_args()
+
+    local_aws.configure_environment()
+    os.environ.setdefault('CAPACITY_TABLE', 'bench-capacity')
+    os.environ.setdefault('IDEMPOTENCY_TABLE', 'bench-idempotency')
+    os.environ.setdefault('METRICS_ENABLED', 'false')
+    if args.no_capacity:
+        os.environ['CAPACITY_SCHEDULER_ENABLED'] = 'false'
+
+    import boto3
+    from moto import mock_aws
+
+    with mock_aws():
+        # moto가 기본 세션을 교체하므로 시작 후 세션을 만들고 호출 집계 훅 등록
+        boto3.setup_default_session(region_name=local_aws.REGION)
+        boto3.DEFAULT_SESSION.events.register('before-call.*.*', _count_botocore_call)
+
+        local_aws.create_conversations_table()
+        local_aws.create_usage_table()
+        local_aws.create_prompt_tables()
+        local_aws.create_capacity_table()
+        local_aws.create_idempotency_table()
+        local_aws.create_message_bucket()
+
+        from bedrock_simulator import BedrockStreamSimulator, SimulatorProfile
+        import handlers.websocket.message as message_module
+        import src.services.websocket_service as websocket_service_module
+        from lib.bedrock_client_enhanced import BedrockClientEnhanced
+
+        if not args.verbose:
+            logging.disable(logging.INFO)
+
+        simulator = BedrockStreamSimulator(SimulatorProfile(
+            ttft=args.ttft,
+            tokens_per_second=args.tps,
+            output_tokens=args.tokens,
+            throttle_rate=args.throttle_rate,
+            time_scale=args.time_scale,
+            seed=args.seed
+        ))
+        runtime = CountingRuntime(simulator)
+        websocket_service_module.BedrockClientEnhanced = functools.partial(BedrockClientEnhanced, runtime_client=runtime)
+
+        gateway = StubApiGateway()
+        message_module._apigateway_clients[f'https://{DOMAIN}/{STAGE}'] = gateway
+
+        users = [ChatUser(i, message_module.handler, gateway, args) for i in range(args.users)]
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=args.users) as executor:
+            results = [turn for user_results in executor.map(ChatUser.run, users) for turn in user_results]
+        wall = time.monotonic() - started
+
+        memory = measure_memory(message_module.handler, gateway, args, args.memory_turns)
+        report = build_report(args, results, wall, memory, simulator)
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+Local AWS Stand-in
+벤치마크/하네스용 로컬 DynamoDB/S3 구성 (moto)
+
+scripts-v2/01-deploy-dynamodb.sh와 같은 키/인덱스 구조로 테이블을 만들어
+AWS 계정 없이 리포지토리 코드를 그대로 실행할 수 있게 합니다.
+
+S3는 S3_ENDPOINT_URL을 지정하면 MinIO 등 S3 호환 로컬 서버를 대신 사용할 수 있습니다.
+
+Note: moto가 필요합니다 (pip install "moto[dynamodb,s3]").
+"""
+import os
+
+import boto3
+
+REGION = 'us-east-1'
+
+SUMMARY_INCLUDE = ['title', 'engineType', 'createdAt']
+
+
+def configure_environment() -> None:
+    """가짜 자격 증명과 테이블 이름 환경 변수 설정 (src 모듈 import 전에 호출)"""
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+    os.environ.setdefault('AWS_DEFAULT_REGION', REGION)
+    os.environ.setdefault('AWS_REGION', REGION)
+    os.environ.setdefault('CONVERSATIONS_TABLE', 'bench-conversations')
+    os.environ.setdefault('USAGE_TABLE', 'bench-usage')
+    os.environ.setdefault('PROMPTS_TABLE', 'bench-prompts')
+    os.environ.setdefault('FILES_TABLE', 'bench-files')
+    os.environ.setdefault('WEBSOCKET_TABLE', 'bench-websocket-connections')
+    os.environ.setdefault('S3_BUCKET', 'bench-message-bodies')
+
+
+def _gsi(name, hash_key, range_key, projection):
+    return {
+        'IndexName': name,
+        'KeySchema': [
+            {'AttributeName': hash_key, 'KeyType': 'HASH'},
+            {'AttributeName': range_key, 'KeyType': 'RANGE'}
+        ],
+        'Projection': projection
+    }
+
+
+def create_conversations_table(dynamodb=None):
+    """대화 테이블 생성 (createdAt/updatedAt 인덱스 4개)"""
+    dynamodb = dynamodb or boto3.resource('dynamodb', region_name=REGION)
+    return dynamodb.create_table(
+        TableName=os.environ['CONVERSATIONS_TABLE'],
+        KeySchema=[{'AttributeName': 'conversationId', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[
+            {'AttributeName': attr, 'AttributeType': 'S'}
+            for attr in ('conversationId', 'userId', 'createdAt', 'updatedAt', 'userEngineType')
+        ],
+        GlobalSecondaryIndexes=[
+            _gsi('userId-createdAt-index', 'userId', 'createdAt', {'ProjectionType': 'ALL'}),
+            _gsi('userEngineType-createdAt-index', 'userEngineType', 'createdAt', {'ProjectionType': 'ALL'}),
+            _gsi('userId-updatedAt-index', 'userId', 'updatedAt',
+                 {'ProjectionType': 'INCLUDE', 'NonKeyAttributes': SUMMARY_INCLUDE}),
+            _gsi('userEngineType-updatedAt-index', 'userEngineType', 'updatedAt',
+                 {'ProjectionType': 'INCLUDE', 'NonKeyAttributes': ['userId'] + SUMMARY_INCLUDE})
+        ],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+
+def create_prompt_tables(dynamodb=None):
+    """프롬프트/파일 테이블 생성"""
+    dynamodb = dynamodb or boto3.resource('dynamodb', region_name=REGION)
+    prompts = dynamodb.create_table(
+        TableName=os.environ['PROMPTS_TABLE'],
+        KeySchema=[{'AttributeName': 'promptId', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': 'promptId', 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST'
+    )
+    files = dynamodb.create_table(
+        TableName=os.environ['FILES_TABLE'],
+        KeySchema=[
+            {'AttributeName': 'promptId', 'KeyType': 'HASH'},
+            {'AttributeName': 'fileId', 'KeyType': 'RANGE'}
+        ],
+        AttributeDefinitions=[
+            {'AttributeName': 'promptId', 'AttributeType': 'S'},
+            {'AttributeName': 'fileId', 'AttributeType': 'S'}
+        ],
+        BillingMode='PAY_PER_REQUEST'
+    )
+    return prompts, files
+
+
+def create_usage_table(dynamodb=None):
+    """사용량 테이블 생성 (userId + date)"""
+    dynamodb = dynamodb or boto3.resource('dynamodb', region_name=REGION)
+    return dynamodb.create_table(
+        TableName=os.environ['USAGE_TABLE'],
+        KeySchema=[
+            {'AttributeName': 'userId', 'KeyType': 'HASH'},
+            {'AttributeName': 'date', 'KeyType': 'RANGE'}
+        ],
+        AttributeDefinitions=[
+            {'AttributeName': 'userId', 'AttributeType': 'S'},
+            {'AttributeName': 'date', 'AttributeType': 'S'}
+        ],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+
+def create_capacity_table(dynamodb=None):
+    """Bedrock 용량 스케줄러 카운터 테이블 생성 (counterId) - CAPACITY_TABLE 필요"""
+    dynamodb = dynamodb or boto3.resource('dynamodb', region_name=REGION)
+    return dynamodb.create_table(
+        TableName=os.environ['CAPACITY_TABLE'],
+        KeySchema=[{'AttributeName': 'counterId', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': 'counterId', 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+
+def create_idempotency_table(dynamodb=None):
+    """sendMessage 멱등성 테이블 생성 (requestId) - IDEMPOTENCY_TABLE 필요"""
+    dynamodb = dynamodb or boto3.resource('dynamodb', region_name=REGION)
+    return dynamodb.create_table(
+        TableName=os.environ['IDEMPOTENCY_TABLE'],
+        KeySchema=[{'AttributeName': 'requestId', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[{'AttributeName': 'requestId', 'AttributeType': 'S'}],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+
+def create_message_bucket(s3=None):
+    """메시지 본문 오프로드 버킷 생성 (S3_ENDPOINT_URL이 있으면 해당 S3 호환 서버 사용)"""
+    s3 = s3 or boto3.client('s3', region_name=REGION, endpoint_url=os.environ.get('S3_ENDPOINT_URL') or None)
+    s3.create_bucket(Bucket=os.environ['S3_BUCKET'])
+    return s3
@@ -0,0 +1,158 @@
+"""
+SSE Stream Harness
+HTTP 응답 스트리밍 채팅 핸들러(handlers/api/chat_stream.py) 로컬 검증 스크립트
+
+AWS 없이 메모리 저장소와 가짜 Bedrock 클라이언트로 stream_handler를 구동하고
+SSE 프레임 형식, 프레임 순서, 대화 저장/사용량 추적 호출을 확인합니다.
+
+실행 (backend 디렉토리에서):
+    python tools/sse_stream_harness.py
+"""
+import base64
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services import WebSocketService, CapacityScheduler  # noqa: E402
+from handlers.api.chat_stream import stream_handler, handler  # noqa: E402
+
+
+class InMemoryConversationRepository:
+    """ConversationRepository 대체 - find_by_id/save/modify만 사용"""
+
+    def __init__(self):
+        self.items = {}
+        self.saves = 0
+
+    def find_by_id(self, conversation_id):
+        return self.items.get(conversation_id)
+
+    def save(self, conversation):
+        self.items[conversation.conversation_id] = conversation
+        self.saves += 1
+        return conversation
+
+    def modify(self, conversation_id, apply):
+        conversation = apply(self.find_by_id(conversation_id))
+        return self.save(conversation) if conversation is not None else None
+
+
+class FakeBedrockClient:
+    """BedrockClientEnhanced 대체 - 고정 청크를 지연과 함께 반환"""
+
+    model_id = 'fake-model'
+
+    def __init__(self, chunks, delay=0.0):
+        self.chunks = chunks
+        self.delay = delay
+
+    def stream_bedrock(self, **kwargs):
+        for chunk in self.chunks:
+            if self.delay:
+                time.sleep(self.delay)
+            yield chunk
+
+
+class FakePromptService:
+    def get_prompt_with_files(self, engine_type):
+        return {'instruction': '기사 작성 지침', 'description': '', 'files': []}
+
+
+class RecordingStream(io.BytesIO):
+    """write 시점을 기록하는 응답 스트림"""
+
+    def __init__(self):
+        super().__init__()
+        self.write_times = []
+
+    def write(self, data):
+        self.write_times.append(time.monotonic())
+        return super().write(data)
+
+
+def parse_sse(raw: str):
+    """SSE 본문을 (event, id, data) 목록으로 파싱하며 형식을 검증"""
+    assert raw.endswith('\n\n'), 'stream must end with a blank line'
+    events = []
+    for block in raw[:-2].split('\n\n'):
+        fields = {}
+        for line in block.split('\n'):
+            name, sep, value = line.partition(': ')
+            assert sep, f'malformed SSE line: {line!r}'
+            assert name in ('event', 'id', 'data'), f'unexpected field: {name}'
+            fields[name] = value
+        data = json.loads(fields['data'])
+        assert data['type'] == fields['event'], 'event name must match data.type'
+        events.append((fields['event'], fields.get('id'), data))
+    return events
+
+
+def build_service(chunks, delay=0.0):
+    service = WebSocketService(
+        conversation_repository=InMemoryConversationRepository(),
+        prompt_service=FakePromptService(),
+        bedrock_client=FakeBedrockClient(chunks, delay),
+        capacity_scheduler=CapacityScheduler(config={'enabled': False})
+    )
+    usage_calls = []
+    service.track_usage = lambda **kwargs: usage_calls.append(kwargs) or True
+    return service, usage_calls
+
+
+def check_streaming():
+    chunks = ['안녕하세요. ', '서울경제 ', '기사 초안입니다.\n', '끝.']
+    service, usage_calls = build_service(chunks, delay=0.02)
+    stream = RecordingStream()
+    body = json.dumps({'message': '기사 써줘', 'engineType': 'T5', 'userId': 'user@example.com'})
+    event = {'body': base64.b64encode(body.encode()).decode(), 'isBase64Encoded': True}
+
+    stream_handler(event, stream, websocket_service=service)
+    events = parse_sse(stream.getvalue().decode('utf-8'))
+
+    types = [e[0] for e in events]
+    assert types == ['ai_start'] + ['ai_chunk'] * len(chunks) + ['chat_end'], types
+    assert [e[1] for e in events if e[0] == 'ai_chunk'] == [str(i) for i in range(len(chunks))]
+    assert ''.join(e[2]['chunk'] for e in events if e[0] == 'ai_chunk') == ''.join(chunks)
+
+    conversation_id = events[0][2]['conversationId']
+    assert events[-1][2]['conversationId'] == conversation_id
+    assert events[-1][2]['total_chunks'] == len(chunks)
+
+    # 청크가 생성 즉시 기록되는지 (버퍼링 여부) 확인
+    assert len(stream.write_times) == len(events)
+    assert stream.write_times[-1] - stream.write_times[1] >= 0.02 * (len(chunks) - 1)
+
+    # WebSocket 경로와 같은 저장/사용량 처리
+    conversation = service.conversation_repo.find_by_id(conversation_id)
+    assert [m.role for m in conversation.messages] == ['user', 'assistant']
+    assert conversation.messages[1].content == ''.join(chunks)
+    assert len(usage_calls) == 1 and usage_calls[0]['output_text'] == ''.join(chunks)
+
+    return len(events)
+
+
+def check_errors():
+    stream = RecordingStream()
+    stream_handler({'body': json.dumps({'engineType': 'T5'})}, stream)
+    events = parse_sse(stream.getvalue().decode('utf-8'))
+    assert [e[0] for e in events] == ['error']
+
+    response = handler({'requestContext': {'http': {'method': 'OPTIONS'}}}, None)
+    assert response['statusCode'] == 200
+
+    response = handler({'body': ''}, None)
+    assert response['statusCode'] == 400
+
+
+def main():
+    frames = check_streaming()
+    check_errors()
+    print(f"SSE harness OK: {frames} frames streamed, error paths verified")
+
+
+if __name__ == '__main__':
+    main()
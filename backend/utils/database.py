@@ -2,12 +2,13 @@
 Database Utilities
 DynamoDB 연결 및 공통 작업을 위한 유틸리티
 """
-import boto3
 import logging
 import os
 from typing import Optional
 from botocore.exceptions import ClientError
 
+from src.repositories.aws_clients import get_client, get_resource
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,7 +23,7 @@ def get_dynamodb_resource(region: str = None):
         boto3 DynamoDB resource
     """
     region = region or os.environ.get('AWS_REGION', 'us-east-1')
-    return boto3.resource('dynamodb', region_name=region)
+    return get_resource('dynamodb', region)
 
 
 def get_dynamodb_client(region: str = None):
@@ -36,7 +37,7 @@ def get_dynamodb_client(region: str = None):
         boto3 DynamoDB client
     """
     region = region or os.environ.get('AWS_REGION', 'us-east-1')
-    return boto3.client('dynamodb', region_name=region)
+    return get_client('dynamodb', region)
 
 
 def get_table(table_name: str, region: str = None):
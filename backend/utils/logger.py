@@ -1,38 +1,212 @@
 """
 Logging Utilities
 통합 로깅 설정 및 헬퍼 함수
+
+핸들러 핫 경로용 구조화 로깅:
+- StructuredLogger: 메시지는 %-인자로 지연 포맷, 추가 정보는 키워드 필드로 전달
+  (로그 레벨이 꺼져 있으면 포맷/직렬화 비용 없음, 필드 값이 callable이면 출력 시에만 평가)
+- sample=True 로그는 로거별 비율로 샘플링 (레코드에 sampleRate 기록)
+- 필드는 출력 시 길이 제한/민감 정보 제거 (LOGGING_CONFIG)
+- event_summary: Lambda 이벤트 전체 대신 라우팅/크기 정보만 기록
 """
 import logging
 import json
-from typing import Any, Dict
+import random
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from src.config.aws import LAMBDA_CONFIG, LOGGING_CONFIG
+
+_EMAIL = re.compile(r'([A-Za-z0-9._%+-])[A-Za-z0-9._%+-]*@([A-Za-z0-9.-]+\.[A-Za-z]{2,})')
+_MAX_DEPTH = 6
+
+
+def sanitize(value: Any, key: Optional[str] = None, depth: int = 0) -> Any:
+    """
+    로그 필드 값 정리 - 민감 필드는 길이만, 긴 문자열/리스트는 잘라냄, 이메일 마스킹
+
+    Args:
+        value: 필드 값 (callable이면 호출 결과 사용)
+        key: 필드 이름 (redact_keys 판별용)
+        depth: 중첩 깊이
+
+    Returns:
+        JSON 직렬화 가능한 값
+    """
+    if callable(value):
+        value = value()
+
+    if key is not None and key.lower() in LOGGING_CONFIG['redact_keys'] and value is not None:
+        size = len(value) if hasattr(value, '__len__') else None
+        return f"[REDACTED {size}]" if size is not None else '[REDACTED]'
+
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+
+    if isinstance(value, str):
+        if LOGGING_CONFIG['mask_emails'] and '@' in value:
+            value = _EMAIL.sub(r'\1***@\2', value)
+        max_chars = LOGGING_CONFIG['max_field_chars']
+        if len(value) > max_chars:
+            return f"{value[:max_chars]}...(+{len(value) - max_chars})"
+        return value
+
+    if depth >= _MAX_DEPTH:
+        return f"<{type(value).__name__}>"
+
+    if isinstance(value, dict):
+        return {str(k): sanitize(v, str(k), depth + 1) for k, v in value.items()}
+
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = list(value)
+        max_items = LOGGING_CONFIG['max_field_items']
+        result = [sanitize(item, None, depth + 1) for item in items[:max_items]]
+        if len(items) > max_items:
+            result.append(f"...(+{len(items) - max_items})")
+        return result
+
+    return sanitize(str(value), None, depth)
+
+
+class StructuredFormatter(logging.Formatter):
+    """레코드의 구조화 필드를 JSON 한 줄 (또는 key=value 텍스트)로 출력"""
+
+    def __init__(self, json_output: bool = True):
+        super().__init__('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        self.json_output = json_output
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = {key: sanitize(value, key) for key, value in (getattr(record, 'fields', None) or {}).items()}
+
+        if not self.json_output:
+            line = super().format(record)
+            if fields:
+                line += ' ' + ' '.join(
+                    f"{key}={json.dumps(value, ensure_ascii=False, default=str)}" for key, value in fields.items()
+                )
+            return line
+
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for key, value in fields.items():
+            entry[f"field.{key}" if key in entry else key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
 
 
-def setup_logger(name: str, level: str = 'INFO') -> logging.Logger:
-    """로거 설정"""
+class StructuredLogger:
+    """
+    구조화/지연 포맷/샘플링 로거
+
+    사용 예:
+        logger = get_structured_logger(__name__)
+        logger.info("Chat completed", chunks=chunk_index, chars=len(total_response))
+        logger.debug("Frame sent %s", frame_type, sample=True, connectionId=connection_id)
+    """
+
+    def __init__(self, name: str, level: Optional[str] = None, sample_rate: Optional[float] = None):
+        self.logger = setup_logger(name, level)
+        self.sample_rate = sample_rate if sample_rate is not None else LOGGING_CONFIG['sample_rates'].get(
+            name, LOGGING_CONFIG['sample_rate']
+        )
+
+    def isEnabledFor(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
+
+    def log(self, level: int, msg: str, *args, sample: bool = False, exc_info=None, **fields) -> None:
+        """
+        로그 기록 (레벨이 꺼져 있거나 샘플링에서 제외되면 아무 작업도 하지 않음)
+
+        Args:
+            level: 로그 레벨
+            msg: 메시지 (%-인자는 출력 시에만 포맷)
+            *args: 메시지 인자
+            sample: 로거 샘플링 비율 적용 여부 (핫 경로 반복 로그)
+            exc_info: 예외 정보
+            **fields: 구조화 필드 (출력 시 sanitize)
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+        if sample:
+            if random.random() >= self.sample_rate:
+                return
+            fields['sampleRate'] = self.sample_rate
+        self.logger.log(level, msg, *args, exc_info=exc_info, extra={'fields': fields}, stacklevel=3)
+
+    def debug(self, msg: str, *args, **fields) -> None:
+        self.log(logging.DEBUG, msg, *args, **fields)
+
+    def info(self, msg: str, *args, **fields) -> None:
+        self.log(logging.INFO, msg, *args, **fields)
+
+    def warning(self, msg: str, *args, **fields) -> None:
+        self.log(logging.WARNING, msg, *args, **fields)
+
+    def error(self, msg: str, *args, **fields) -> None:
+        self.log(logging.ERROR, msg, *args, **fields)
+
+    def exception(self, msg: str, *args, **fields) -> None:
+        self.log(logging.ERROR, msg, *args, exc_info=True, **fields)
+
+
+def setup_logger(name: str, level: Optional[str] = None) -> logging.Logger:
+    """로거 설정 (레벨 기본값: LOG_LEVEL)"""
     logger = logging.getLogger(name)
 
     if not logger.handlers:
         handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        handler.setFormatter(formatter)
+        handler.setFormatter(StructuredFormatter(json_output=LOGGING_CONFIG['format'] == 'json'))
         logger.addHandler(handler)
 
+    level = level or LAMBDA_CONFIG['log_level']
     logger.setLevel(getattr(logging, level.upper(), logging.INFO))
     return logger
 
 
-def get_logger(name: str, level: str = 'INFO') -> logging.Logger:
+def get_logger(name: str, level: Optional[str] = None) -> logging.Logger:
     """로거 가져오기 (setup_logger의 별칭)"""
     return setup_logger(name, level)
 
 
-def log_lambda_event(logger: logging.Logger, event: Dict[str, Any]) -> None:
-    """Lambda 이벤트 로깅"""
-    logger.info(f"Lambda Event: {json.dumps(event, default=str)}")
-    
-    # 주요 정보 추출 로깅
-    http_method = event.get('httpMethod', 'N/A')
-    path = event.get('path', event.get('rawPath', 'N/A'))
-    logger.info(f"Request: {http_method} {path}")
\ No newline at end of file
+def get_structured_logger(name: str, level: Optional[str] = None, sample_rate: Optional[float] = None) -> StructuredLogger:
+    """구조화 로거 가져오기 (핸들러용)"""
+    return StructuredLogger(name, level, sample_rate)
+
+
+def event_summary(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Lambda 이벤트 요약 - 본문/대화 기록/헤더 값 대신 라우팅 정보와 크기만
+
+    Args:
+        event: API Gateway REST/HTTP/WebSocket 또는 함수 URL 이벤트
+
+    Returns:
+        로그 필드 dict
+    """
+    request_context = event.get('requestContext') or {}
+    body = event.get('body')
+    summary = {
+        'route': request_context.get('routeKey') or event.get('resource') or event.get('rawPath') or event.get('path'),
+        'method': event.get('httpMethod') or (request_context.get('http') or {}).get('method'),
+        'connectionId': request_context.get('connectionId'),
+        'requestId': request_context.get('requestId'),
+        'pathParameters': event.get('pathParameters'),
+        'queryKeys': sorted((event.get('queryStringParameters') or {}).keys()),
+        'bodyBytes': len(body) if isinstance(body, str) else 0,
+        'base64': bool(event.get('isBase64Encoded'))
+    }
+    return {key: value for key, value in summary.items() if value not in (None, [], {})}
+
+
+def log_lambda_event(logger, event: Dict[str, Any]) -> None:
+    """Lambda 이벤트 로깅 (요약만)"""
+    if isinstance(logger, StructuredLogger):
+        logger.info("Lambda event", **event_summary(event))
+    else:
+        logger.info("Lambda event: %s", json.dumps(event_summary(event), default=str))
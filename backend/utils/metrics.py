@@ -0,0 +1,131 @@
+"""
+Metrics Utilities
+CloudWatch Embedded Metric Format(EMF) 기반 메트릭 기록
+
+EMF 로그 한 줄을 stdout으로 출력하면 CloudWatch가 메트릭으로 추출하므로
+PutMetricData API 호출 없이 Lambda 실행 시간에 영향 없이 기록할 수 있습니다.
+"""
+import functools
+import json
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from src.config.aws import AWS_CALL_TRACKING_CONFIG, CLOUDWATCH_CONFIG
+from src.repositories.aws_clients import begin_invocation, end_invocation
+from utils.logger import get_structured_logger
+
+logger = get_structured_logger(__name__)
+
+MetricValue = Union[int, float, Tuple[Union[int, float], str]]
+
+
+def put_metrics(
+    metrics: Dict[str, MetricValue],
+    dimensions: Optional[Dict[str, str]] = None,
+    **properties: Any
+) -> None:
+    """
+    여러 메트릭을 하나의 EMF 레코드로 기록
+
+    Args:
+        metrics: 메트릭 이름 -> 값 또는 (값, 단위) (기본 단위: Count)
+        dimensions: 메트릭 차원 (예: {'Handler': 'message'})
+        **properties: 메트릭 외 검색용 속성 (CloudWatch Logs Insights에서 조회 가능)
+    """
+    if not CLOUDWATCH_CONFIG['metrics_enabled'] or not metrics:
+        return
+
+    dimensions = dimensions or {}
+    definitions = []
+    record: Dict[str, Any] = {}
+
+    for name, value in metrics.items():
+        unit = 'Count'
+        if isinstance(value, tuple):
+            value, unit = value
+        definitions.append({'Name': name, 'Unit': unit})
+        record[name] = value
+
+    record.update(properties)
+    record.update(dimensions)
+    record['_aws'] = {
+        'Timestamp': int(time.time() * 1000),
+        'CloudWatchMetrics': [{
+            'Namespace': CLOUDWATCH_CONFIG['namespace'],
+            'Dimensions': [list(dimensions.keys())],
+            'Metrics': definitions
+        }]
+    }
+
+    print(json.dumps(record, ensure_ascii=False, default=str))
+
+
+def put_metric(
+    name: str,
+    value: Union[int, float],
+    unit: str = 'Count',
+    dimensions: Optional[Dict[str, str]] = None,
+    **properties: Any
+) -> None:
+    """단일 메트릭 기록"""
+    put_metrics({name: (value, unit)}, dimensions, **properties)
+
+
+def track_aws_calls(handler_name: str) -> Callable:
+    """
+    핸들러 호출 단위 AWS 호출 집계 데코레이터
+
+    공유 클라이언트 팩토리(src/repositories/aws_clients.py)로 만든 클라이언트의 호출을
+    핸들러 종료 시 한 줄로 요약 로그에 남기고 AwsCalls/AwsCallLatency/AwsPayloadBytes 메트릭을 기록합니다.
+    DynamoDB 용량 집계가 켜져 있으면 ConsumedRCU/ConsumedWCU를 핸들러별, 핸들러+테이블별로 함께 기록합니다.
+    AWS 호출이 없었던 호출(ping 등)은 요약 로그/메트릭을 남기지 않습니다.
+
+    Args:
+        handler_name: 요약/메트릭 차원에 사용할 핸들러 이름
+    """
+    def decorator(handler: Callable) -> Callable:
+        if not AWS_CALL_TRACKING_CONFIG['enabled']:
+            return handler
+
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            invocation, token = begin_invocation(handler_name)
+            try:
+                return handler(*args, **kwargs)
+            finally:
+                end_invocation(token)
+                _report_invocation(handler_name, invocation)
+        return wrapper
+    return decorator
+
+
+def _report_invocation(handler_name: str, invocation) -> None:
+    """호출 집계 요약 로그/메트릭 기록 (AWS 호출이 없으면 생략, 실패해도 핸들러 결과에 영향 없음)"""
+    try:
+        summary = invocation.summary()
+        if not summary['calls']:
+            return
+        if AWS_CALL_TRACKING_CONFIG['log_summary']:
+            logger.info("AWS calls", awsCalls=summary)
+        metrics = {
+            'AwsCalls': summary['calls'],
+            'AwsCallLatency': (summary['latencyMs'], 'Milliseconds'),
+            'AwsPayloadBytes': (summary['bytes'], 'Bytes')
+        }
+        if summary['capacity']:
+            metrics['ConsumedRCU'] = round(invocation.total_read_units, 2)
+            metrics['ConsumedWCU'] = round(invocation.total_write_units, 2)
+            metrics['CapacityBudgetExceeded'] = summary['capacityBudgetExceeded']
+        put_metrics(
+            metrics,
+            {'Handler': handler_name},
+            awsCalls={name: op['count'] for name, op in summary['operations'].items()}
+        )
+        for table_name, units in summary['capacity'].items():
+            put_metrics(
+                {'ConsumedRCU': units['rcu'], 'ConsumedWCU': units['wcu']},
+                {'Handler': handler_name, 'Table': table_name},
+                indexes=units.get('indexes', {})
+            )
+    except Exception as e:
+        logger.warning("AWS call summary failed: %s", e)
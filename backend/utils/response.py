@@ -2,8 +2,19 @@
 API Response Utilities
 통일된 API 응답 포맷 제공
 """
-import json
-from typing import Any, Dict, Optional
+import base64
+import functools
+import gzip
+import hashlib
+from typing import Any, Callable, Dict, Optional
+
+from src.config.aws import RESPONSE_COMPRESSION_CONFIG
+from utils.serialization import dumps
+
+try:
+    import brotli  # 선택 의존성 - 설치된 경우에만 br 인코딩 지원
+except ImportError:
+    brotli = None
 
 
 class APIResponse:
@@ -13,19 +24,59 @@ class APIResponse:
     CORS_HEADERS = {
         'Content-Type': 'application/json',
         'Access-Control-Allow-Origin': '*',
-        'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token',
+        'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,If-None-Match',
         'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS,PATCH',
-        'Access-Control-Allow-Credentials': 'true'
+        'Access-Control-Allow-Credentials': 'true',
+        'Access-Control-Expose-Headers': 'ETag'
     }
     
     @classmethod
-    def success(cls, data: Any = None, status_code: int = 200) -> Dict:
+    def success(cls, data: Any = None, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Dict:
         """성공 응답 생성"""
         return {
             'statusCode': status_code,
-            'headers': cls.CORS_HEADERS,
-            'body': json.dumps(data, default=str, ensure_ascii=False)
+            'headers': {**cls.CORS_HEADERS, **headers} if headers else cls.CORS_HEADERS,
+            'body': dumps(data)
         }
+
+    @classmethod
+    def not_modified(cls, etag: str, cache_control: Optional[str] = None) -> Dict:
+        """304 Not Modified 응답 (본문 없음, 200 응답과 같은 Vary 유지)"""
+        headers = {**cls.CORS_HEADERS, 'ETag': etag}
+        if RESPONSE_COMPRESSION_CONFIG['enabled']:
+            headers['Vary'] = 'Accept-Encoding'
+        if cache_control:
+            headers['Cache-Control'] = cache_control
+        return {
+            'statusCode': 304,
+            'headers': headers,
+            'body': ''
+        }
+
+    @classmethod
+    def conditional(
+        cls,
+        event: Dict[str, Any],
+        etag: str,
+        build: Callable[[], Any],
+        cache_control: Optional[str] = None
+    ) -> Dict:
+        """
+        조건부 GET 응답 - If-None-Match가 ETag와 일치하면 본문을 만들지 않고 304 반환
+
+        Args:
+            event: Lambda 이벤트 (요청 헤더 확인용)
+            etag: 리소스 ETag (make_etag로 생성)
+            build: 응답 데이터 생성 함수 (304가 아닐 때만 호출)
+            cache_control: Cache-Control 헤더 값
+        """
+        if etag_matches(event, etag):
+            return cls.not_modified(etag, cache_control)
+
+        headers = {'ETag': etag}
+        if cache_control:
+            headers['Cache-Control'] = cache_control
+        return cls.success(build(), headers=headers)
     
     @classmethod
     def error(cls, message: str, status_code: int = 500) -> Dict:
@@ -33,7 +84,7 @@ class APIResponse:
         return {
             'statusCode': status_code,
             'headers': cls.CORS_HEADERS,
-            'body': json.dumps({'error': message}, ensure_ascii=False)
+            'body': dumps({'error': message})
         }
     
     @classmethod
@@ -46,6 +97,154 @@ class APIResponse:
         }
 
 
+def make_etag(*parts: Any) -> str:
+    """
+    버전 속성(updatedAt, contentVersion 등)으로 강한 ETag 생성
+
+    Args:
+        *parts: 리소스 식별자와 버전 값
+
+    Returns:
+        따옴표로 감싼 ETag 문자열
+    """
+    digest = hashlib.sha256('\x1f'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def get_header(event: Dict[str, Any], name: str) -> Optional[str]:
+    """요청 헤더 조회 (대소문자 무시 - REST/HTTP API 헤더 표기 차이 대응)"""
+    headers = event.get('headers') or {}
+    name = name.lower()
+    return next((value for key, value in headers.items() if key.lower() == name), None)
+
+
+def etag_matches(event: Dict[str, Any], etag: str) -> bool:
+    """요청의 If-None-Match 헤더가 ETag와 일치하는지 확인"""
+    value = get_header(event, 'If-None-Match')
+    if not value:
+        return False
+
+    candidates = [candidate.strip() for candidate in value.split(',')]
+    return '*' in candidates or any(
+        _strip_encoding_suffix(candidate[2:] if candidate.startswith('W/') else candidate) == etag
+        for candidate in candidates
+    )
+
+
+def _strip_encoding_suffix(etag: str) -> str:
+    """압축 응답 ETag의 인코딩 접미사 제거 ("abc-gzip" -> "abc")"""
+    for encoding in ('gzip', 'br'):
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Accept-Encoding 협상 (br > gzip, q=0은 제외)
+
+    Args:
+        accept_encoding: 요청의 Accept-Encoding 헤더
+
+    Returns:
+        'br', 'gzip' 또는 None
+    """
+    if not accept_encoding:
+        return None
+
+    accepted = {}
+    for token in accept_encoding.lower().split(','):
+        name, _, params = token.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip()] = quality
+
+    wildcard = accepted.get('*', 0.0)
+    if brotli is not None and accepted.get('br', wildcard) > 0:
+        return 'br'
+    if accepted.get('gzip', wildcard) > 0:
+        return 'gzip'
+    return None
+
+
+def compress_response(response: Dict[str, Any], event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    응답 본문 압축 (base64 인코딩)
+
+    임계값 미만이거나 클라이언트가 압축을 지원하지 않으면 원본 응답을 반환합니다.
+
+    Args:
+        response: Lambda 프록시 응답
+        event: Lambda 이벤트 (Accept-Encoding 확인용)
+
+    Returns:
+        압축된 응답 또는 원본 응답
+    """
+    body = response.get('body')
+    if (not RESPONSE_COMPRESSION_CONFIG['enabled'] or not isinstance(body, str)
+            or response.get('isBase64Encoded')):
+        return response
+
+    raw = body.encode('utf-8')
+    if len(raw) < RESPONSE_COMPRESSION_CONFIG['min_size']:
+        return response
+
+    headers = {**response.get('headers', {}), 'Vary': 'Accept-Encoding'}
+    encoding = negotiate_encoding(get_header(event or {}, 'Accept-Encoding'))
+
+    if encoding == 'br':
+        compressed = brotli.compress(raw, quality=RESPONSE_COMPRESSION_CONFIG['brotli_quality'])
+    elif encoding == 'gzip':
+        compressed = gzip.compress(raw, compresslevel=RESPONSE_COMPRESSION_CONFIG['gzip_level'], mtime=0)
+    else:
+        return {**response, 'headers': headers}
+
+    if len(compressed) >= len(raw):
+        return {**response, 'headers': headers}
+
+    headers['Content-Encoding'] = encoding
+    if headers.get('ETag', '').endswith('"'):
+        # 인코딩별로 다른 표현이므로 강한 ETag에 인코딩 구분자 추가
+        headers['ETag'] = headers['ETag'][:-1] + f'-{encoding}"'
+
+    return {
+        **response,
+        'headers': headers,
+        'body': base64.b64encode(compressed).decode('ascii'),
+        'isBase64Encoded': True
+    }
+
+
+def decode_request_body(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    base64 요청 본문을 텍스트로 복원 (REST API binaryMediaTypes '*/*' 사용 시 모든 본문이 base64로 전달됨)
+
+    Args:
+        event: Lambda 이벤트
+
+    Returns:
+        본문이 디코딩된 이벤트 (base64가 아니면 원본)
+    """
+    if not isinstance(event, dict) or not event.get('isBase64Encoded') or not isinstance(event.get('body'), str):
+        return event
+    body = event['body']
+    return {**event, 'body': base64.b64decode(body).decode('utf-8'), 'isBase64Encoded': False}
+
+
+def compressed(handler: Callable) -> Callable:
+    """Lambda 핸들러 응답 압축 데코레이터 (base64 요청 본문도 디코딩해 전달)"""
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        event = decode_request_body(event)
+        return compress_response(handler(event, context), event)
+    return wrapper
+
+
 def create_response(status_code: int = 200, body: Any = None) -> Dict:
     """Lambda 응답 생성 (호환성을 위한 헬퍼)"""
     if body is None:
@@ -53,7 +252,7 @@ def create_response(status_code: int = 200, body: Any = None) -> Dict:
     return {
         'statusCode': status_code,
         'headers': APIResponse.CORS_HEADERS,
-        'body': json.dumps(body, default=str, ensure_ascii=False)
+        'body': dumps(body)
     }
 
 
@@ -0,0 +1,143 @@
+"""
+Serialization Utilities
+DynamoDB 항목(Decimal 포함) JSON 직렬화 공통 모듈
+
+- Decimal: 정수 값은 int, 소수 값은 float로 직렬화 (재귀 변환 없이 인코더에서 처리)
+- orjson이 설치되어 있으면 사용하고, 없으면 표준 json으로 동작
+- ai_chunk 같은 고빈도 프레임은 고정 부분을 미리 인코딩해 두고 가변 필드만 이어 붙임
+"""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Optional
+
+try:
+    import orjson  # 선택 의존성 - 설치된 경우 가속 인코더 사용
+except ImportError:
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """json 기본 인코더가 처리하지 못하는 타입 변환"""
+    if isinstance(obj, Decimal):
+        # DynamoDB Number는 모두 Decimal - 토큰 수 등 정수 값은 int 유지
+        if obj == obj.to_integral_value():
+            return int(obj)
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.decode('utf-8', errors='replace')
+    return str(obj)
+
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=_default)
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """
+    JSON 직렬화 (UTF-8 bytes)
+
+    Args:
+        obj: 직렬화할 객체 (Decimal/set/datetime 포함 가능)
+
+    Returns:
+        UTF-8 인코딩된 JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # 64비트 초과 정수 등 orjson 미지원 값은 표준 json으로 처리
+            pass
+    return _encoder.encode(obj).encode('utf-8')
+
+
+def dumps(obj: Any) -> str:
+    """
+    JSON 직렬화 (str) - API 응답 본문, WebSocket 프레임용
+
+    Args:
+        obj: 직렬화할 객체
+
+    Returns:
+        JSON 문자열 (한글은 이스케이프하지 않음)
+    """
+    if orjson is not None:
+        return dumps_bytes(obj).decode('utf-8')
+    return _encoder.encode(obj)
+
+
+def loads(data: Any) -> Any:
+    """JSON 역직렬화 (str/bytes)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# ai_chunk 프레임 고정 부분 (키 순서는 dict 프레임과 동일)
+_AI_CHUNK_PREFIX = '{"type":"ai_chunk","chunk":'
+_AI_CHUNK_INDEX = ',"chunk_index":'
+_AI_CHUNK_REPLAY = ',"replay":true'
+_AI_CHUNK_TIMESTAMP = ',"timestamp":'
+_AI_CHUNK_REQUIRED = frozenset({'type', 'chunk', 'chunk_index', 'timestamp'})
+_AI_CHUNK_KEYS = _AI_CHUNK_REQUIRED | {'replay'}
+
+
+def _dumps_str(value: str) -> str:
+    if orjson is not None:
+        return orjson.dumps(value).decode('utf-8')
+    return json.dumps(value, ensure_ascii=False)
+
+
+def encode_ai_chunk(chunk: str, chunk_index: int, timestamp: str, replay: bool = False) -> str:
+    """
+    ai_chunk 프레임 인코딩
+
+    스트리밍 중 청크마다 호출되므로 dict 생성/전체 인코딩 대신
+    가변 필드(chunk, timestamp)만 인코딩해 고정 부분과 결합합니다.
+
+    Args:
+        chunk: 응답 청크 텍스트
+        chunk_index: 청크 순번
+        timestamp: ISO 타임스탬프
+        replay: 재생 청크 여부
+
+    Returns:
+        {"type": "ai_chunk", ...} JSON 문자열
+    """
+    return ''.join((
+        _AI_CHUNK_PREFIX, _dumps_str(chunk),
+        _AI_CHUNK_INDEX, str(int(chunk_index)),
+        _AI_CHUNK_REPLAY if replay else '',
+        _AI_CHUNK_TIMESTAMP, _dumps_str(timestamp),
+        '}'
+    ))
+
+
+def encode_frame(frame: Any) -> str:
+    """
+    WebSocket/SSE 프레임 인코딩 (ai_chunk는 사전 인코딩 경로 사용)
+
+    Args:
+        frame: 프레임 dict
+
+    Returns:
+        JSON 문자열
+    """
+    if (isinstance(frame, dict) and frame.get('type') == 'ai_chunk'
+            and _AI_CHUNK_REQUIRED <= frame.keys() <= _AI_CHUNK_KEYS):
+        return encode_ai_chunk(
+            frame['chunk'], frame['chunk_index'], frame['timestamp'], frame.get('replay', False)
+        )
+    return dumps(frame)
+
+
+def accelerated_backend() -> Optional[str]:
+    """사용 중인 가속 인코더 이름 (없으면 None)"""
+    return 'orjson' if orjson is not None else None
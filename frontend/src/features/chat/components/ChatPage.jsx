@@ -624,6 +624,23 @@ const ChatPage = ({
           }
           break;
 
+        case "guardrail_intervened":
+          // 가드레일 개입 - 이미 표시된 응답을 차단 메시지로 대체 (이후 chat_end로 마무리)
+          console.warn("🛡️ 가드레일 개입:", message.message);
+          if (currentAssistantMessageId.current) {
+            streamingContentRef.current = message.message || "";
+            setStreamingContent(streamingContentRef.current);
+            chunkBuffer.current.clear();
+            setMessages((prevMessages) =>
+              prevMessages.map((msg) =>
+                msg.id === currentAssistantMessageId.current
+                  ? { ...msg, content: streamingContentRef.current }
+                  : msg
+              )
+            );
+          }
+          break;
+
         case "chat_end":
           console.log("🎯 chat_end 메시지 수신됨", message);
 
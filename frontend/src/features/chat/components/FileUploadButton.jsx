@@ -145,8 +145,10 @@ const FileUploadButton = forwardRef(({ onFileContent, disabled }, ref) => {
       for (let pageNum = 1; pageNum <= numPages; pageNum++) {
         const page = await pdf.getPage(pageNum);
         const textContent = await page.getTextContent();
-        const pageText = textContent.items.map(item => item.str).join(' ');
-        fullText += pageText + '\n\n';
+        // 줄 끝(hasEOL)은 줄바꿈으로 유지해 머리말/꼬리말이 별도 줄로 남도록 함
+        const pageText = textContent.items.map(item => item.str + (item.hasEOL ? '\n' : ' ')).join('');
+        // 페이지 사이에 \f(페이지 구분) - 백엔드 정규화가 페이지 가장자리의 머리말/꼬리말/쪽 번호만 제거
+        fullText += pageText + '\n\f\n';
       }
       
       // 추출한 텍스트가 비어있는지 확인
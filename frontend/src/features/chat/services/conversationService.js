@@ -4,6 +4,8 @@ import { API_BASE_URL } from '../../../app/config';
 class ConversationService {
   constructor() {
     this.userId = this.getUserId();
+    // 엔진별 대화 목록 캐시 { conversations, watermark } - 델타 동기화용
+    this.listCache = new Map();
   }
 
   // 사용자 ID 가져오기 (인증된 사용자 정보 사용)
@@ -67,35 +69,39 @@ class ConversationService {
     }
   }
 
-  // 대화 목록 조회
+  // 대화 목록 조회 (최근 활동순 요약)
+  // 캐시가 있으면 워터마크 이후 변경/삭제분만 받아 병합 (델타 동기화)
   async listConversations(engineType = null) {
-    try {
-      const currentUserId = this.getUserId(); // 최신 userId 가져오기
-      const params = new URLSearchParams({
-        userId: currentUserId,
-      });
+    const cacheKey = `${this.getUserId()}|${engineType || ""}`;
+    const cached = this.listCache.get(cacheKey);
 
-      if (engineType) {
-        params.append("engineType", engineType); // engineType 파라미터 사용 (백엔드 API 스펙에 맞춤)
-      }
-      
-      // console.log("📋 대화 목록 조회 파라미터:", {
-      //   userId: currentUserId,
-      //   engineType: engineType
-      // });
-
-      const response = await fetch(`${API_BASE_URL}/conversations?${params}`, {
-        method: "GET",
-        headers: this.getAuthHeaders(),
-      });
-
-      if (!response.ok) {
-        throw new Error(`Failed to list conversations: ${response.statusText}`);
-      }
+    try {
+      const byId = new Map(
+        cached ? cached.conversations.map((c) => [c.conversationId, c]) : []
+      );
+      let watermark = cached ? cached.watermark : null;
+      const since = watermark;
+      let cursor = null;
+
+      do {
+        const page = await this.listConversationsPage(engineType, cursor, 100, since);
+        if (page.reset) {
+          // 워터마크가 너무 오래됨 - 서버가 전체 목록을 반환
+          byId.clear();
+        }
+        page.conversations.forEach((c) => byId.set(c.conversationId, c));
+        page.deleted.forEach((id) => byId.delete(id));
+        if (page.watermark && (!watermark || page.watermark > watermark)) {
+          watermark = page.watermark;
+        }
+        cursor = page.nextCursor;
+      } while (cursor);
 
-      const data = await response.json();
-      // console.log("📋 대화 목록 조회 성공:", data);
-      return data.conversations || [];
+      const conversations = [...byId.values()].sort((a, b) =>
+        (b.updatedAt || "").localeCompare(a.updatedAt || "")
+      );
+      this.listCache.set(cacheKey, { conversations, watermark });
+      return conversations;
     } catch (error) {
       console.error("대화 목록 조회 실패:", error);
       // 오류 발생 시 localStorage에서 조회
@@ -103,6 +109,43 @@ class ConversationService {
     }
   }
 
+  // 대화 목록 한 페이지 조회
+  async listConversationsPage(engineType = null, cursor = null, limit = 100, since = null) {
+    const currentUserId = this.getUserId(); // 최신 userId 가져오기
+    const params = new URLSearchParams({
+      userId: currentUserId,
+      limit: String(limit),
+    });
+
+    if (engineType) {
+      params.append("engineType", engineType); // engineType 파라미터 사용 (백엔드 API 스펙에 맞춤)
+    }
+    if (cursor) {
+      params.append("cursor", cursor);
+    }
+    if (since) {
+      params.append("since", since);
+    }
+
+    const response = await fetch(`${API_BASE_URL}/conversations?${params}`, {
+      method: "GET",
+      headers: this.getAuthHeaders(),
+    });
+
+    if (!response.ok) {
+      throw new Error(`Failed to list conversations: ${response.statusText}`);
+    }
+
+    const data = await response.json();
+    return {
+      conversations: data.conversations || [],
+      deleted: data.deleted || [],
+      nextCursor: data.nextCursor || null,
+      watermark: data.watermark || null,
+      reset: Boolean(data.reset),
+    };
+  }
+
   // 특정 대화 조회
   async getConversation(conversationId) {
     try {
@@ -128,6 +171,28 @@ class ConversationService {
     }
   }
 
+  // 대화 메시지 페이지 조회 (최신 limit개, 이전 메시지는 olderCursor를 before로 전달)
+  async getConversationPage(conversationId, { limit = 20, before = null } = {}) {
+    const params = new URLSearchParams({ limit: String(limit) });
+    if (before) {
+      params.append("before", before);
+    }
+
+    const response = await fetch(
+      `${API_BASE_URL}/conversations/${conversationId}?${params}`,
+      {
+        method: "GET",
+        headers: this.getAuthHeaders(),
+      }
+    );
+
+    if (!response.ok) {
+      throw new Error(`Failed to get conversation page: ${response.statusText}`);
+    }
+
+    return response.json();
+  }
+
   // 대화 제목 수정 (PATCH 요청)
   async updateConversationTitle(conversationId, newTitle) {
     try {
@@ -12,6 +12,9 @@ class WebSocketService {
     this.isReconnecting = false;
     this.conversationHistory = [];
     this.currentConversationId = null;
+    // API Gateway 유휴 타임아웃(10분) 전에 keepalive ping 전송
+    this.keepaliveInterval = 5 * 60 * 1000;
+    this.keepaliveTimer = null;
   }
 
   // WebSocket 연결
@@ -37,8 +40,16 @@ class WebSocketService {
         let wsUrl = WS_URL;
 
         // 토큰이 있으면 쿼리 파라미터로 추가
+        const params = new URLSearchParams();
         if (token) {
-          wsUrl += `?token=${encodeURIComponent(token)}`;
+          params.set("token", token);
+        }
+        // 자동 재연결 여부 (서버 재연결률 메트릭용)
+        if (this.isReconnecting) {
+          params.set("reconnect", "1");
+        }
+        if (params.toString()) {
+          wsUrl += `?${params.toString()}`;
         }
 
         console.log("WebSocket 연결 시도:", wsUrl.split("?")[0]); // URL만 로그 (토큰 제외)
@@ -50,6 +61,7 @@ class WebSocketService {
           this.isConnecting = false;
           this.reconnectAttempts = 0;
           this.isReconnecting = false;
+          this.startKeepalive();
 
           // 연결 핸들러 호출
           this.connectionHandlers.forEach((handler) => handler(true));
@@ -63,6 +75,12 @@ class WebSocketService {
         this.ws.onmessage = (event) => {
           try {
             const data = JSON.parse(event.data);
+
+            // keepalive 응답은 핸들러에 전달하지 않음
+            if (data.type === "pong") {
+              return;
+            }
+
             console.log("WebSocket 메시지 수신:", data);
 
             // 모든 메시지 핸들러에 전달
@@ -86,6 +104,7 @@ class WebSocketService {
         this.ws.onclose = (event) => {
           console.log("WebSocket 연결 종료:", event.code, event.reason);
           this.isConnecting = false;
+          this.stopKeepalive();
 
           // 연결 핸들러 호출
           this.connectionHandlers.forEach((handler) => handler(false));
@@ -113,6 +132,24 @@ class WebSocketService {
     });
   }
 
+  // keepalive ping 시작 (유휴 연결 종료 방지)
+  startKeepalive() {
+    this.stopKeepalive();
+    this.keepaliveTimer = setInterval(() => {
+      if (this.isWebSocketConnected()) {
+        this.ws.send(JSON.stringify({ action: "ping" }));
+      }
+    }, this.keepaliveInterval);
+  }
+
+  // keepalive ping 중지
+  stopKeepalive() {
+    if (this.keepaliveTimer) {
+      clearInterval(this.keepaliveTimer);
+      this.keepaliveTimer = null;
+    }
+  }
+
   // 재연결 처리
   handleReconnect() {
     if (
@@ -193,12 +230,13 @@ class WebSocketService {
     return new Promise((resolve, reject) => {
       if (!this.isWebSocketConnected()) {
         console.error("WebSocket이 연결되지 않았습니다.");
+        // 큐에 넣을 때 키를 확정해 재연결 후 재전송해도 같은 요청으로 처리되도록 함
         this.messageQueue.push({
           message,
           engineType,
           conversationId,
           conversationHistory,
-          idempotencyKey,
+          idempotencyKey: idempotencyKey || crypto.randomUUID(),
           resolve,
           reject,
         });
@@ -354,9 +392,22 @@ class WebSocketService {
   // 메시지 큐 처리
   processMessageQueue() {
     while (this.messageQueue.length > 0) {
-      const { message, engineType, conversationId, resolve, reject } =
-        this.messageQueue.shift();
-      this.sendMessage(message, engineType, conversationId)
+      const {
+        message,
+        engineType,
+        conversationId,
+        conversationHistory,
+        idempotencyKey,
+        resolve,
+        reject,
+      } = this.messageQueue.shift();
+      this.sendMessage(
+        message,
+        engineType,
+        conversationId,
+        conversationHistory,
+        idempotencyKey
+      )
         .then(resolve)
         .catch(reject);
     }
@@ -389,6 +440,7 @@ class WebSocketService {
 
   // WebSocket 연결 종료
   disconnect() {
+    this.stopKeepalive();
     if (this.ws) {
       console.log("WebSocket 연결 종료 요청");
       this.ws.close(1000, "Normal closure");
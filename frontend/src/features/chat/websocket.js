@@ -193,12 +193,13 @@ class WebSocketService {
     return new Promise((resolve, reject) => {
       if (!this.isWebSocketConnected()) {
         console.error("WebSocket이 연결되지 않았습니다.");
+        // 큐에 넣을 때 키를 확정해 재연결 후 재전송해도 같은 요청으로 처리되도록 함
         this.messageQueue.push({
           message,
           engineType,
           conversationId,
           conversationHistory,
-          idempotencyKey,
+          idempotencyKey: idempotencyKey || crypto.randomUUID(),
           resolve,
           reject,
         });
@@ -354,9 +355,22 @@ class WebSocketService {
   // 메시지 큐 처리
   processMessageQueue() {
     while (this.messageQueue.length > 0) {
-      const { message, engineType, conversationId, resolve, reject } =
-        this.messageQueue.shift();
-      this.sendMessage(message, engineType, conversationId)
+      const {
+        message,
+        engineType,
+        conversationId,
+        conversationHistory,
+        idempotencyKey,
+        resolve,
+        reject,
+      } = this.messageQueue.shift();
+      this.sendMessage(
+        message,
+        engineType,
+        conversationId,
+        conversationHistory,
+        idempotencyKey
+      )
         .then(resolve)
         .catch(reject);
     }
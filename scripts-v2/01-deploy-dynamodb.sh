@@ -22,11 +22,58 @@ MESSAGES_TABLE="${SERVICE_NAME}-messages-${CARD_COUNT}"
 PROMPTS_TABLE="${SERVICE_NAME}-prompts-${CARD_COUNT}"
 USAGE_TABLE="${SERVICE_NAME}-usage-${CARD_COUNT}"
 WEBSOCKET_TABLE="${SERVICE_NAME}-websocket-connections-${CARD_COUNT}"
+CAPACITY_TABLE="${SERVICE_NAME}-capacity-${CARD_COUNT}"
+IDEMPOTENCY_TABLE="${SERVICE_NAME}-idempotency-${CARD_COUNT}"
 
-# 1. Conversations 테이블 (GSI 2개 포함)
+# 최근 활동순 목록용 GSI 정의 (요약 속성만 projection - 메시지 제외)
+USER_UPDATED_GSI='{
+    "IndexName": "userId-updatedAt-index",
+    "KeySchema": [
+        {"AttributeName": "userId", "KeyType": "HASH"},
+        {"AttributeName": "updatedAt", "KeyType": "RANGE"}
+    ],
+    "Projection": {"ProjectionType": "INCLUDE", "NonKeyAttributes": ["title", "engineType", "createdAt"]}
+}'
+USER_ENGINE_UPDATED_GSI='{
+    "IndexName": "userEngineType-updatedAt-index",
+    "KeySchema": [
+        {"AttributeName": "userEngineType", "KeyType": "HASH"},
+        {"AttributeName": "updatedAt", "KeyType": "RANGE"}
+    ],
+    "Projection": {"ProjectionType": "INCLUDE", "NonKeyAttributes": ["userId", "title", "engineType", "createdAt"]}
+}'
+
+# 기존 테이블에 GSI 추가 (UpdateTable은 GSI를 하나씩 생성하므로 ACTIVE까지 대기)
+ensure_gsi() {
+    local table=$1 index_name=$2 hash_key=$3 gsi_json=$4
+    if aws dynamodb describe-table --table-name "${table}" --region ${REGION} \
+        --query "Table.GlobalSecondaryIndexes[?IndexName=='${index_name}'].IndexName" --output text | grep -q "${index_name}"; then
+        echo "   ✅ ${index_name} - 이미 존재"
+        return
+    fi
+
+    echo "   ➕ ${index_name} 추가 중..."
+    aws dynamodb update-table \
+        --table-name ${table} \
+        --attribute-definitions \
+            AttributeName=${hash_key},AttributeType=S \
+            AttributeName=updatedAt,AttributeType=S \
+        --global-secondary-index-updates "[{\"Create\": ${gsi_json}}]" \
+        --region ${REGION} &>/dev/null || { echo "   ❌ ${index_name} - 추가 실패"; return; }
+
+    while [ "$(aws dynamodb describe-table --table-name "${table}" --region ${REGION} \
+        --query "Table.GlobalSecondaryIndexes[?IndexName=='${index_name}'].IndexStatus" --output text)" != "ACTIVE" ]; do
+        sleep 10
+    done
+    echo "   ✅ ${index_name} - 생성 완료"
+}
+
+# 1. Conversations 테이블 (GSI 4개 포함)
 echo "📦 Creating ${CONVERSATIONS_TABLE}..."
 if aws dynamodb describe-table --table-name "${CONVERSATIONS_TABLE}" --region ${REGION} &>/dev/null; then
-    echo "✅ ${CONVERSATIONS_TABLE} - 이미 존재 (스킵)"
+    echo "✅ ${CONVERSATIONS_TABLE} - 이미 존재 (GSI 확인)"
+    ensure_gsi "${CONVERSATIONS_TABLE}" "userId-updatedAt-index" "userId" "${USER_UPDATED_GSI}"
+    ensure_gsi "${CONVERSATIONS_TABLE}" "userEngineType-updatedAt-index" "userEngineType" "${USER_ENGINE_UPDATED_GSI}"
 else
     aws dynamodb create-table \
         --table-name ${CONVERSATIONS_TABLE} \
@@ -34,6 +81,7 @@ else
             AttributeName=conversationId,AttributeType=S \
             AttributeName=userId,AttributeType=S \
             AttributeName=createdAt,AttributeType=S \
+            AttributeName=updatedAt,AttributeType=S \
             AttributeName=userEngineType,AttributeType=S \
         --key-schema \
             AttributeName=conversationId,KeyType=HASH \
@@ -54,7 +102,9 @@ else
                         {"AttributeName": "createdAt", "KeyType": "RANGE"}
                     ],
                     "Projection": {"ProjectionType": "ALL"}
-                }
+                },
+                '"${USER_UPDATED_GSI}"',
+                '"${USER_ENGINE_UPDATED_GSI}"'
             ]' \
         --billing-mode PAY_PER_REQUEST \
         --region ${REGION} &>/dev/null && echo "✅ ${CONVERSATIONS_TABLE} - 생성 성공" || echo "❌ ${CONVERSATIONS_TABLE} - 생성 실패"
@@ -144,6 +194,36 @@ else
         --region ${REGION} &>/dev/null && echo "✅ ${WEBSOCKET_TABLE} - 생성 성공" || echo "❌ ${WEBSOCKET_TABLE} - 생성 실패"
 fi
 
+# 7. Capacity 테이블 (Bedrock 용량 스케줄링 공유 카운터)
+echo "📦 Creating ${CAPACITY_TABLE}..."
+if aws dynamodb describe-table --table-name "${CAPACITY_TABLE}" --region ${REGION} &>/dev/null; then
+    echo "✅ ${CAPACITY_TABLE} - 이미 존재 (스킵)"
+else
+    aws dynamodb create-table \
+        --table-name ${CAPACITY_TABLE} \
+        --attribute-definitions \
+            AttributeName=counterId,AttributeType=S \
+        --key-schema \
+            AttributeName=counterId,KeyType=HASH \
+        --billing-mode PAY_PER_REQUEST \
+        --region ${REGION} &>/dev/null && echo "✅ ${CAPACITY_TABLE} - 생성 성공" || echo "❌ ${CAPACITY_TABLE} - 생성 실패"
+fi
+
+# 8. Idempotency 테이블 (sendMessage 중복 요청 방지)
+echo "📦 Creating ${IDEMPOTENCY_TABLE}..."
+if aws dynamodb describe-table --table-name "${IDEMPOTENCY_TABLE}" --region ${REGION} &>/dev/null; then
+    echo "✅ ${IDEMPOTENCY_TABLE} - 이미 존재 (스킵)"
+else
+    aws dynamodb create-table \
+        --table-name ${IDEMPOTENCY_TABLE} \
+        --attribute-definitions \
+            AttributeName=requestId,AttributeType=S \
+        --key-schema \
+            AttributeName=requestId,KeyType=HASH \
+        --billing-mode PAY_PER_REQUEST \
+        --region ${REGION} &>/dev/null && echo "✅ ${IDEMPOTENCY_TABLE} - 생성 성공" || echo "❌ ${IDEMPOTENCY_TABLE} - 생성 실패"
+fi
+
 # TTL 설정 (WebSocket 연결용)
 echo ""
 echo "⏰ WebSocket 테이블에 TTL 설정..."
@@ -152,6 +232,22 @@ aws dynamodb update-time-to-live \
     --time-to-live-specification "AttributeName=ttl,Enabled=true" \
     --region ${REGION} &>/dev/null || echo "TTL 설정 스킵"
 
+# 대화 테이블 TTL (삭제 tombstone 자동 정리)
+aws dynamodb update-time-to-live \
+    --table-name "${CONVERSATIONS_TABLE}" \
+    --time-to-live-specification "AttributeName=ttl,Enabled=true" \
+    --region ${REGION} &>/dev/null || echo "TTL 설정 스킵"
+
+aws dynamodb update-time-to-live \
+    --table-name "${CAPACITY_TABLE}" \
+    --time-to-live-specification "AttributeName=ttl,Enabled=true" \
+    --region ${REGION} &>/dev/null || echo "TTL 설정 스킵"
+
+aws dynamodb update-time-to-live \
+    --table-name "${IDEMPOTENCY_TABLE}" \
+    --time-to-live-specification "AttributeName=ttl,Enabled=true" \
+    --region ${REGION} &>/dev/null || echo "TTL 설정 스킵"
+
 # 테이블 안정화 대기
 echo ""
 echo "⏳ 테이블 안정화 대기 중..."
@@ -168,7 +264,7 @@ SUCCESS_COUNT=0
 FAIL_COUNT=0
 FAILED_TABLES=""
 
-for table in "${CONVERSATIONS_TABLE}" "${FILES_TABLE}" "${MESSAGES_TABLE}" "${PROMPTS_TABLE}" "${USAGE_TABLE}" "${WEBSOCKET_TABLE}"; do
+for table in "${CONVERSATIONS_TABLE}" "${FILES_TABLE}" "${MESSAGES_TABLE}" "${PROMPTS_TABLE}" "${USAGE_TABLE}" "${WEBSOCKET_TABLE}" "${CAPACITY_TABLE}" "${IDEMPOTENCY_TABLE}"; do
     if aws dynamodb describe-table --table-name $table --region ${REGION} &>/dev/null; then
         echo "✅ $table"
         SUCCESS_COUNT=$((SUCCESS_COUNT + 1))
@@ -182,7 +278,7 @@ done
 echo ""
 echo "========================================="
 if [ $FAIL_COUNT -eq 0 ]; then
-    echo "✅ 모든 테이블 생성 완료! (${SUCCESS_COUNT}/6)"
+    echo "✅ 모든 테이블 생성 완료! (${SUCCESS_COUNT}/8)"
     echo "========================================="
     echo ""
     echo "다음 단계: ./02-deploy-lambda.sh"
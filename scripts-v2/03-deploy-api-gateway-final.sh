@@ -34,11 +34,14 @@ echo "리전: $REGION"
 echo ""
 
 # 1. REST API 생성
+# binary-media-types '*/*': Lambda가 반환하는 압축 응답(isBase64Encoded)을 API Gateway가 디코딩해 전달
+# (요청 본문도 base64로 전달되며 backend/utils/response.py의 compressed 데코레이터가 디코딩)
 echo "[1/10] REST API 생성..."
 REST_API_ID=$(aws apigateway create-rest-api \
   --name "${REST_API_NAME}" \
   --description "${SERVICE_NAME} Service REST API - Complete" \
   --endpoint-configuration types=REGIONAL \
+  --binary-media-types '*/*' \
   --query 'id' \
   --output text)
 
@@ -264,6 +267,7 @@ create_options_method() {
       --resource-id $RESOURCE_ID \
       --http-method OPTIONS \
       --type MOCK \
+      --content-handling CONVERT_TO_TEXT \
       --request-templates '{"application/json": "{\"statusCode\": 200}"}' > /dev/null
 
     # Method Response
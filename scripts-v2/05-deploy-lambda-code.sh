@@ -31,6 +31,8 @@ MESSAGES_TABLE="${SERVICE_NAME}-messages-${CARD_COUNT}"
 PROMPTS_TABLE="${SERVICE_NAME}-prompts-${CARD_COUNT}"
 USAGE_TABLE="${SERVICE_NAME}-usage-${CARD_COUNT}"
 WEBSOCKET_TABLE="${SERVICE_NAME}-websocket-connections-${CARD_COUNT}"
+CAPACITY_TABLE="${SERVICE_NAME}-capacity-${CARD_COUNT}"
+IDEMPOTENCY_TABLE="${SERVICE_NAME}-idempotency-${CARD_COUNT}"
 
 # Backend 디렉토리 확인
 BACKEND_DIR="../backend"
@@ -169,6 +171,8 @@ update_lambda_function() {
             USAGE_TABLE=${USAGE_TABLE},
             WEBSOCKET_TABLE=${WEBSOCKET_TABLE},
             CONNECTIONS_TABLE=${WEBSOCKET_TABLE},
+            CAPACITY_TABLE=${CAPACITY_TABLE},
+            IDEMPOTENCY_TABLE=${IDEMPOTENCY_TABLE},
             WEBSOCKET_API_ID=${WEBSOCKET_API_ID},
             REST_API_URL=https://${REST_API_ID}.execute-api.${REGION}.amazonaws.com/prod,
             WEBSOCKET_API_URL=wss://${WEBSOCKET_API_ID}.execute-api.${REGION}.amazonaws.com/prod,